@@ -0,0 +1,427 @@
+import os
+import json
+import time
+
+import numpy as np
+
+import log_module
+import cache_module
+import session_module
+
+
+""" PRODUCTIVITY ANALYTICS
+
+summaries of the time spent in the focus sessions, from the "interval" events
+of the session log. The intervals are loaded once into NumPy arrays, one entry
+per interval, and every summary is a vectorized pass over them:
+
+    history = analytics_module.load_history()
+    days, focus = analytics_module.daily_focus(history)
+
+the parsed arrays are kept next to the log with the number of bytes read, so
+that a new load only parses the events appended since
+"""
+
+# general logger
+logger = log_module.get_logger("AnalyticsLogs")
+
+HISTORY_PATH = f"{cache_module.CACHE_PATH}{cache_module.split}sessions.npz"
+
+KINDS = ("focus", "rest")
+
+# numeric columns of the history: the wall time of the end, then durations in seconds
+COLUMNS = ("wall", "planned", "focus", "rest", "idle")
+
+DAY = 86400
+
+
+class History:
+
+    """
+    intervals of the sessions, as parallel arrays
+    """
+
+    __slots__ = ("wall", "kind", "planned", "focus", "rest", "idle", "job", "jobs", "offset")
+
+    def __init__(self, columns=None, kind=None, job=None, jobs=(), offset=0):
+
+        """
+        Parameters
+        ----------
+        columns : dict, optional
+            arrays of COLUMNS, by default empty
+        kind : numpy.ndarray, optional
+            index in KINDS of each interval
+        job : numpy.ndarray, optional
+            index in `jobs` of the job of each interval, -1 without a job
+        jobs : sequence, optional
+            ids of the jobs
+        offset : int, optional
+            bytes of the log already read
+        """
+
+        columns = columns or {}
+
+        # end of the interval, wall time; the planned and run times in seconds
+        self.wall = np.asarray(columns.get("wall", ()), dtype=np.float64)
+        self.planned = np.asarray(columns.get("planned", ()), dtype=np.float64)
+        self.focus = np.asarray(columns.get("focus", ()), dtype=np.float64)
+        self.rest = np.asarray(columns.get("rest", ()), dtype=np.float64)
+        self.idle = np.asarray(columns.get("idle", ()), dtype=np.float64)
+
+        self.kind = np.asarray(kind if kind is not None else (), dtype=np.int8)
+        self.job = np.asarray(job if job is not None else (), dtype=np.int32)
+        self.jobs = list(jobs)
+
+        self.offset = offset
+
+    def __len__(self):
+
+        return len(self.wall)
+
+    @property
+    def start(self):
+
+        """ start of the intervals, the end minus the run time """
+
+        return self.wall - (self.focus + self.rest + self.idle)
+
+    def extend(self, events: list):
+
+        """
+        append the "interval" events to the arrays
+
+        Parameters
+        ----------
+        events : list
+            events of the session log, the other kinds are ignored
+
+        Returns
+        -------
+        int : number of intervals added
+        """
+
+        events = [event for event in events if event.get("event") == "interval"
+                  and event.get("kind") in KINDS]
+
+        if not events:
+            return 0
+
+        codes = {job_id: i for i, job_id in enumerate(self.jobs)}
+        job = np.empty(len(events), dtype=np.int32)
+        for i, event in enumerate(events):
+
+            job_id = event.get("job")
+            if job_id is None:
+                job[i] = -1
+                continue
+
+            if job_id not in codes:
+                codes[job_id] = len(self.jobs)
+                self.jobs += [job_id]
+
+            job[i] = codes[job_id]
+
+        for name in COLUMNS:
+            column = np.fromiter((event.get(name) or 0 for event in events), dtype=np.float64,
+                                 count=len(events))
+            setattr(self, name, np.concatenate((getattr(self, name), column)))
+
+        kind = np.fromiter((KINDS.index(event["kind"]) for event in events), dtype=np.int8,
+                           count=len(events))
+        self.kind = np.concatenate((self.kind, kind))
+        self.job = np.concatenate((self.job, job))
+
+        return len(events)
+
+    def save(self, path=HISTORY_PATH):
+
+        """ write the arrays, replacing the saved ones at once """
+
+        with open(f"{path}.tmp", "wb") as f:
+            np.savez(f, kind=self.kind, job=self.job, jobs=np.asarray(self.jobs, dtype=str),
+                     offset=np.asarray(self.offset), **{name: getattr(self, name) for name in COLUMNS})
+
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def read(cls, path=HISTORY_PATH):
+
+        """
+        Returns
+        -------
+        History : the saved history, None if there is none or it is unreadable
+        """
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(columns={name: data[name] for name in COLUMNS}, kind=data["kind"],
+                           job=data["job"], jobs=data["jobs"].tolist(), offset=int(data["offset"]))
+
+        except FileNotFoundError:
+            return None
+
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"saved history not readable, the log is parsed again: {e}")
+            return None
+
+
+def load_history(log_path=session_module.LOG_PATH, path=HISTORY_PATH, save=True):
+
+    """
+    Parameters
+    ----------
+    log_path : str, optional
+        path of the session log
+    path : str, optional
+        path of the saved arrays, None to parse the whole log
+    save : bool, optional
+        if True the arrays are saved when new intervals were read, by default True
+
+    Returns
+    -------
+    History : the intervals of the log
+    """
+
+    history = History.read(path=path) if path is not None else None
+
+    try:
+        size = os.path.getsize(log_path)
+    except FileNotFoundError:
+        return History()
+
+    # a log rotated or cleared since the arrays were saved
+    if history is None or history.offset > size:
+        history = History()
+
+    start = time.perf_counter()
+
+    events = []
+    with open(log_path, "rb") as f:
+
+        f.seek(history.offset)
+        for line in f:
+
+            # the last line is still being written
+            if not line.endswith(b"\n"):
+                break
+
+            history.offset += len(line)
+
+            # quick filter, most events are timer transitions
+            if b'"interval"' not in line:
+                continue
+
+            try:
+                events += [json.loads(line)]
+            except ValueError:
+                logger.warning("corrupt event skipped")
+
+    added = history.extend(events)
+    logger.debug(f"{added} intervals loaded in {1000 * (time.perf_counter() - start):.1f}ms")
+
+    if added and save and path is not None:
+        history.save(path=path)
+
+    return history
+
+
+""" SUMMARIES """
+
+
+def utc_offset():
+
+    """ offset of the local time, in seconds """
+
+    return time.localtime().tm_gmtoff
+
+
+def local_days(wall: np.ndarray, offset=None):
+
+    """
+    Parameters
+    ----------
+    wall : numpy.ndarray
+        wall times
+    offset : int, optional
+        offset of the local time in seconds, by default the current one
+
+    Returns
+    -------
+    numpy.ndarray : the local day of each time, as days since the epoch
+    """
+
+    if offset is None:
+        offset = utc_offset()
+
+    return np.floor_divide(wall + offset, DAY).astype(np.int64)
+
+
+def _totals(keys: np.ndarray, weights: np.ndarray):
+
+    # sum of the weights of each distinct key, the keys being days or weeks: a
+    # count over their span instead of a sort
+    if not len(keys):
+        return keys, np.zeros(0)
+
+    low = keys.min()
+    shifted = keys - low
+
+    present = np.bincount(shifted) > 0
+    totals = np.bincount(shifted, weights=weights)
+
+    return np.flatnonzero(present) + low, totals[present]
+
+
+def daily_focus(history: History, offset=None):
+
+    """
+    Returns
+    -------
+    tuple : days (numpy.datetime64[D]) with a focus interval, and the focus time
+        of each day in seconds
+    """
+
+    days, totals = _totals(local_days(history.start, offset=offset), history.focus)
+
+    return days.astype("datetime64[D]"), totals
+
+
+def weekly_focus(history: History, offset=None):
+
+    """
+    Returns
+    -------
+    tuple : first day (Monday) of the weeks, and the focus time of each week in
+        seconds
+    """
+
+    # the epoch is a Thursday
+    weeks = (local_days(history.start, offset=offset) + 3) // 7
+    weeks, totals = _totals(weeks, history.focus)
+
+    return (weeks * 7 - 3).astype("datetime64[D]"), totals
+
+
+def job_focus(history: History):
+
+    """
+    Returns
+    -------
+    dict : focus time in seconds of each job, the sessions without a job left out
+    """
+
+    totals = np.bincount(history.job[history.job >= 0], weights=history.focus[history.job >= 0],
+                         minlength=len(history.jobs))
+
+    return dict(zip(history.jobs, totals.tolist()))
+
+
+def focus_ratio(history: History, offset=None):
+
+    """
+    focus time over the planned time of the focus intervals
+
+    Returns
+    -------
+    tuple : overall ratio, then the days and the ratio of each day
+    """
+
+    focused = history.kind == KINDS.index("focus")
+    planned = history.planned[focused]
+    focus = history.focus[focused]
+
+    keys = local_days(history.start[focused], offset=offset)
+    days, planned_days = _totals(keys, planned)
+    _, focus_days = _totals(keys, focus)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(planned_days > 0, focus_days / planned_days, np.nan)
+
+    overall = focus.sum() / planned.sum() if planned.sum() > 0 else float("nan")
+
+    return float(overall), days.astype("datetime64[D]"), ratios
+
+
+def streaks(history: History, minimum=1, offset=None, today=None):
+
+    """
+    runs of consecutive days with at least `minimum` seconds of focus
+
+    Parameters
+    ----------
+    minimum : float, optional
+        focus time of a day of the streak in seconds, by default 1
+    today : numpy.datetime64, optional
+        day of the current streak, by default the local today
+
+    Returns
+    -------
+    tuple : the current streak and the longest one, in days
+    """
+
+    days, totals = daily_focus(history, offset=offset)
+    days = days[totals >= minimum].astype(np.int64)
+
+    if not len(days):
+        return 0, 0
+
+    # index of the first day of each run
+    breaks = np.flatnonzero(np.diff(days) != 1) + 1
+    bounds = np.concatenate(([0], breaks, [len(days)]))
+    lengths = np.diff(bounds)
+
+    if today is None:
+        today = local_days(np.asarray([time.time()]), offset=offset)[0]
+    today = int(np.asarray(today).astype("datetime64[D]").astype(np.int64))
+
+    # the current streak holds until the end of today
+    current = int(lengths[-1]) if today - days[-1] <= 1 else 0
+
+    return current, int(lengths.max())
+
+
+def hourly_focus(history: History, offset=None):
+
+    """
+    Returns
+    -------
+    numpy.ndarray : focus time in seconds started at each hour of the day, 24 values
+    """
+
+    if offset is None:
+        offset = utc_offset()
+
+    hours = (np.mod(history.start + offset, DAY) // 3600).astype(np.int64)
+
+    return np.bincount(hours, weights=history.focus, minlength=24)
+
+
+def summary(history: History, offset=None):
+
+    """
+    Returns
+    -------
+    dict : the summaries, in JSON types
+    """
+
+    days, daily = daily_focus(history, offset=offset)
+    weeks, weekly = weekly_focus(history, offset=offset)
+    overall, ratio_days, ratios = focus_ratio(history, offset=offset)
+    current, longest = streaks(history, offset=offset)
+
+    return {
+        "intervals": len(history),
+        "focus": float(history.focus.sum()),
+        "rest": float(history.rest.sum()),
+        "idle": float(history.idle.sum()),
+        "daily_focus": dict(zip(days.astype(str).tolist(), daily.tolist())),
+        "weekly_focus": dict(zip(weeks.astype(str).tolist(), weekly.tolist())),
+        "job_focus": job_focus(history),
+        "focus_ratio": None if np.isnan(overall) else overall,
+        "daily_focus_ratio": dict(zip(ratio_days.astype(str).tolist(),
+                                      np.where(np.isnan(ratios), None, ratios).tolist())),
+        "current_streak": current,
+        "longest_streak": longest,
+        "hourly_focus": hourly_focus(history, offset=offset).tolist(),
+    }
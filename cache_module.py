@@ -1,7 +1,13 @@
 import os
 import json
 import sys 
-import logging
+import time
+import uuid
+import atexit
+import sqlite3
+import threading
+
+import log_module
 
 
 # adjust path to the operating system
@@ -13,12 +19,7 @@ else:
     OS = 1
 
 # general logger
-logger = logging.getLogger(f"CacheLogs")
-logger.setLevel(logging.DEBUG)
-stdout = logging.StreamHandler(stream=sys.stdout)
-fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-stdout.setFormatter(fmt)
-logger.addHandler(stdout)
+logger = log_module.get_logger("CacheLogs")
 
 
 # get the path of the app
@@ -28,14 +29,843 @@ APP_PATH = PATH + f"{split}Workflow" * ("workflow" not in PATH and "Workflow" no
 # define the path of the cache
 CACHE_PATH = APP_PATH + f"{split}cache"
 
+# number of journal records after which a background compaction is started
+COMPACTION_THRESHOLD = 256
+
+# seconds during which consecutive snapshot writes are grouped in one flush
+FLUSH_DELAY = 0.25
+
+# storage backend of the pending objects, "json" or "sqlite", set by the
+# PLANNER_BACKEND environment variable or the --backend option of planner_cli
+BACKEND = os.environ.get("PLANNER_BACKEND", "json")
+
+# journal records of a single minitask of a project, by position
+MINITASK_OPS = ("insert_minitask", "put_minitask", "delete_minitask")
+
+# ids read by a single query of the sqlite backend
+QUERY_VARIABLES = 500
+
+
+def job_key(obj: dict):
+
+    """
+    Parameters
+    ----------
+    obj : dict
+        a pending job
+
+    Returns
+    -------
+    str : key of the job in the cache, its id, or its name if saved before the ids
+    """
+
+    return obj.get("id") or obj["name"]
+
+
+def record_key(record: dict, pending_list: dict):
+
+    """
+    Parameters
+    ----------
+    record : dict
+        a "delete" record or a record of the MINITASK_OPS
+    pending_list : dict
+        the pending objects, by key
+
+    Returns
+    -------
+    str : key of the job of the record, the records written before the ids name it
+    """
+
+    if "id" in record:
+        return record["id"]
+
+    for key, obj in pending_list.items():
+        if key != "settings" and obj["name"] == record["name"]:
+            return key
+
+    return record["name"]
+
+
+class SnapshotWriter:
+
+    """
+    Write files atomically (temporary file + rename) and group the fsyncs of
+    bursts of writes into a single disk flush
+    """
+
+    def __init__(self, flush_delay=FLUSH_DELAY):
+
+        self.flush_delay = flush_delay
+
+        # path -> (payload, callback) of the writes waiting for the next flush
+        self._pending = {}
+
+        # files appended elsewhere that need an fsync at the next flush
+        self._to_sync = set()
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+        # write latency, in seconds
+        self.stats = {
+            "flushes": 0,
+            "files": 0,
+            "last_latency": 0.,
+            "max_latency": 0.,
+            "tot_latency": 0.,
+        }
+
+        # do not lose the last burst on exit
+        atexit.register(self.flush)
+
+    def write(self, path: str, payload: str, sync=False, callback=None):
+
+        """ schedule an atomic write of a file
+
+        Parameters
+        ----------
+        path : str
+            path of the file to write
+        payload : str
+            the new content of the file
+        sync : bool
+            if True the write is flushed before returning, default False
+        callback : callable, optional
+            called without arguments once the file is durably on disk, a newer
+            write of the same path replaces it
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+
+            # a newer payload supersedes the one waiting for the flush
+            self._pending[path] = (payload, callback)
+
+            if not sync and self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if sync:
+            self.flush()
+
+    def sync(self, path: str):
+
+        """ request an fsync of a file at the next flush
+
+        Parameters
+        ----------
+        path : str
+            path of the file
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+
+            self._to_sync.add(path)
+
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+
+        """ write all the pending files and flush them to disk
+
+        Returns
+        -------
+        None
+        """
+
+        with self._flush_lock:
+
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                to_sync, self._to_sync = self._to_sync, set()
+
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not pending and not to_sync:
+                return
+
+            t0 = time.perf_counter()
+
+            callbacks = []
+            directories = set()
+            for path, (payload, callback) in pending.items():
+
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                os.replace(tmp_path, path)
+
+                directories.add(os.path.dirname(path))
+                to_sync.discard(path)
+                if callback is not None:
+                    callbacks += [callback]
+
+            for path in to_sync:
+                if os.path.exists(path):
+                    with open(path, 'a') as f:
+                        os.fsync(f.fileno())
+
+            # make the renames durable
+            if OS:
+                for directory in directories:
+                    fd = os.open(directory, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+
+            latency = time.perf_counter() - t0
+
+            self.stats["flushes"] += 1
+            self.stats["files"] += len(pending) + len(to_sync)
+            self.stats["last_latency"] = latency
+            self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+            self.stats["tot_latency"] += latency
+
+            logger.debug(f'flushed {len(pending)} snapshots and {len(to_sync)} journals in {latency*1000:.1f}ms')
+
+            for callback in callbacks:
+                callback()
+
+    def report(self):
+
+        """ summary of the write latency
+
+        Returns
+        -------
+        dict : number of flushes and files, last, max and mean latency in ms
+        """
+
+        flushes = max(self.stats["flushes"], 1)
+
+        return {
+            "flushes": self.stats["flushes"],
+            "files": self.stats["files"],
+            "last_latency_ms": self.stats["last_latency"] * 1000,
+            "max_latency_ms": self.stats["max_latency"] * 1000,
+            "mean_latency_ms": self.stats["tot_latency"] * 1000 / flushes,
+        }
+
+
+class SqliteStore:
+
+    """
+    Storage of jobs, minitasks and finished records in indexed SQLite tables
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            rank INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            creation REAL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_priority ON jobs (priority DESC);
+
+        CREATE TABLE IF NOT EXISTS minitasks (
+            project TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL,
+            PRIMARY KEY (project, position)
+        );
+
+        CREATE TABLE IF NOT EXISTS nodes (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS finished (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            finished_at REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS finished_time ON finished (finished_at);
+
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.schema)
+        self._conn.commit()
+
+        self._migrate()
+
+    def _migrate(self):
+
+        """ key the jobs of a database created before the stable ids by id """
+
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "id" in columns:
+            return
+
+        with self._lock, self._conn:
+
+            jobs = []
+            for name, data in self._conn.execute(
+                    "SELECT name, data FROM jobs ORDER BY priority DESC, creation, rowid").fetchall():
+                obj = json.loads(data)
+                obj.setdefault("id", uuid.uuid4().hex)
+                if obj["type"] == "project":
+                    obj["current_minitasks"] = self.get_minitasks(project=name, _locked=True)
+                jobs += [obj]
+
+            self._conn.execute("DROP TABLE jobs")
+            self._conn.execute("DROP TABLE minitasks")
+
+        self._conn.executescript(self.schema)
+
+        with self._lock, self._conn:
+            for obj in jobs:
+                self._put_job(obj=obj)
+
+        logger.info(f'{len(jobs)} jobs of the database keyed by id')
+
+    def is_empty(self):
+
+        """
+        Returns
+        -------
+        bool : True if no job and no setting is stored
+        """
+
+        with self._lock:
+            jobs = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            settings = self._conn.execute("SELECT COUNT(*) FROM settings").fetchone()[0]
+
+        return jobs == 0 and settings == 0
+
+    def _put_job(self, obj: dict):
+
+        # minitasks are kept in their own table
+        data = {key: value for key, value in obj.items() if key != "current_minitasks"}
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, name, type, priority, rank, done, creation, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_key(obj), obj["name"], obj["type"], int(obj.get("priority", 0)),
+             int(obj.get("rank", 0)), int(bool(obj.get("done", False))), obj.get("creation"),
+             json.dumps(data)),
+        )
+
+        if "current_minitasks" in obj:
+            self._put_minitasks(project=job_key(obj), minitasks=obj["current_minitasks"])
+
+    def _put_minitasks(self, project: str, minitasks: list):
+
+        self._conn.execute("DELETE FROM minitasks WHERE project = ?", (project,))
+        self._conn.executemany(
+            "INSERT INTO minitasks (project, position, name, type, done, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(project, position, minitask["name"], minitask["type"],
+              int(bool(minitask.get("done", False))), json.dumps(minitask))
+             for position, minitask in enumerate(minitasks)],
+        )
+
+    def _delete_job(self, job_id: str):
+
+        self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        self._conn.execute("DELETE FROM minitasks WHERE project = ?", (job_id,))
+
+    def _put_settings(self, settings: dict):
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in settings.items()],
+        )
+
+    def _load_job(self, job_id: str, data: str):
+
+        obj = json.loads(data)
+
+        if obj["type"] == "project":
+            obj["current_minitasks"] = self.get_minitasks(project=job_id, _locked=True)
+
+        return obj
+
+    def apply(self, record: dict):
+
+        """ apply a single journal record in its own transaction
+
+        Parameters
+        ----------
+        record : dict
+            a record as built by CacheInterface.append_record
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock, self._conn:
+
+            if record["op"] == "put":
+                self._put_job(obj=record["obj"])
+
+            elif record["op"] == "delete":
+                self._delete_job(job_id=record["id"])
+
+            elif record["op"] == "finish":
+                self._delete_job(job_id=job_key(record["obj"]))
+                self._conn.execute(
+                    "INSERT INTO finished (name, type, finished_at, data) VALUES (?, ?, ?, ?)",
+                    (record["obj"]["name"], record["obj"]["type"], time.time(),
+                     json.dumps(record["obj"])),
+                )
+
+            elif record["op"] == "settings":
+                self._put_settings(settings=record["settings"])
+
+            elif record["op"] in MINITASK_OPS:
+                self._apply_minitask(record=record)
+
+    def replace_all(self, objects: list, settings: dict):
+
+        """ replace all the pending objects and the settings
+
+        Parameters
+        ----------
+        objects : list
+            the pending objects
+        settings : dict
+            the settings of the app
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock, self._conn:
+
+            self._conn.execute("DELETE FROM jobs")
+            self._conn.execute("DELETE FROM minitasks")
+
+            for obj in objects:
+                self._put_job(obj=obj)
+
+            self._put_settings(settings=settings)
+
+    def load_all(self):
+
+        """ load the pending objects in the format of the json snapshot
+
+        Returns
+        -------
+        dict : the settings and the pending objects, by id
+        """
+
+        with self._lock:
+
+            pending_list = {}
+
+            settings = self._conn.execute("SELECT key, value FROM settings").fetchall()
+            if settings:
+                pending_list["settings"] = {key: json.loads(value) for key, value in settings}
+
+            for job_id, data in self._conn.execute(
+                    "SELECT id, data FROM jobs ORDER BY priority DESC, creation, rowid"):
+                pending_list[job_id] = self._load_job(job_id=job_id, data=data)
+
+        return pending_list
+
+    def job_index(self):
+
+        """ index of the pending jobs, without their data
+
+        Returns
+        -------
+        dict : the settings and the pending jobs by id, each as its id, name,
+            priority and creation, from the highest priority
+        """
+
+        with self._lock:
+
+            pending_list = {}
+
+            settings = self._conn.execute("SELECT key, value FROM settings").fetchall()
+            if settings:
+                pending_list["settings"] = {key: json.loads(value) for key, value in settings}
+
+            for job_id, name, priority, creation in self._conn.execute(
+                    "SELECT id, name, priority, creation FROM jobs "
+                    "ORDER BY priority DESC, creation, rowid"):
+                pending_list[job_id] = {"id": job_id, "name": name, "priority": priority,
+                                        "creation": creation or 0}
+
+        return pending_list
+
+    def get_jobs(self, job_ids: list):
+
+        """
+        Parameters
+        ----------
+        job_ids : list
+            ids of the jobs
+
+        Returns
+        -------
+        dict : the stored jobs, by id
+        """
+
+        jobs = {}
+
+        with self._lock:
+
+            # within the limit of variables of a query
+            for start in range(0, len(job_ids), QUERY_VARIABLES):
+                chunk = job_ids[start:start + QUERY_VARIABLES]
+                for job_id, data in self._conn.execute(
+                        f"SELECT id, data FROM jobs WHERE id IN ({', '.join('?' * len(chunk))})",
+                        chunk):
+                    jobs[job_id] = self._load_job(job_id=job_id, data=data)
+
+        return jobs
+
+    def get_minitasks(self, project: str, _locked=False):
+
+        """
+        Parameters
+        ----------
+        project : str
+            id of the project
+
+        Returns
+        -------
+        list : the minitasks of the project, in order
+        """
+
+        query = "SELECT data FROM minitasks WHERE project = ? ORDER BY position"
+
+        if _locked:
+            return [json.loads(row[0]) for row in self._conn.execute(query, (project,))]
+
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute(query, (project,))]
+
+    def put_minitask(self, project: str, position: int, minitask: dict):
+
+        """ update a single minitask of a project
+
+        Parameters
+        ----------
+        project : str
+            id of the project
+        position : int
+            position of the minitask in the project
+        minitask : dict
+            the minitask
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock, self._conn:
+            self._put_minitask(project=project, position=position, minitask=minitask)
+
+    def _put_minitask(self, project: str, position: int, minitask: dict):
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO minitasks (project, position, name, type, done, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (project, position, minitask["name"], minitask["type"],
+             int(bool(minitask.get("done", False))), json.dumps(minitask)),
+        )
+
+    def _shift_minitasks(self, project: str, position: int, step: int):
+
+        # the positions from `position` moved by `step`, in two passes through
+        # the negative positions so that the primary key holds at each row
+        self._conn.execute(
+            "UPDATE minitasks SET position = -1 - (position + ?) WHERE project = ? AND position >= ?",
+            (step, project, position),
+        )
+        self._conn.execute(
+            "UPDATE minitasks SET position = -1 - position WHERE project = ? AND position < 0",
+            (project,),
+        )
+
+    def _apply_minitask(self, record: dict):
+
+        project, position = record["id"], record["rank"]
+
+        if record["op"] == "insert_minitask":
+            self._shift_minitasks(project=project, position=position, step=1)
+            self._put_minitask(project=project, position=position, minitask=record["minitask"])
+
+        elif record["op"] == "put_minitask":
+            self._put_minitask(project=project, position=position, minitask=record["minitask"])
+
+        else:
+            self._conn.execute("DELETE FROM minitasks WHERE project = ? AND position = ?",
+                               (project, position))
+            self._shift_minitasks(project=project, position=position + 1, step=-1)
+
+        # the counters are kept with the project
+        row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (project,)).fetchone()
+        if row is not None:
+            data = json.loads(row[0])
+            data["completed_minitasks"] = record["completed_minitasks"]
+            self._conn.execute("UPDATE jobs SET data = ? WHERE id = ?", (json.dumps(data), project))
+
+    def get_node(self, node_id: str):
+
+        """
+        Parameters
+        ----------
+        node_id : str
+            id of the sub-project
+
+        Returns
+        -------
+        list : the minitasks of the sub-project, None if not stored
+        """
+
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM nodes WHERE id = ?", (node_id,)).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def put_node(self, node_id: str, minitasks: list):
+
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO nodes (id, data) VALUES (?, ?)",
+                               (node_id, json.dumps(minitasks)))
+
+    def delete_node(self, node_id: str):
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+
+    def history(self, since=0., until=None, limit=-1):
+
+        """ finished records, from the oldest
+
+        Parameters
+        ----------
+        since : float
+            earliest completion time, as a unix timestamp, default 0.
+        until : float, optional
+            latest completion time, default now
+        limit : int
+            maximum number of records, default -1 (all)
+
+        Returns
+        -------
+        list : (finished_at, record) tuples
+        """
+
+        until = time.time() if until is None else until
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT finished_at, data FROM finished WHERE finished_at BETWEEN ? AND ? "
+                "ORDER BY finished_at LIMIT ?",
+                (since, until, limit),
+            ).fetchall()
+
+        return [(finished_at, json.loads(data)) for finished_at, data in rows]
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
+
 
 class CacheInterface:
 
-    def __init__(self):
+    def __init__(self, backend=BACKEND):
 
         self.pending_filename = "pending_jobs.json"
+        self.journal_filename = "pending_jobs.journal"
+        self.database_filename = "pending_jobs.sqlite"
         self.timer_filename = "timer.json"
 
+        # minitasks of the sub-projects, a file each
+        self.nodes_folder = "nodes"
+
+        # atomic writes
+        self.writer = SnapshotWriter()
+
+        # journal state
+        self.compaction_threshold = COMPACTION_THRESHOLD
+        self._journal_records = 0
+        self._journal_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._compaction = None
+
+        # backend
+        self.backend = backend
+        self.store = None
+
+        # the pending jobs are read from an index first, and by id later
+        self.indexed = backend == "sqlite"
+
+        if backend == "sqlite":
+            self.store = SqliteStore(path=self._path(self.database_filename))
+
+            # first run on sqlite, migrate the json cache
+            if self.store.is_empty():
+                self.import_json()
+
+        elif backend != "json":
+            raise ValueError(f'cache backend "{backend}" not recognized')
+
+    def _path(self, filename: str):
+
+        return f"{CACHE_PATH}{split}{filename}"
+
+    def _read_snapshot(self):
+
+        """ read the snapshot of pending objects, if any
+
+        Returns
+        -------
+        bool : True if the snapshot is there, False otherwise
+        dict : the snapshot
+        """
+
+        if self.pending_filename not in os.listdir(path=CACHE_PATH):
+            return False, {}
+
+        with open(self._path(self.pending_filename), 'rb') as f:
+            snapshot = json.loads(f.read())
+
+        # the snapshots written before the ids are keyed by name
+        return True, {key if key == "settings" else job_key(obj): obj for key, obj in snapshot.items()}
+
+    def _replay_journal(self, filename: str, pending_list: dict):
+
+        """ apply the records of a journal file onto a dict of pending objects
+
+        Parameters
+        ----------
+        filename : str
+            name of the journal file
+        pending_list : dict
+            the pending objects, updated in place
+
+        Returns
+        -------
+        int : number of records applied
+        """
+
+        if filename not in os.listdir(path=CACHE_PATH):
+            return 0
+
+        applied = 0
+        with open(self._path(filename), 'r') as f:
+            for line in f:
+
+                # a crash during an append leaves a truncated last line
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f'skipping corrupted journal record in {filename}')
+                    continue
+
+                if record["op"] == "put":
+                    pending_list[job_key(record["obj"])] = record["obj"]
+
+                elif record["op"] == "delete":
+                    pending_list.pop(record_key(record, pending_list), None)
+
+                elif record["op"] == "finish":
+                    pending_list.pop(job_key(record["obj"]), None)
+
+                elif record["op"] == "settings":
+                    pending_list["settings"] = record["settings"]
+
+                elif record["op"] in MINITASK_OPS and record_key(record, pending_list) in pending_list:
+                    project = pending_list[record_key(record, pending_list)]
+                    minitasks = project["current_minitasks"]
+
+                    if record["op"] == "insert_minitask":
+                        minitasks.insert(record["rank"], record["minitask"])
+                    elif record["op"] == "put_minitask":
+                        minitasks[record["rank"]] = record["minitask"]
+                    else:
+                        del minitasks[record["rank"]]
+
+                    project["completed_minitasks"] = record["completed_minitasks"]
+
+                applied += 1
+
+        return applied
+
+    def _read_json(self):
+
+        """ read the json snapshot and apply the journal
+
+        Returns
+        -------
+        bool : True if the snapshot is there, False otherwise
+        dict : the pending objects
+        int : number of journal records applied
+        """
+
+        with self._snapshot_lock:
+
+            # make sure the snapshot waiting for a flush is the one read
+            self.writer.flush()
+
+            # load the last snapshot
+            is_snapshot, pending_list = self._read_snapshot()
+
+            # apply the journal, including one left by an interrupted compaction
+            with self._journal_lock:
+                applied = self._replay_journal(f"{self.journal_filename}.old", pending_list)
+                applied += self._replay_journal(self.journal_filename, pending_list)
+
+        return is_snapshot, pending_list, applied
+
+    def _retrieve_from_store(self):
+
+        pending_list = self.store.load_all()
+
+        if not pending_list:
+            logger.warning(f'no job objects in the database')
+            return False, {}
+
+        logger.info(f'{len(list(pending_list.keys()))} job objects found in the database')
+        return True, pending_list
+
     def retrieve_objects(self):
 
         """ retrieve eventual pending tasks / projects 
@@ -47,23 +877,63 @@ class CacheInterface:
         Returns
         -------
         bool : True if there are pending objects, False otherwise
-        dict : the list of pending objects
+        dict : the pending objects by id, and the settings
+        """
+
+        if self.store is not None:
+            return self._retrieve_from_store()
+
+        is_snapshot, pending_list, applied = self._read_json()
+
+        # nothing found
+        if not is_snapshot and applied == 0:
+            logger.warning(f'no file found in cache')
+            return False, {}
+
+        logger.info(f'{len(list(pending_list.keys()))} job objects found, {applied} journal records applied')
+        return True, pending_list
+
+    def retrieve_index(self):
+
+        """ retrieve the pending jobs to rank, before their data if possible
+
+        Returns
+        -------
+        bool : True if there are pending objects, False otherwise
+        dict : the settings and the pending jobs by id; if `indexed` only their
+            id, name, priority and creation, see get_jobs, otherwise their data
         """
 
-        # check if the file of pending objects is there
-        if self.pending_filename in os.listdir(path=CACHE_PATH):
+        if self.store is None:
+            return self.retrieve_objects()
+
+        pending_list = self.store.job_index()
+
+        if not pending_list:
+            logger.warning(f'no job objects in the database')
+            return False, {}
+
+        logger.info(f'{len(pending_list)} job objects indexed in the database')
+        return True, pending_list
+
+    def get_jobs(self, job_ids: list):
+
+        """ the data of pending jobs of the index
 
-            # load
-            with open(f'{CACHE_PATH}{split}{self.pending_filename}', 'rb') as f:
+        Parameters
+        ----------
+        job_ids : list
+            ids of the jobs
 
-                pending_list = json.loads(f.read())
+        Returns
+        -------
+        dict : the jobs, by id
+        """
 
-            logger.info(f'{len(list(pending_list.keys()))} job objects found')
-            return True, pending_list
+        if self.store is None:
+            raise RuntimeError('the jobs are only read by id from the sqlite backend')
 
-        # no file found
-        logger.warning(f'no file found in cache')
-        return False, {}
+        return self.store.get_jobs(job_ids=list(job_ids))
 
     def save_pending_objects(self, objects: list, settings: dict):
 
@@ -81,18 +951,345 @@ class CacheInterface:
         None
         """
 
+        if self.store is not None:
+            self.store.replace_all(objects=objects, settings=settings)
+            logger.info(f'{len(objects)} job objects successfully saved in the database')
+            return
+
         pending_list = {'settings': settings}
 
         for obj in objects:
 
-            pending_list[obj['name']] = obj
+            pending_list[job_key(obj)] = obj
+
+        with self._snapshot_lock:
 
-        # save
-        with open(f"{CACHE_PATH}{split}{self.pending_filename}", 'w') as f:
-            f.write(json.dumps(pending_list))
+            # the journal written so far is superseded by the snapshot
+            with self._journal_lock:
+                mark = self._journal_size()
+
+            # save, the journal is trimmed once the snapshot is on disk
+            self.writer.write(
+                path=self._path(self.pending_filename),
+                payload=json.dumps(pending_list),
+                callback=lambda: self._trim_journal(mark=mark),
+            )
 
         logger.info(f'{len(objects)} job objects successfully saved')
 
+    def _journal_size(self):
+
+        if self.journal_filename not in os.listdir(path=CACHE_PATH):
+            return 0
+
+        return os.path.getsize(self._path(self.journal_filename))
+
+    def _trim_journal(self, mark: int):
+
+        """ drop the journal records written before a snapshot
+
+        Parameters
+        ----------
+        mark : int
+            size of the journal, in bytes, when the snapshot was taken
+
+        Returns
+        -------
+        None
+        """
+
+        with self._journal_lock:
+
+            self._remove(f"{self.journal_filename}.old")
+
+            # keep the records appended after the snapshot, swapped in at once
+            # so that a crash leaves either the whole journal or its tail
+            if self._journal_size() > mark:
+                path = self._path(self.journal_filename)
+                with open(path, 'rb') as f:
+                    f.seek(mark)
+                    tail = f.read()
+
+                with open(f"{path}.tmp", 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                os.replace(f"{path}.tmp", path)
+
+                self._journal_records = tail.count(b"\n")
+                return
+
+            self._remove(self.journal_filename)
+            self._journal_records = 0
+
+    def append_record(self, op: str, obj=None, job_id=None, settings=None, rank=None, minitask=None,
+                      completed_minitasks=None):
+
+        """ append a single mutation to the journal of pending objects
+
+        Parameters
+        ----------
+        op : str
+            type of mutation, allowed are "put", "delete", "finish", "settings"
+            and the MINITASK_OPS
+        obj : dict, optional
+            the object to store, for "put", or its finished record, for "finish"
+        job_id : str, optional
+            the id of the object to remove, for "delete", or of the project of
+            the minitask, for the MINITASK_OPS
+        settings : dict, optional
+            the settings of the app, for "settings"
+        rank : int, optional
+            position of the minitask in the project, for the MINITASK_OPS
+        minitask : dict, optional
+            the minitask inserted or replaced, for "insert_minitask" and "put_minitask"
+        completed_minitasks : int, optional
+            counter of the project after the change, for the MINITASK_OPS
+
+        Returns
+        -------
+        None
+        """
+
+        if op == "put" or op == "finish":
+            record = {"op": op, "obj": obj}
+
+        elif op == "delete":
+            record = {"op": op, "id": job_id}
+
+        elif op == "settings":
+            record = {"op": op, "settings": settings}
+
+        elif op in MINITASK_OPS:
+            record = {"op": op, "id": job_id, "rank": rank, "completed_minitasks": completed_minitasks}
+            if op != "delete_minitask":
+                record["minitask"] = minitask
+
+        else:
+            raise ValueError(f'journal operation "{op}" not recognized')
+
+        if self.store is not None:
+            self.store.apply(record=record)
+            logger.debug(f'database record applied: {op}')
+            return
+
+        with self._journal_lock:
+
+            with open(self._path(self.journal_filename), 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+            self._journal_records += 1
+            start_compaction = self._journal_records >= self.compaction_threshold
+
+        # fsync together with the other writes of the burst
+        self.writer.sync(self._path(self.journal_filename))
+
+        logger.debug(f'journal record appended: {op}')
+
+        if start_compaction:
+            self.compact_in_background()
+
+    def compact_in_background(self):
+
+        """ fold the journal into the snapshot in a background thread
+
+        Returns
+        -------
+        None
+        """
+
+        # one compaction at a time
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+
+        self._compaction = threading.Thread(target=self.compact, name="CacheCompaction",
+                                            daemon=True)
+        self._compaction.start()
+
+    def compact(self):
+
+        """ fold the journal into the snapshot of pending objects
+
+        The journal is first rotated, so that new records can be appended while
+        the snapshot is being written.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._snapshot_lock:
+
+            # the snapshot waiting for a flush is the base of the fold
+            self.writer.flush()
+
+            # rotate the journal
+            with self._journal_lock:
+
+                if self.journal_filename in os.listdir(path=CACHE_PATH):
+                    os.replace(self._path(self.journal_filename),
+                               self._path(f"{self.journal_filename}.old"))
+
+                self._journal_records = 0
+
+            # fold
+            _, pending_list = self._read_snapshot()
+            applied = self._replay_journal(f"{self.journal_filename}.old", pending_list)
+
+            if applied == 0:
+                self._remove(f"{self.journal_filename}.old")
+                return
+
+            self.writer.write(path=self._path(self.pending_filename),
+                              payload=json.dumps(pending_list), sync=True)
+
+            self._remove(f"{self.journal_filename}.old")
+
+        logger.info(f'journal compacted, {applied} records folded into the snapshot')
+
+    def _node_path(self, node_id: str):
+
+        return self._path(f"{self.nodes_folder}{split}{node_id}.json")
+
+    def get_node(self, node_id: str):
+
+        """ minitasks of a sub-project, read when the sub-project is opened
+
+        Parameters
+        ----------
+        node_id : str
+            id of the sub-project
+
+        Returns
+        -------
+        list : the minitasks of the sub-project, empty if not stored
+        """
+
+        if self.store is not None:
+            return self.store.get_node(node_id=node_id) or []
+
+        # a write of the node waiting for the flush
+        self.writer.flush()
+
+        try:
+            with open(self._node_path(node_id), 'rb') as f:
+                return json.loads(f.read())
+
+        except FileNotFoundError:
+            return []
+
+    def put_node(self, node_id: str, minitasks: list):
+
+        """ save the minitasks of a sub-project, apart from the pending objects
+
+        Parameters
+        ----------
+        node_id : str
+            id of the sub-project
+        minitasks : list
+            the minitasks right below the sub-project, in order
+
+        Returns
+        -------
+        None
+        """
+
+        if self.store is not None:
+            self.store.put_node(node_id=node_id, minitasks=minitasks)
+            return
+
+        os.makedirs(self._path(self.nodes_folder), exist_ok=True)
+        self.writer.write(path=self._node_path(node_id), payload=json.dumps(minitasks))
+
+        logger.debug(f'node {node_id} saved, {len(minitasks)} minitasks')
+
+    def delete_node(self, node_id: str):
+
+        """ delete a sub-project and the sub-projects below it
+
+        Parameters
+        ----------
+        node_id : str
+            id of the sub-project
+
+        Returns
+        -------
+        int : number of sub-projects deleted
+        """
+
+        deleted = 0
+        for minitask in self.get_node(node_id=node_id):
+            if minitask["type"] == "subproject":
+                deleted += self.delete_node(node_id=minitask["id"])
+
+        if self.store is not None:
+            self.store.delete_node(node_id=node_id)
+
+        elif os.path.exists(self._node_path(node_id)):
+            os.remove(self._node_path(node_id))
+
+        return deleted + 1
+
+    def _remove(self, filename: str):
+
+        if filename in os.listdir(path=CACHE_PATH):
+            os.remove(self._path(filename))
+
+    def import_json(self):
+
+        """ load the json snapshot and journal into the database
+
+        Returns
+        -------
+        int : number of imported job objects
+        """
+
+        if self.store is None:
+            raise RuntimeError('the json cache can only be imported into the sqlite backend')
+
+        _, pending_list, _ = self._read_json()
+        settings = pending_list.pop("settings", {})
+
+        self.store.replace_all(objects=list(pending_list.values()), settings=settings)
+
+        # the sub-projects
+        folder = self._path(self.nodes_folder)
+        if os.path.isdir(folder):
+            for filename in os.listdir(folder):
+
+                if not filename.endswith(".json"):
+                    continue
+
+                with open(f"{folder}{split}{filename}", 'rb') as f:
+                    self.store.put_node(node_id=filename[:-len(".json")], minitasks=json.loads(f.read()))
+
+        logger.info(f'{len(pending_list)} job objects imported from json')
+        return len(pending_list)
+
+    def export_json(self, filename=None):
+
+        """ write the pending objects as a json snapshot
+
+        Parameters
+        ----------
+        filename : str, optional
+            name of the file in the cache, default the pending objects file
+
+        Returns
+        -------
+        None
+        """
+
+        filename = self.pending_filename if filename is None else filename
+
+        _, pending_list = self.retrieve_objects()
+
+        self.writer.write(path=self._path(filename), payload=json.dumps(pending_list),
+                          sync=True)
+
+        logger.info(f'{len(pending_list)} job objects exported to {filename}')
+
     def save_timer_cache(self, timer_cache: dict):
 
         """ save the timer 
@@ -107,9 +1304,9 @@ class CacheInterface:
         None
         """
 
-        # save
-        with open(f"{CACHE_PATH}{split}{self.timer_filename}", 'w') as f:
-            f.write(json.dumps(timer_cache))
+        # save, the timer process reads it right away
+        self.writer.write(path=self._path(self.timer_filename),
+                          payload=json.dumps(timer_cache), sync=True)
 
         logger.info(f'timer cache successfully saved')
 
@@ -0,0 +1,170 @@
+import math
+import time
+
+import log_module
+
+
+""" TICK HUB
+
+one periodic dispatcher for the whole app: the screens subscribe their periodic
+callbacks when entered and unsubscribe them when left, each at its own rate in
+whole seconds. The callbacks due at the same second are called from a single
+wakeup, and there is no wakeup at all while nothing is subscribed
+"""
+
+# general logger
+logger = log_module.get_logger("ClockLogs")
+
+
+class TickHub:
+
+    """
+    callbacks called every `rate` seconds, on the whole seconds of the clock
+    """
+
+    __slots__ = ("scheduler", "clock", "subscriptions", "event")
+
+    def __init__(self, scheduler=None, clock=time.monotonic):
+
+        """
+        Parameters
+        ----------
+        scheduler : callable, optional
+            scheduler(callback, delay) returning an event with a cancel() method,
+            by default None: the hub only ticks when tick() is called
+        clock : callable, optional
+            monotonic clock in seconds, by default time.monotonic
+        """
+
+        self.scheduler = scheduler
+        self.clock = clock
+
+        # [rate, due time] of each callback
+        self.subscriptions = {}
+        self.event = None
+
+    def __len__(self):
+
+        return len(self.subscriptions)
+
+    def __contains__(self, callback):
+
+        return callback in self.subscriptions
+
+    @property
+    def count(self):
+
+        """
+        Returns
+        -------
+        int : number of active subscriptions, it should not grow with the visits
+        """
+
+        return len(self.subscriptions)
+
+    def subscribe(self, callback, rate=1):
+
+        """
+        Parameters
+        ----------
+        callback : callable
+            called with the time of the tick, subscribing it again only changes
+            its rate
+        rate : int, optional
+            seconds between two calls, by default 1
+        """
+
+        rate = max(1, int(rate))
+
+        # first call on the next whole second past the rate
+        due = math.floor(self.clock()) + rate
+        self.subscriptions[callback] = [rate, due]
+
+        logger.debug(f"subscribed {getattr(callback, '__qualname__', callback)} "
+                     f"every {rate}s - active subscriptions: {self.count}")
+
+        self._arm()
+
+    def unsubscribe(self, callback):
+
+        """
+        Parameters
+        ----------
+        callback : callable
+            subscribed callback, nothing happens if it is not subscribed
+        """
+
+        if self.subscriptions.pop(callback, None) is None:
+            return
+
+        logger.debug(f"unsubscribed {getattr(callback, '__qualname__', callback)} "
+                     f"- active subscriptions: {self.count}")
+
+        if not self.subscriptions:
+            self._cancel()
+
+    def tick(self, now=None):
+
+        """
+        call the callbacks due at the given time
+
+        Returns
+        -------
+        int : number of callbacks called
+        """
+
+        now = self.clock() if now is None else now
+
+        due = [(callback, subscription)
+               for callback, subscription in self.subscriptions.items()
+               if subscription[1] <= now]
+
+        for callback, subscription in due:
+
+            # unsubscribed by a previous callback of the same tick
+            if callback not in self.subscriptions:
+                continue
+
+            # the next call stays on the grid of the rate, skipping the missed ones
+            rate = subscription[0]
+            subscription[1] += rate * (math.floor((now - subscription[1]) / rate) + 1)
+
+            callback(now)
+
+        return len(due)
+
+    def next_wakeup(self, now=None):
+
+        """
+        Returns
+        -------
+        float : seconds to the next due callback, None without subscriptions
+        """
+
+        if not self.subscriptions:
+            return None
+
+        now = self.clock() if now is None else now
+
+        return max(0.0, min(due for _, due in self.subscriptions.values()) - now)
+
+    def _wake(self, *args):
+
+        self.event = None
+        self.tick()
+        self._arm()
+
+    def _arm(self):
+
+        if self.scheduler is None or not self.subscriptions:
+            return
+
+        # a new subscription may be due before the planned wakeup
+        self._cancel()
+        self.event = self.scheduler(self._wake, self.next_wakeup())
+
+    def _cancel(self):
+
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
@@ -8,15 +8,11 @@ from kivy.lang import Builder
 
 import time
 import sys
-import coloredlogs, logging
+
+import log_module
 
 # general logger
-general_logger = logging.getLogger(f"Clock")
-general_logger.setLevel(logging.DEBUG)
-stdout = logging.StreamHandler(stream=sys.stdout)
-fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-stdout.setFormatter(fmt)
-general_logger.addHandler(stdout)
+general_logger = log_module.get_logger("ClockWindowLogs")
 
 
 class ClockObj(Screen):
@@ -0,0 +1,388 @@
+import os
+import json
+import socket
+import threading
+
+import log_module
+import cache_module
+
+
+""" TIMER CHANNEL
+
+local message channel between the planner and the detached timer process: the
+planner listens on a Unix socket in the cache folder and the timer connects to
+it when launched. Messages are JSON objects, one per line:
+
+    planner -> timer : start {duration [min], direct, sent}, show {sent}, pause, stop
+    timer -> planner : progress {state, elapsed [s], remaining [s], duration [s]},
+                       event {event, mono, wall, run, ...} an event of the session log
+
+the messages are received on a reader thread and handed to `dispatch`, which
+the Kivy side sets to run them on the UI thread
+"""
+
+# general logger
+logger = log_module.get_logger("IpcLogs")
+
+SOCKET_PATH = f"{cache_module.CACHE_PATH}{cache_module.split}timer.sock"
+
+OPS = ("start", "show", "pause", "stop", "progress", "event")
+
+# bytes read at once from the socket
+BUFFER_SIZE = 4096
+
+
+def encode(op: str, **fields):
+
+    """
+    Parameters
+    ----------
+    op : str
+        kind of message, one of OPS
+    **fields
+        content of the message
+
+    Returns
+    -------
+    bytes : the message as a line of JSON
+    """
+
+    if op not in OPS:
+        raise ValueError(f"unknown message '{op}'")
+
+    return (json.dumps({"op": op, **fields}) + "\n").encode()
+
+
+def decode(line: bytes):
+
+    """
+    Returns
+    -------
+    dict : the message, None if the line is not a valid message
+    """
+
+    try:
+        message = json.loads(line)
+
+    except ValueError:
+        logger.warning(f"invalid message: {line[:80]}")
+        return None
+
+    if not isinstance(message, dict) or message.get("op") not in OPS:
+        logger.warning(f"unknown message: {line[:80]}")
+        return None
+
+    return message
+
+
+def run(callback, *args):
+
+    """ default dispatch, the callback runs on the reader thread """
+
+    callback(*args)
+
+
+class Channel:
+
+    """
+    a connected end of the socket, sending messages and reading the ones of the
+    other end on a background thread
+    """
+
+    def __init__(self, sock, on_message, on_close=None, dispatch=run):
+
+        """
+        Parameters
+        ----------
+        sock : socket.socket
+            connected Unix socket
+        on_message : callable
+            called with each received message
+        on_close : callable, optional
+            called without arguments when the other end is gone
+        dispatch : callable, optional
+            dispatch(callback, *args) runs a callback, by default right away
+        """
+
+        self.sock = sock
+        self.on_message = on_message
+        self.on_close = on_close
+        self.dispatch = dispatch
+
+        self.closed = False
+        self._lock = threading.Lock()
+
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def send(self, op: str, **fields):
+
+        """
+        Returns
+        -------
+        bool : True if the message was sent, False if the channel is closed
+        """
+
+        payload = encode(op, **fields)
+
+        with self._lock:
+
+            if self.closed:
+                return False
+
+            try:
+                self.sock.sendall(payload)
+
+            except OSError as e:
+                logger.warning(f"'{op}' not sent: {e}")
+                return False
+
+        return True
+
+    def close(self):
+
+        with self._lock:
+
+            if self.closed:
+                return
+
+            self.closed = True
+
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+            self.sock.close()
+
+    def _read(self):
+
+        buffer = b""
+        while True:
+
+            try:
+                chunk = self.sock.recv(BUFFER_SIZE)
+            except OSError:
+                chunk = b""
+
+            if not chunk:
+                break
+
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+
+            for line in lines:
+                message = decode(line)
+                if message is not None:
+                    self.dispatch(self.on_message, message)
+
+        self.close()
+
+        if self.on_close is not None:
+            self.dispatch(self.on_close)
+
+
+class TimerServer:
+
+    """
+    planner end of the channel: it accepts the timer process, forwards the
+    commands and keeps the last progress of the timer
+    """
+
+    def __init__(self, path=SOCKET_PATH, dispatch=run, on_event=None):
+
+        """
+        Parameters
+        ----------
+        path : str, optional
+            path of the socket, by default in the cache folder
+        dispatch : callable, optional
+            dispatch(callback, *args) runs a callback, by default right away
+        on_event : callable, optional
+            called with each session event of the timer, e.g. SessionLog.append
+        """
+
+        self.path = path
+        self.dispatch = dispatch
+        self.on_event = on_event
+
+        self.sock = None
+        self.channel = None
+
+        # commands sent before the timer connected
+        self.pending = []
+
+        # last progress message of the timer, None without a timer
+        self.progress = None
+        self.subscribers = []
+
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self):
+
+        return self.channel is not None and not self.channel.closed
+
+    def listen(self):
+
+        """
+        open the socket and accept the timer on a background thread
+
+        Returns
+        -------
+        bool : True if the socket is open
+        """
+
+        if self.sock is not None:
+            return True
+
+        # a socket file left by a previous run
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        try:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.bind(self.path)
+            self.sock.listen(1)
+
+        except (AttributeError, OSError) as e:
+            logger.error(f"timer channel not available: {e}")
+            self.sock = None
+            return False
+
+        threading.Thread(target=self._accept, daemon=True).start()
+        logger.info(f"timer channel listening on {self.path}")
+
+        return True
+
+    def send(self, op: str, **fields):
+
+        """ send a command to the timer, kept until it connects """
+
+        with self._lock:
+
+            if self.connected and self.channel.send(op, **fields):
+                return
+
+            # a new start makes the previous commands moot
+            if op == "start":
+                self.pending = []
+
+            self.pending += [(op, fields)]
+
+    def subscribe(self, callback):
+
+        """
+        Parameters
+        ----------
+        callback : callable
+            called with the progress message, or None when the timer is gone
+        """
+
+        if callback not in self.subscribers:
+            self.subscribers += [callback]
+
+    def unsubscribe(self, callback):
+
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def close(self):
+
+        if self.channel is not None:
+            self.channel.close()
+
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _accept(self):
+
+        while self.sock is not None:
+
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break
+
+            with self._lock:
+
+                # a single timer at a time, the newest one
+                if self.channel is not None:
+                    self.channel.close()
+
+                self.channel = Channel(sock=conn, on_message=self._on_message,
+                                       on_close=self._on_close, dispatch=self.dispatch)
+
+                for op, fields in self.pending:
+                    self.channel.send(op, **fields)
+                self.pending = []
+
+            logger.info("timer connected")
+
+    def _on_message(self, message: dict):
+
+        # the planner writes the session log of both processes
+        if message["op"] == "event":
+            if self.on_event is not None:
+                self.on_event({key: value for key, value in message.items() if key != "op"})
+            return
+
+        if message["op"] != "progress":
+            logger.warning(f"unexpected message from the timer: {message['op']}")
+            return
+
+        self.progress = message
+        self._notify()
+
+    def _on_close(self):
+
+        if self.connected:
+            return
+
+        logger.info("timer disconnected")
+
+        self.progress = None
+        self._notify()
+
+    def _notify(self):
+
+        for callback in list(self.subscribers):
+            callback(self.progress)
+
+
+def connect(on_message, on_close=None, dispatch=run, path=SOCKET_PATH):
+
+    """
+    timer end of the channel
+
+    Parameters
+    ----------
+    on_message : callable
+        called with each command of the planner
+    on_close : callable, optional
+        called without arguments when the planner is gone
+    dispatch : callable, optional
+        dispatch(callback, *args) runs a callback, by default right away
+    path : str, optional
+        path of the socket, by default in the cache folder
+
+    Returns
+    -------
+    Channel : the connected channel, None if the planner is not listening
+    """
+
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+
+    except (AttributeError, OSError) as e:
+        logger.info(f"no planner to connect to: {e}")
+        return None
+
+    logger.info("connected to the planner")
+
+    return Channel(sock=sock, on_message=on_message, on_close=on_close, dispatch=dispatch)
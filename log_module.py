@@ -0,0 +1,125 @@
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+
+
+""" LOGGING
+
+one logging subsystem for the whole app: the loggers only put their records in
+a queue, and a listener thread writes them to stdout, off the UI thread
+"""
+
+LEVEL = logging.DEBUG
+FORMAT = "%(name)s: %(asctime)s | %(levelname)s | %(message)s"
+
+# records waiting to be written
+records = queue.SimpleQueue()
+
+# cached loggers, by category
+loggers = {}
+
+listener = None
+
+
+def start():
+
+    """
+    start the listener thread writing the queued records, once
+
+    Returns
+    -------
+    None
+    """
+
+    global listener
+
+    if listener is not None:
+        return
+
+    stdout = logging.StreamHandler(stream=sys.stdout)
+    stdout.setFormatter(logging.Formatter(FORMAT))
+
+    listener = logging.handlers.QueueListener(records, stdout, respect_handler_level=False)
+    listener.start()
+
+    # write the last records at exit
+    atexit.register(stop)
+
+
+def stop():
+
+    """
+    write the queued records and stop the listener thread
+
+    Returns
+    -------
+    None
+    """
+
+    global listener
+
+    if listener is None:
+        return
+
+    listener.stop()
+    listener = None
+
+
+def get_logger(category: str):
+
+    """
+    Parameters
+    ----------
+    category : str
+        name of the logger, e.g. "JobsManager"
+
+    Returns
+    -------
+    logging.Logger : the logger of the category, created once
+    """
+
+    if category in loggers:
+        return loggers[category]
+
+    start()
+
+    logger = logging.getLogger(category)
+    logger.setLevel(LEVEL)
+    logger.propagate = False
+
+    # a single handler per logger, whatever the number of objects sharing it
+    logger.handlers = [logging.handlers.QueueHandler(records)]
+
+    loggers[category] = logger
+
+    return logger
+
+
+def set_level(level, category=None):
+
+    """
+    change the level of the loggers at runtime
+
+    Parameters
+    ----------
+    level : int or str
+        new level, e.g. logging.INFO or "INFO"
+    category : str, optional
+        logger to change, by default all of them and the ones created later
+
+    Returns
+    -------
+    None
+    """
+
+    global LEVEL
+
+    if category is not None:
+        get_logger(category).setLevel(level)
+        return
+
+    LEVEL = level
+    for logger in loggers.values():
+        logger.setLevel(level)
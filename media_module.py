@@ -0,0 +1,142 @@
+import os
+import json
+
+import log_module
+
+
+""" MEDIA
+
+the button-state variants of each window are packed in an atlas by a build step,
+`python media_module.py`, and the images are then displayed as regions of the
+preloaded atlas textures instead of PNG files decoded at every press
+"""
+
+# general logger
+logger = log_module.get_logger("MediaLogs")
+
+MEDIA_PATH = "media"
+ATLAS_PATH = f"{MEDIA_PATH}/atlas"
+INDEX_FILE = f"{ATLAS_PATH}/index.json"
+ATLAS_SIZE = 2048
+
+# folders that are not images of the app
+SKIPPED = ("atlas", "meme_gif", "screenshots")
+
+# source of each image, by path
+sources = None
+
+
+def build(size=ATLAS_SIZE):
+
+    """
+    pack the images of each media folder in an atlas, and index them by path
+
+    Parameters
+    ----------
+    size : int
+        side of the atlas images, in pixels
+
+    Returns
+    -------
+    dict : the atlas source of each image, by path
+    """
+
+    from kivy.atlas import Atlas
+
+    os.makedirs(ATLAS_PATH, exist_ok=True)
+
+    index = {}
+    for folder in sorted(os.listdir(MEDIA_PATH)):
+
+        if folder in SKIPPED or not os.path.isdir(f"{MEDIA_PATH}/{folder}"):
+            continue
+
+        filenames = sorted(f"{MEDIA_PATH}/{folder}/{name}"
+                           for name in os.listdir(f"{MEDIA_PATH}/{folder}")
+                           if name.endswith(".png"))
+
+        outname = f"{ATLAS_PATH}/{folder.lower().replace(' ', '_')}"
+        if not Atlas.create(outname, filenames, size):
+            logger.error(f"images of '{folder}' do not fit in a {size}px atlas")
+            continue
+
+        for filename in filenames:
+            uid = os.path.splitext(os.path.basename(filename))[0]
+            index[filename] = f"atlas://{outname}/{uid}"
+
+        logger.info(f"packed {len(filenames)} images of '{folder}'")
+
+    with open(INDEX_FILE, "w") as f:
+        json.dump(index, f, indent=1)
+
+    return index
+
+
+def load_index():
+
+    """
+    load the atlas index, images are read from their files if it was not built
+
+    Returns
+    -------
+    None
+    """
+
+    global sources
+
+    try:
+        with open(INDEX_FILE, "r") as f:
+            sources = json.load(f)
+
+    except FileNotFoundError:
+        logger.debug("no atlas built, images are loaded from their files")
+        sources = {}
+
+
+def source(path: str):
+
+    """
+    Parameters
+    ----------
+    path : str
+        path of an image, e.g. "media/Job obj/job_icons_delete.png"
+
+    Returns
+    -------
+    str : the atlas region of the image, or its path if it was not packed
+    """
+
+    if sources is None:
+        load_index()
+
+    return sources.get(path, path)
+
+
+def preload():
+
+    """
+    decode and upload the atlas textures once, the image sources then only
+    switch region
+
+    Returns
+    -------
+    None
+    """
+
+    from kivy.atlas import Atlas
+    from kivy.cache import Cache
+
+    if sources is None:
+        load_index()
+
+    for rfn in sorted({url[len("atlas://"):].rsplit("/", 1)[0] for url in sources.values()}):
+
+        # the same cache Kivy looks up for an atlas:// source
+        if Cache.get("kv.atlas", rfn) is None:
+            Cache.append("kv.atlas", rfn, Atlas(f"{rfn}.atlas"))
+
+    logger.debug(f"preloaded {len(sources)} images")
+
+
+if __name__ == "__main__":
+    build()
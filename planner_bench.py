@@ -0,0 +1,448 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+
+import log_module
+import cache_module
+import planner_engine
+
+
+""" BENCHMARKS
+
+timing of the hot paths of the planner on synthetic backlogs, without a display:
+
+    python planner_bench.py                          # every size, to stdout
+    python planner_bench.py --sizes 10 1000 --repeat 7 --output bench.json
+
+each benchmark runs on a scratch cache folder, with backlogs generated from a
+fixed seed, and the results are written as JSON: one entry per benchmark and
+size, with the min, median and mean run times in seconds. The report also has
+the cold import time of the modules of the app, measured in new interpreters
+"""
+
+SIZES = (10, 1000, 10000, 100000)
+MINITASKS = (100, 500)
+INTERVALS = (1000, 10000, 100000)  # 100000: about ten years of daily sessions
+REPEAT = 5
+SEED = 0
+
+# rows of the schedule in view, as in planner_lib
+PAGE_ROWS = 18
+
+# modules imported by planner_lib at startup, apart from Kivy
+STARTUP_MODULES = ("log_module", "cache_module", "media_module", "timer_module", "clock_module",
+                   "ipc_module", "session_module", "planner_core", "planner_engine")
+
+# modules loaded on first use only, none of them should be imported at startup
+LAZY_MODULES = ("numpy", "analytics_module")
+
+
+""" BACKLOGS """
+
+
+def make_jobs(size: int, seed=SEED):
+
+    """
+    Parameters
+    ----------
+    size : int
+        number of jobs, a tenth of them projects
+    seed : int, optional
+        seed of the generator, by default SEED
+
+    Returns
+    -------
+    list : the data of the jobs, in the format of the cache
+    """
+
+    rng = random.Random(seed)
+
+    jobs = []
+    for i in range(size):
+
+        data = {
+            "id": f"{i:032x}",
+            "name": f"job {i}",
+            "priority": rng.randint(1, 100),
+            "deadline": rng.randint(600, 7 * 24 * 3600),
+            "creation": 1.7e9 + i,
+            "type": "task",
+            "duration": rng.randint(10, 240),
+        }
+
+        if i % 10 == 9:
+            data["type"] = "project"
+            data["current_minitasks"] = make_minitasks(size=rng.randint(1, 8), seed=i)
+            data["completed_minitasks"] = 0
+            del data["duration"]
+
+        jobs += [data]
+
+    return jobs
+
+
+def make_minitasks(size: int, seed=SEED):
+
+    rng = random.Random(seed)
+
+    return [{"name": f"mini-task-{i}", "type": "minitask", "rank": i,
+             "duration": rng.randint(5, 60), "creation": 1.7e9 + i}
+            for i in range(size)]
+
+
+def make_session_log(path: str, size: int, seed=SEED):
+
+    """
+    write a session log of `size` intervals, focus and rest in turn, about
+    thirty a day, with their timer events
+    """
+
+    rng = random.Random(seed)
+
+    wall = 1.6e9
+    with open(path, "w") as f:
+        for i in range(size):
+
+            kind = ("focus", "rest")[i % 2]
+            planned = 60 * (25 if kind == "focus" else 5)
+            run = rng.randint(planned // 2, planned)
+            wall += run + rng.randint(0, 2 * 86400 // 30 - planned)
+
+            event = {"event": "interval", "kind": kind, "planned": planned, "job": f"{i % 50:032x}",
+                     "mono": wall - 1.6e9, "wall": wall, "run": "bench", "session": None}
+            event.update({"focus": run} if kind == "focus" else {"rest": run, "idle": 0})
+
+            f.write(json.dumps({**event, "event": "start"}) + "\n")
+            f.write(json.dumps({**event, "event": "finish"}) + "\n")
+            f.write(json.dumps(event) + "\n")
+
+
+def make_engine(cache, jobs: list, ranked=True):
+
+    """
+    Returns
+    -------
+    planner_engine.JobsEngine : the engine of the jobs, all of them ranked or
+        all of them dormant
+    """
+
+    engine = planner_engine.JobsEngine(cache=cache)
+
+    if ranked:
+        for data in jobs:
+            engine.add_job(data=data, journal=False)
+
+    else:
+        engine.dormant_jobs = sorted(jobs, key=planner_engine.dormant_key)[::-1]
+
+    return engine
+
+
+""" BENCHMARKS """
+
+# each benchmark is a setup, not timed, returning the timed run
+
+
+def bench_compute_scores(cache, size: int):
+
+    engine = make_engine(cache=cache, jobs=make_jobs(size=size))
+
+    return engine.compute_scores
+
+
+def bench_refresh(cache, size: int):
+
+    # the first page of a freshly loaded schedule, ranked from the dormant jobs
+    engine = make_engine(cache=cache, jobs=make_jobs(size=size), ranked=False)
+
+    def run():
+        return [job.view_data() for job in engine.page(rows=PAGE_ROWS)]
+
+    return run
+
+
+def bench_load_pending(cache, size: int):
+
+    cache.save_pending_objects(objects=make_jobs(size=size), settings=dict(planner_engine.SETTINGS))
+    cache.writer.flush()
+
+    def run():
+        engine = planner_engine.JobsEngine(cache=cache)
+        engine.load_pending()
+        engine.page(rows=PAGE_ROWS)
+
+    return run
+
+
+def bench_save_pending(cache, size: int):
+
+    engine = make_engine(cache=cache, jobs=make_jobs(size=size))
+
+    def run():
+        engine.save_pending()
+        cache.writer.flush()
+
+    return run
+
+
+def bench_save_pending_objects(cache, size: int):
+
+    objects = make_jobs(size=size)
+    settings = dict(planner_engine.SETTINGS)
+
+    def run():
+        cache.save_pending_objects(objects=objects, settings=settings)
+        cache.writer.flush()
+
+    return run
+
+
+def bench_save_mini_task(cache, size: int):
+
+    # minitasks inserted one by one at a random rank, as from the NewMiniTask window
+    rng = random.Random(SEED)
+    minitasks = [{**data, "rank": rng.randint(0, i)}
+                 for i, data in enumerate(make_minitasks(size=size))]
+
+    def run():
+        project = planner_engine.ProjectEngine()
+        for data in minitasks:
+            project.add_minitask(data=data)
+
+    return run
+
+
+def bench_update_project(cache, size: int):
+
+    # a minitask edit of a project of `size` minitasks journaled, as when
+    # leaving the project window
+    engine = planner_engine.JobsEngine(cache=cache)
+    job = engine.add_job(data={"name": "project", "type": "project", "priority": 1, "deadline": 3600,
+                               "current_minitasks": make_minitasks(size=size), "completed_minitasks": 0})
+    cache.writer.flush()
+
+    project = planner_engine.ProjectEngine(cache=cache)
+    project.load(project_data=job.data)
+    project.add_minitask(data={**make_minitasks(size=1)[0], "rank": size // 2})
+
+    def run():
+        engine.update_project(updated_data=project.delta())
+        cache.writer.flush()
+
+    return run
+
+
+def bench_load_history(cache, size: int):
+
+    import analytics_module
+
+    # the whole log parsed, as on the first load
+    log_path = f"{cache_module.CACHE_PATH}{cache_module.split}sessions.log"
+    make_session_log(path=log_path, size=size)
+
+    def run():
+        return analytics_module.load_history(log_path=log_path, path=None)
+
+    return run
+
+
+def bench_analytics(cache, size: int):
+
+    import analytics_module
+
+    log_path = f"{cache_module.CACHE_PATH}{cache_module.split}sessions.log"
+    make_session_log(path=log_path, size=size)
+    history = analytics_module.load_history(log_path=log_path, path=None)
+
+    def run():
+        return analytics_module.summary(history, offset=0)
+
+    return run
+
+
+# benchmark, sizes it runs on
+BENCHMARKS = {
+    "compute_scores": (bench_compute_scores, SIZES),
+    "refresh": (bench_refresh, SIZES),
+    "load_pending": (bench_load_pending, SIZES),
+    "save_pending": (bench_save_pending, SIZES),
+    "save_pending_objects": (bench_save_pending_objects, SIZES),
+    "save_mini_task": (bench_save_mini_task, MINITASKS),
+    "update_project": (bench_update_project, (100, 1000, 10000)),
+    "load_history": (bench_load_history, INTERVALS),
+    "analytics": (bench_analytics, INTERVALS),
+}
+
+
+def measure(name: str, size: int, repeat=REPEAT, backend=cache_module.BACKEND):
+
+    """
+    time a benchmark, each run on a new scratch cache
+
+    Parameters
+    ----------
+    name : str
+        name of the benchmark, a key of BENCHMARKS
+    size : int
+        number of jobs, or of minitasks
+    repeat : int, optional
+        number of timed runs, by default REPEAT
+    backend : str, optional
+        storage backend of the cache, by default the one of the app
+
+    Returns
+    -------
+    dict : the run times in seconds
+    """
+
+    setup, _ = BENCHMARKS[name]
+
+    times = []
+    for _ in range(repeat):
+
+        folder = tempfile.mkdtemp(prefix="planner_bench_")
+        cache_module.CACHE_PATH = folder
+
+        try:
+            cache = cache_module.CacheInterface(backend=backend)
+            run = setup(cache=cache, size=size)
+
+            start = time.perf_counter()
+            run()
+            times += [time.perf_counter() - start]
+
+            cache.writer.flush()
+            if cache.store is not None:
+                cache.store.close()
+
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "benchmark": name,
+        "size": size,
+        "backend": backend,
+        "repeat": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def measure_imports(modules=STARTUP_MODULES, repeat=REPEAT):
+
+    """
+    time the cold import of the startup modules, each run in a new interpreter
+    with `python -X importtime`
+
+    Parameters
+    ----------
+    modules : tuple, optional
+        modules imported, by default STARTUP_MODULES
+    repeat : int, optional
+        number of interpreters, by default REPEAT
+
+    Returns
+    -------
+    dict : the total import time in seconds, the median cumulative time of
+        each module, and the LAZY_MODULES loaded by the imports
+    """
+
+    script = (f"import sys, {', '.join(modules)}\n"
+              f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+
+    totals, cumulative, loaded = [], {}, set()
+    for _ in range(repeat):
+
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                                 capture_output=True, text=True, check=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        loaded.update(process.stdout.split())
+
+        # "import time: self [us] | cumulative | imported package", the
+        # imports of the script are the lines without indentation, the ones of
+        # the interpreter startup are left out
+        total = 0
+        for line in process.stderr.splitlines():
+
+            if not line.startswith("import time:"):
+                continue
+
+            _, time_us, name = line.split("|")
+            if not time_us.strip().isdigit() or name.startswith("  ") or name.strip() not in modules:
+                continue
+
+            name = name.strip()
+            cumulative.setdefault(name, []).append(int(time_us) / 1e6)
+            total += int(time_us) / 1e6
+
+        totals += [total]
+
+    return {
+        "modules": list(modules),
+        "repeat": repeat,
+        "min": min(totals),
+        "median": statistics.median(totals),
+        "cumulative": {name: statistics.median(times) for name, times in cumulative.items()},
+        "lazy_loaded": sorted(loaded),
+    }
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog="planner_bench",
+                                     description="time the hot paths of the planner")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="sizes of the backlogs, by default the ones of each benchmark")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default=cache_module.BACKEND)
+    parser.add_argument("--output", default=None, help="JSON file of the results, stdout by default")
+    args = parser.parse_args(argv)
+
+    log_module.set_level("ERROR")
+
+    imports = measure_imports(repeat=args.repeat)
+    print(f"{'imports':<22} {len(imports['modules']):>7}  median {1000 * imports['median']:10.3f}ms",
+          file=sys.stderr)
+    if imports["lazy_loaded"]:
+        print(f"lazy modules imported at startup: {', '.join(imports['lazy_loaded'])}", file=sys.stderr)
+
+    results = []
+    for name in args.benchmarks:
+        for size in args.sizes or BENCHMARKS[name][1]:
+
+            result = measure(name=name, size=size, repeat=args.repeat, backend=args.backend)
+            results += [result]
+
+            print(f"{name:<22} {size:>7}  median {1000 * result['median']:10.3f}ms", file=sys.stderr)
+
+    report = {
+        "time": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "imports": imports,
+        "results": results,
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+        return
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import sys
+import json
+import argparse
+
+import log_module
+import cache_module
+import planner_engine
+
+
+""" COMMAND LINE
+
+batch management of the jobs on the cache of the planner, without a display:
+
+    python planner_cli.py import jobs.json      # a JSON list, or one job per line
+    python planner_cli.py list --limit 20
+    python planner_cli.py reprioritize "job 3" 5
+    python planner_cli.py complete 1f0c...      # a job by id or by name
+    python planner_cli.py stats                 # focus time from the session log
+    python planner_cli.py --backend sqlite list # the sqlite cache, see below
+    python planner_cli.py export backup.json    # the pending jobs as a json snapshot
+    python planner_cli.py --backend sqlite finished --limit 10
+
+the jobs are addressed by id or by name, and the changes are journaled in the
+cache like the ones of the app. The backend is the one of the app, json unless
+the PLANNER_BACKEND environment variable says "sqlite"; the sqlite cache imports
+the json one when it is first opened, and keeps the finished jobs
+"""
+
+# fields of an imported job, when missing
+TASK_DEFAULTS = {"priority": 1, "deadline": 7200, "duration": 120}
+PROJECT_DEFAULTS = {"priority": 1, "deadline": 7200, "current_minitasks": [],
+                    "completed_minitasks": 0}
+
+
+def read_jobs(filename: str):
+
+    """
+    Parameters
+    ----------
+    filename : str
+        a JSON list of jobs, or a job per line
+
+    Returns
+    -------
+    list : the data of the jobs, with the missing fields set
+    """
+
+    with open(filename, "r") as f:
+        content = f.read().strip()
+
+    if content.startswith("["):
+        records = json.loads(content)
+    else:
+        records = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    jobs = []
+    for record in records:
+
+        kind = record.get("type", "task")
+        if kind not in ("task", "project"):
+            raise ValueError(f'job "{record.get("name")}": type <{kind}> cannot be imported')
+
+        defaults = TASK_DEFAULTS if kind == "task" else PROJECT_DEFAULTS
+        jobs += [{**defaults, **record, "type": kind, "priority": int(record.get("priority", 1))}]
+
+    return jobs
+
+
+def bulk_import(engine, filename: str):
+
+    """
+    add the jobs of a file, the ones with the id of a pending job are skipped
+
+    Returns
+    -------
+    int : number of jobs added
+    """
+
+    jobs = read_jobs(filename=filename)
+
+    ids = {job.id for job in engine.queue} | {data["id"] for data in engine.dormant_jobs}
+
+    added = 0
+    for data in jobs:
+
+        if data.get("id") in ids:
+            print(f'skipped "{data["name"]}", its id {data["id"]} is already used', file=sys.stderr)
+            continue
+
+        job = engine.add_job(data=data, journal=False)
+        ids.add(job.id)
+        added += 1
+
+    # a single snapshot instead of a journal record per job
+    if added:
+        engine.save_pending()
+
+    return added
+
+
+def list_jobs(engine, limit=None, as_json=False):
+
+    """
+    print the ranked jobs, the highest score first
+
+    Returns
+    -------
+    None
+    """
+
+    engine.hydrate(rows=limit)
+
+    for rank, job in enumerate(engine.ranked(limit=limit)):
+
+        if as_json:
+            print(json.dumps({**job.data, "rank": rank}))
+        else:
+            print(f"{rank:>5}  {job.value:>5}  {job.type:<8}  {job.id}  {job.name}")
+
+
+def list_finished(cache, limit=None):
+
+    """
+    print the finished jobs, from the oldest
+
+    Returns
+    -------
+    None
+    """
+
+    if cache.store is None:
+        sys.exit("the finished jobs are only kept by the sqlite backend")
+
+    for finished_at, record in cache.store.history(limit=-1 if limit is None else limit):
+        print(json.dumps({"finished_at": finished_at, **record}))
+
+
+def find_job(engine, ref: str):
+
+    job = engine.find(ref)
+
+    if job is None:
+        sys.exit(f'no job "{ref}"')
+
+    return job
+
+
+def build_parser():
+
+    parser = argparse.ArgumentParser(prog="planner_cli",
+                                     description="manage the jobs of the planner without its windows")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log the operations")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default=cache_module.BACKEND,
+                        help=f"storage of the jobs, by default {cache_module.BACKEND}")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bulk = commands.add_parser("import", help="add the jobs of a JSON or JSON-lines file")
+    bulk.add_argument("filename")
+
+    ranking = commands.add_parser("list", help="print the ranked jobs")
+    ranking.add_argument("--limit", type=int, default=None, help="number of jobs, all by default")
+    ranking.add_argument("--json", action="store_true", help="a JSON object per job")
+
+    change = commands.add_parser("reprioritize", help="change the priority of a job")
+    change.add_argument("job", help="id or name of the job")
+    change.add_argument("priority", type=int)
+
+    complete = commands.add_parser("complete", help="complete a job")
+    complete.add_argument("job", help="id or name of the job")
+
+    commands.add_parser("stats", help="print the focus analytics of the session log")
+
+    export = commands.add_parser("export", help="write the pending jobs as a json snapshot")
+    export.add_argument("filename", nargs="?", default=None,
+                        help="file in the cache folder, by default the snapshot of the json backend")
+
+    history = commands.add_parser("finished", help="print the finished jobs, sqlite backend only")
+    history.add_argument("--limit", type=int, default=None, help="number of jobs, all by default")
+
+    return parser
+
+
+def main(argv=None):
+
+    args = build_parser().parse_args(argv)
+
+    if not args.verbose:
+        log_module.set_level("WARNING")
+
+    # the analytics only read the session log, NumPy is loaded for them only
+    if args.command == "stats":
+        import analytics_module
+        json.dump(analytics_module.summary(analytics_module.load_history()), sys.stdout, indent=1)
+        print()
+        return
+
+    cache = cache_module.CacheInterface(backend=args.backend)
+
+    if args.command == "export":
+        cache.export_json(filename=args.filename)
+        return
+
+    if args.command == "finished":
+        list_finished(cache, limit=args.limit)
+        return
+
+    engine = planner_engine.JobsEngine(cache=cache)
+    engine.load_pending()
+
+    if args.command == "import":
+        print(f"{bulk_import(engine, filename=args.filename)} jobs imported")
+
+    elif args.command == "list":
+        list_jobs(engine, limit=args.limit, as_json=args.json)
+
+    elif args.command == "reprioritize":
+        job = engine.reprioritize(job_id=find_job(engine, ref=args.job).id, priority=args.priority)
+        print(f'"{job.name}" priority {job.priority}')
+
+    elif args.command == "complete":
+        job = engine.complete_job(job_id=find_job(engine, ref=args.job).id)
+        print(f'"{job.name}" completed')
+
+    # write the pending snapshot and journal before leaving
+    engine.cache.writer.flush()
+
+
+if __name__ == "__main__":
+    main()
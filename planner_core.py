@@ -0,0 +1,1253 @@
+import time
+import uuid
+import heapq
+import random
+import functools
+
+import log_module
+
+
+""" CORE MODEL
+
+jobs, minitasks and finished records of the planner, without any Kivy
+dependency: the widgets of planner_lib are views over these records
+"""
+
+# general logger
+logger = log_module.get_logger("CoreLogs")
+
+
+def new_id():
+
+    """
+    Returns
+    -------
+    str : a new stable identifier of a job or a minitask
+    """
+
+    return uuid.uuid4().hex
+
+
+# distinct (duration, focus, rest) plans kept in memory
+PLAN_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def interval_plan(duration: int, focus: int, rest: int):
+
+    """
+    intervals of a focus session as focus-rest-focus-rest...-focus, the last focus
+    interval holding the remainder of the duration. The plans are memoized and
+    shared by the tasks, the minitasks and the free sessions: the planner clears
+    them with `interval_plan.cache_clear()` when the focus or rest length changes
+
+    Parameters
+    ----------
+    duration : int
+        total focus time, in minutes
+    focus : int
+        length of a focus interval, in minutes
+    rest : int
+        length of a rest interval, in minutes
+
+    Returns
+    -------
+    tuple : lengths of the intervals in minutes
+    """
+
+    if focus <= 0:
+        raise ValueError(f"focus interval of {focus} minutes")
+
+    full, remainder = divmod(duration, focus)
+
+    # no empty focus interval after a whole number of them: a 60 minutes task is
+    # (30, 5, 30), not (30, 5, 30, 5, 0), which ended the session with a rest and
+    # a focus interval of 0 minutes. The free sessions, a whole number of focus
+    # intervals, always had this shape
+    lengths = [focus] * full + ([remainder] if remainder or not full else [])
+
+    intervals = []
+    for length in lengths:
+        intervals += [length, rest]
+
+    return tuple(intervals[:-1])
+
+
+""" JOBS """
+
+
+class Task:
+
+    """
+    pending task, with the totals of its focus sessions
+    """
+
+    __slots__ = ("id", "name", "type", "priority", "deadline", "duration", "creation",
+                 "done", "rank", "value", "tot_focus", "tot_rest", "tot_idle")
+
+    def __init__(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            data of the task, as saved in the cache or set in the NewJob window
+        """
+
+        self.id = data.get("id") or new_id()
+        self.name = data["name"]
+        self.type = "task"
+        self.priority = data["priority"]
+        self.deadline = data["deadline"]
+        self.duration = data["duration"]
+        self.creation = data.get("creation", time.time())
+        self.done = False
+
+        self.rank = 0
+        self.value = 0
+
+        # record from the focused sessions
+        self.tot_focus = data.get("tot_focus", 0)
+        self.tot_rest = data.get("tot_rest", 0)
+        self.tot_idle = data.get("tot_idle", 0)
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the task, in the format of the cache
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "rank": self.rank,
+            "deadline": self.deadline,
+            "priority": self.priority,
+            "next_window": "schedule_window",
+            "creation": self.creation,
+            "done": self.done,
+            "duration": self.duration,
+            "tot_focus": self.tot_focus,
+            "tot_rest": self.tot_rest,
+            "tot_idle": self.tot_idle,
+        }
+
+    def set_score(self, value: float):
+
+        self.value = value
+
+    def update_priority(self, priority: int):
+
+        self.priority = priority
+
+    def set_rank(self, rank: int):
+
+        self.rank = rank
+
+    def update_focus(self, focus_package: dict):
+
+        """
+        update the totals after a focus session
+
+        Parameters
+        ----------
+        focus_package : dict
+            results of the session, with tot_focus, tot_rest, tot_idle and done
+        """
+
+        self.tot_focus = focus_package["tot_focus"]
+        self.tot_rest = focus_package["tot_rest"]
+        self.tot_idle = focus_package["tot_idle"]
+        self.done = focus_package["done"]
+
+    def provide_focus_data(self, focus: int, rest: int):
+
+        """
+        compute the intervals as focus-rest-focus-rest... from the total task duration
+
+        Parameters
+        ----------
+        focus : int
+            length of a focus interval, in minutes
+        rest : int
+            length of a rest interval, in minutes
+
+        Returns
+        -------
+        dict : intervals, rank, type, next_window
+        """
+
+        return {
+            "intervals": interval_plan(duration=self.duration, focus=focus, rest=rest),
+            "id": self.id,
+            "rank": self.rank,
+            "type": self.type,
+            "next_window": "schedule_window",
+        }
+
+    def finish(self, priority: int):
+
+        """
+        Parameters
+        ----------
+        priority : int
+            priority of the finished record in the ranking
+
+        Returns
+        -------
+        FinishedJob : the record of the completed task
+        """
+
+        record = self.data
+        record["type"] = f"finished {self.type}"
+        record["done"] = True
+
+        return FinishedJob(record=record, priority=priority)
+
+    def view_data(self):
+
+        """
+        Returns
+        -------
+        dict : the properties of the row displaying the task
+        """
+
+        return {
+            "job_id": self.id,
+            "rank": self.rank,
+            "job_name": self.name,
+            "score": str(self.value),
+            "status": "pending",
+            "kind": self.type,
+        }
+
+
+class Project:
+
+    """
+    pending project, made of minitasks
+    """
+
+    __slots__ = ("id", "name", "type", "priority", "deadline", "creation", "done", "rank",
+                 "value", "current_minitasks", "completed_minitasks", "finished")
+
+    def __init__(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            data of the project, as saved in the cache or set in the NewJob window
+        """
+
+        self.id = data.get("id") or new_id()
+        self.name = data["name"]
+        self.type = "project"
+        self.priority = data["priority"]
+        self.deadline = data["deadline"]  # in seconds
+        self.creation = data.get("creation", time.time())
+        self.done = False
+
+        self.rank = 0
+        self.value = 0
+
+        self.current_minitasks = MiniTaskOrder(minitask_from_data(data=minitask_data)
+                                               for minitask_data in data["current_minitasks"])
+        self.completed_minitasks = data["completed_minitasks"]
+
+        # completed minitasks in the order
+        self.finished = sum(minitask.state == "completed" for minitask in self.current_minitasks)
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the project, in the format of the cache
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "rank": self.rank,
+            "priority": self.priority,
+            "deadline": self.deadline,
+            "next_window": "schedule_window",
+            "creation": self.creation,
+            "done": self.done,
+            "current_minitasks": [minitask.data for minitask in self.current_minitasks],
+            "completed_minitasks": self.completed_minitasks,
+        }
+
+    def set_score(self, value: float):
+
+        self.value = value
+
+    def update_priority(self, priority: int):
+
+        self.priority = priority
+
+    def set_rank(self, rank: int):
+
+        self.rank = rank
+
+    @property
+    def progress(self):
+
+        """
+        Returns
+        -------
+        tuple : the number of completed minitasks and of minitasks
+        """
+
+        return self.finished, len(self.current_minitasks)
+
+    def update_project_data(self, updated_data: dict):
+
+        """
+        update the project from the project window, with the changed minitasks only
+
+        Parameters
+        ----------
+        updated_data : dict
+            changes, completed_minitasks, rank and done
+
+        Returns
+        -------
+        list : position of the minitask of each change
+        """
+
+        positions = [self.apply_change(change=change) for change in updated_data["changes"]]
+
+        self.completed_minitasks = updated_data["completed_minitasks"]
+        self.rank = updated_data["rank"]
+        self.done = self.finished == len(self.current_minitasks) and len(self.current_minitasks) > 0
+
+        return positions
+
+    def apply_change(self, change: dict):
+
+        """
+        Parameters
+        ----------
+        change : dict
+            change of a minitask, one of:
+            {"op": "put", "rank": position, "minitask": data} a new minitask
+            {"op": "update", "minitask": data} a minitask updated in place
+            {"op": "delete", "id": id} a removed minitask
+
+        Returns
+        -------
+        int : position of the minitask, before its removal for a delete
+        """
+
+        if change["op"] == "put":
+            minitask = minitask_from_data(data=change["minitask"])
+            self.current_minitasks.insert(change["rank"], minitask)
+            self.finished += minitask.state == "completed"
+
+            return self.current_minitasks.index(minitask)
+
+        elif change["op"] == "update":
+            record = minitask_from_data(data=change["minitask"])
+            minitask = self.current_minitasks.get(record.id)
+            self.current_minitasks.replace(minitask, record)
+            self.finished += (record.state == "completed") - (minitask.state == "completed")
+
+            return self.current_minitasks.index(record)
+
+        elif change["op"] == "delete":
+            minitask = self.current_minitasks.get(change["id"])
+            self.finished -= minitask.state == "completed"
+
+            return self.current_minitasks.remove(minitask)
+
+        raise ValueError(f'unknown change <{change["op"]}> of a minitask')
+
+    def finish(self, priority: int):
+
+        """
+        Parameters
+        ----------
+        priority : int
+            priority of the finished record in the ranking
+
+        Returns
+        -------
+        FinishedJob : the record of the completed project
+        """
+
+        record = self.data
+        record["type"] = f"finished {self.type}"
+        record["done"] = True
+
+        return FinishedJob(record=record, priority=priority)
+
+    def view_data(self):
+
+        """
+        Returns
+        -------
+        dict : the properties of the row displaying the project
+        """
+
+        return {
+            "job_id": self.id,
+            "rank": self.rank,
+            "job_name": self.name,
+            "score": str(self.value),
+            "status": "pending",
+            "kind": self.type,
+        }
+
+
+class FinishedJob:
+
+    """
+    record of a completed task or project, ranked below the pending jobs
+    """
+
+    __slots__ = ("id", "name", "type", "rank", "priority", "factual_priority", "value",
+                 "deadline", "creation", "duration", "tot_focus", "tot_rest", "tot_idle",
+                 "current_minitasks", "completed_minitasks")
+
+    def __init__(self, record: dict, priority: int):
+
+        """
+        Parameters
+        ----------
+        record : dict
+            record of the job, with type "finished task" or "finished project"
+        priority : int
+            priority of the record in the ranking
+        """
+
+        self.id = record.get("id") or new_id()
+        self.name = record["name"]
+        self.type = record["type"]
+        self.rank = record["rank"]
+        self.priority = priority
+        self.factual_priority = record["priority"]
+        self.value = 0
+        self.deadline = record["deadline"]
+        self.creation = record["creation"]
+
+        # finished task
+        self.duration = record.get("duration", 0)
+        self.tot_focus = record.get("tot_focus", 0)
+        self.tot_rest = record.get("tot_rest", 0)
+        self.tot_idle = record.get("tot_idle", 0)
+
+        # finished project
+        self.current_minitasks = record.get("current_minitasks", [])
+        self.completed_minitasks = record.get("completed_minitasks", 0)
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the record of the job
+        """
+
+        record = {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "rank": self.rank,
+            "priority": self.factual_priority,
+            "deadline": self.deadline,
+            "creation": self.creation,
+            "next_window": "schedule_window",
+            "done": True,
+        }
+
+        if self.type == "finished task":
+            record["duration"] = self.duration
+            record["tot_focus"] = self.tot_focus
+            record["tot_rest"] = self.tot_rest
+            record["tot_idle"] = self.tot_idle
+
+        else:
+            record["current_minitasks"] = self.current_minitasks
+            record["completed_minitasks"] = self.completed_minitasks
+
+        return record
+
+    def set_score(self, value: float):
+
+        self.value = value
+
+    def update_priority(self, priority: int):
+
+        self.priority = priority
+
+    def set_rank(self, rank: int):
+
+        self.rank = rank
+
+    def view_data(self):
+
+        """
+        Returns
+        -------
+        dict : the properties of the row displaying the record
+        """
+
+        return {
+            "job_id": self.id,
+            "rank": self.rank,
+            "job_name": self.name,
+            "score": str(self.factual_priority),
+            "status": "completed",
+            "kind": self.type,
+        }
+
+
+def job_from_data(data: dict):
+
+    """
+    Parameters
+    ----------
+    data : dict
+        data of a task or a project
+
+    Returns
+    -------
+    Task or Project : the record of the job
+    """
+
+    if data["type"] == "task":
+        return Task(data=data)
+
+    elif data["type"] == "project":
+        return Project(data=data)
+
+    raise TypeError(f'type "{data["type"]}" not recognized')
+
+
+class JobQueue:
+
+    """
+    indexed binary heap of the jobs, the ranking of the schedule: insert, removal
+    and change of priority of a job take O(log n), ties keep the order of insertion
+    """
+
+    __slots__ = ("key", "heap", "index", "counter")
+
+    def __init__(self, key):
+
+        """
+        Parameters
+        ----------
+        key : callable
+            key of a job, the smallest key is ranked first
+        """
+
+        self.key = key
+
+        # entries [key, insertion number, job], and position in the heap by job id
+        self.heap = []
+        self.index = {}
+        self.counter = 0
+
+    def __len__(self):
+
+        return len(self.heap)
+
+    def __contains__(self, job):
+
+        return job.id in self.index
+
+    def get(self, job_id: str):
+
+        """
+        Parameters
+        ----------
+        job_id : str
+            id of a job
+
+        Returns
+        -------
+        Task, Project, FinishedJob or None : the job with the given id, in O(1)
+        """
+
+        pos = self.index.get(job_id)
+        if pos is None:
+            return None
+
+        return self.heap[pos][2]
+
+    def __iter__(self):
+
+        """ jobs in heap order, not ranked """
+
+        return (entry[2] for entry in self.heap)
+
+    def _move(self, entry, pos: int):
+
+        self.heap[pos] = entry
+        self.index[entry[2].id] = pos
+
+    def _sift_up(self, pos: int):
+
+        entry = self.heap[pos]
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if not entry < self.heap[parent]:
+                break
+            self._move(self.heap[parent], pos)
+            pos = parent
+
+        self._move(entry, pos)
+
+    def _sift_down(self, pos: int):
+
+        entry = self.heap[pos]
+        size = len(self.heap)
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.heap[child + 1] < self.heap[child]:
+                child += 1
+            if not self.heap[child] < entry:
+                break
+            self._move(self.heap[child], pos)
+            pos = child
+
+        self._move(entry, pos)
+
+    def push(self, job):
+
+        """
+        Parameters
+        ----------
+        job : Task, Project or FinishedJob
+            job to rank
+        """
+
+        self.heap.append([self.key(job), self.counter, job])
+        self.counter += 1
+        self._sift_up(len(self.heap) - 1)
+
+    def remove(self, job):
+
+        """
+        Parameters
+        ----------
+        job : Task, Project or FinishedJob
+            ranked job to remove
+        """
+
+        pos = self.index.pop(job.id)
+        last = self.heap.pop()
+
+        # the last entry takes the free place
+        if pos < len(self.heap):
+            self._move(last, pos)
+            self._sift_up(pos)
+            self._sift_down(self.index[last[2].id])
+
+    def update(self, job):
+
+        """
+        rank again a job whose key changed, keeping its insertion number
+
+        Parameters
+        ----------
+        job : Task, Project or FinishedJob
+            ranked job
+        """
+
+        pos = self.index[job.id]
+        self.heap[pos][0] = self.key(job)
+        self._sift_up(pos)
+        self._sift_down(self.index[job.id])
+
+    def rebuild(self):
+
+        """ compute again the key of every job, in O(n) """
+
+        for entry in self.heap:
+            entry[0] = self.key(entry[2])
+
+        heapq.heapify(self.heap)
+        self.index = {entry[2].id: pos for pos, entry in enumerate(self.heap)}
+
+    def ranked(self, limit=None):
+
+        """
+        Parameters
+        ----------
+        limit : int, optional
+            number of jobs to rank, by default all of them
+
+        Returns
+        -------
+        list : the first jobs, in O(limit * log(limit))
+        """
+
+        if limit is None:
+            limit = len(self.heap)
+
+        jobs = []
+        frontier = [(self.heap[0], 0)] if self.heap else []
+        while frontier and len(jobs) < limit:
+
+            entry, pos = heapq.heappop(frontier)
+            jobs += [entry[2]]
+
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child], child))
+
+        return jobs
+
+
+""" MINITASKS """
+
+
+class MiniTask:
+
+    """
+    step of a project, with the totals of its focus sessions
+    """
+
+    __slots__ = ("id", "name", "type", "rank", "duration", "creation", "done", "state",
+                 "tot_focus", "tot_rest", "tot_idle")
+
+    def __init__(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            data of the minitask
+        """
+
+        self.id = data.get("id") or new_id()
+        self.name = data["name"]
+        self.type = data["type"]
+        self.rank = data.get("rank", 0)  # position in view, not saved
+        self.duration = data["duration"]
+        self.creation = data.get("creation", time.time())
+        self.done = False
+        self.state = "pending"
+
+        # record from the focused sessions
+        self.tot_focus = data.get("tot_focus", 0)
+        self.tot_rest = data.get("tot_rest", 0)
+        self.tot_idle = data.get("tot_idle", 0)
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the minitask, in the format of the cache
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "next_window": "project_window",
+            "creation": self.creation,
+            "done": self.done,
+            "duration": self.duration,
+            "tot_focus": self.tot_focus,
+            "tot_rest": self.tot_rest,
+            "tot_idle": self.tot_idle,
+        }
+
+    def update_focus(self, focus_package: dict):
+
+        """
+        update the totals after a focus session
+
+        Parameters
+        ----------
+        focus_package : dict
+            results of the session, with tot_focus, tot_rest, tot_idle and done
+        """
+
+        self.tot_focus = focus_package["tot_focus"]
+        self.tot_rest = focus_package["tot_rest"]
+        self.tot_idle = focus_package["tot_idle"]
+        self.done = focus_package["done"]
+
+    def provide_focus_data(self, focus: int, rest: int):
+
+        """
+        compute the intervals as focus-rest-focus-rest... from the total task duration
+
+        Parameters
+        ----------
+        focus : int
+            length of a focus interval, in minutes
+        rest : int
+            length of a rest interval, in minutes
+
+        Returns
+        -------
+        dict : intervals, type, rank, next_window
+        """
+
+        return {
+            "intervals": interval_plan(duration=self.duration, focus=focus, rest=rest),
+            "id": self.id,
+            "type": self.type,
+            "rank": self.rank,
+            "next_window": "project_window",
+        }
+
+    def finish(self):
+
+        """
+        Returns
+        -------
+        FinishedMiniTask : the record of the completed minitask
+        """
+
+        record = self.data
+        record["type"] = f"finished {self.type}"
+        record["done"] = True
+
+        return FinishedMiniTask(data=record)
+
+
+class FinishedMiniTask:
+
+    """
+    record of a completed minitask
+    """
+
+    __slots__ = ("id", "name", "type", "rank", "duration", "creation", "state",
+                 "tot_focus", "tot_rest", "tot_idle")
+
+    def __init__(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            record of the minitask
+        """
+
+        self.id = data.get("id") or new_id()
+        self.name = data["name"]
+        self.type = data["type"]
+        self.rank = data.get("rank", 0)  # position in view, not saved
+        self.duration = data["duration"]
+        self.creation = data["creation"]
+        self.state = "completed"
+
+        self.tot_focus = data["tot_focus"]
+        self.tot_rest = data["tot_rest"]
+        self.tot_idle = data["tot_idle"]
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the record of the minitask
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "next_window": "project_window",
+            "duration": self.duration,
+            "creation": self.creation,
+            "tot_focus": self.tot_focus,
+            "tot_rest": self.tot_rest,
+            "tot_idle": self.tot_idle,
+            "done": True,
+        }
+
+
+class SubProject:
+
+    """
+    project nested in a project: its minitasks are stored apart from the
+    project and loaded when it is opened, the record only keeps their totals
+    """
+
+    __slots__ = ("id", "name", "type", "rank", "duration", "creation", "state",
+                 "finished", "total")
+
+    def __init__(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            data of the sub-project, with the totals of its minitasks
+        """
+
+        self.id = data.get("id") or new_id()
+        self.name = data["name"]
+        self.type = "subproject"
+        self.rank = data.get("rank", 0)  # position in view, not saved
+        self.creation = data.get("creation", time.time())
+
+        # totals of the minitasks of the whole subtree
+        self.duration = data.get("duration", 0)
+        self.finished = data.get("finished", 0)
+        self.total = data.get("total", 0)
+
+        self.state = "pending"
+        self._set_state()
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the record of the sub-project, without its minitasks
+        """
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "next_window": "project_window",
+            "creation": self.creation,
+            "duration": self.duration,
+            "finished": self.finished,
+            "total": self.total,
+            "done": self.state == "completed",
+        }
+
+    @property
+    def progress(self):
+
+        """
+        Returns
+        -------
+        tuple : the number of completed minitasks and of minitasks of the subtree
+        """
+
+        return self.finished, self.total
+
+    def aggregate(self, minitasks):
+
+        """
+        update the totals from the minitasks of the sub-project, in O(len(minitasks))
+
+        Parameters
+        ----------
+        minitasks : iterable
+            the minitasks and sub-projects right below it
+        """
+
+        self.duration, self.finished, self.total = aggregate(minitasks=minitasks)
+        self._set_state()
+
+    def _set_state(self):
+
+        # completed once every minitask of the subtree is
+        self.state = "completed" if self.total > 0 and self.finished == self.total else "pending"
+
+
+def aggregate(minitasks):
+
+    """
+    Parameters
+    ----------
+    minitasks : iterable
+        minitasks and sub-projects, the sub-projects count with their totals
+
+    Returns
+    -------
+    tuple : the duration, the number of completed minitasks and of minitasks
+    """
+
+    duration, finished, total = 0, 0, 0
+    for minitask in minitasks:
+
+        duration += minitask.duration
+
+        if minitask.type == "subproject":
+            finished += minitask.finished
+            total += minitask.total
+
+        else:
+            finished += minitask.state == "completed"
+            total += 1
+
+    return duration, finished, total
+
+
+def minitask_from_data(data: dict):
+
+    """
+    Parameters
+    ----------
+    data : dict
+        data of a minitask, of a finished minitask or of a sub-project
+
+    Returns
+    -------
+    MiniTask, FinishedMiniTask or SubProject : the record of the minitask
+    """
+
+    if data["type"] == "minitask":
+        return MiniTask(data=data)
+
+    elif data["type"] == "finished minitask":
+        return FinishedMiniTask(data=data)
+
+    elif data["type"] == "subproject":
+        return SubProject(data=data)
+
+    raise TypeError(f'type <{data["type"]}> invalid')
+
+
+class _OrderNode:
+
+    __slots__ = ("item", "weight", "size", "left", "right", "parent")
+
+    def __init__(self, item):
+
+        self.item = item
+        self.weight = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+def _size(node):
+
+    return node.size if node is not None else 0
+
+
+def _pull(node):
+
+    # size of the subtree, and parent of its children
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+    if node.left is not None:
+        node.left.parent = node
+    if node.right is not None:
+        node.right.parent = node
+
+
+def _split(node, count: int):
+
+    # the first `count` items, and the rest
+    if node is None:
+        return None, None
+
+    if _size(node.left) >= count:
+        left, node.left = _split(node.left, count)
+        _pull(node)
+        return left, node
+
+    node.right, right = _split(node.right, count - _size(node.left) - 1)
+    _pull(node)
+    return node, right
+
+
+def _merge(left, right):
+
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.weight > right.weight:
+        left.right = _merge(left.right, right)
+        _pull(left)
+        return left
+
+    right.left = _merge(left, right.left)
+    _pull(right)
+    return right
+
+
+class MiniTaskOrder:
+
+    """
+    order of the minitasks of a project, an implicit treap: insert, removal and
+    position of a minitask take O(log n), without renumbering the others
+    """
+
+    __slots__ = ("root", "nodes")
+
+    def __init__(self, minitasks=()):
+
+        """
+        Parameters
+        ----------
+        minitasks : iterable, optional
+            minitasks in order, by default none
+        """
+
+        self.root = None
+
+        # node of each minitask, by id
+        self.nodes = {}
+
+        for minitask in minitasks:
+            self.append(minitask)
+
+    def __len__(self):
+
+        return _size(self.root)
+
+    def __contains__(self, minitask):
+
+        return minitask.id in self.nodes
+
+    def __iter__(self):
+
+        """ minitasks in order """
+
+        stack = []
+        node = self.root
+        while stack or node is not None:
+
+            while node is not None:
+                stack += [node]
+                node = node.left
+
+            node = stack.pop()
+            yield node.item
+            node = node.right
+
+    def __getitem__(self, pos: int):
+
+        """ minitask at a position, in O(log n) """
+
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError(f"no minitask at position {pos}")
+
+        node = self.root
+        while True:
+
+            left = _size(node.left)
+            if pos == left:
+                return node.item
+
+            if pos < left:
+                node = node.left
+            else:
+                pos -= left + 1
+                node = node.right
+
+    def get(self, minitask_id: str):
+
+        """
+        Returns
+        -------
+        MiniTask or FinishedMiniTask : the minitask with the given id, in O(1)
+        """
+
+        return self.nodes[minitask_id].item
+
+    def index(self, minitask):
+
+        """
+        Returns
+        -------
+        int : the position of the minitask, in O(log n)
+        """
+
+        node = self.nodes[minitask.id]
+
+        pos = _size(node.left)
+        while node.parent is not None:
+
+            if node is node.parent.right:
+                pos += _size(node.parent.left) + 1
+            node = node.parent
+
+        return pos
+
+    def insert(self, pos: int, minitask):
+
+        """
+        place a minitask at a position, the next ones move down; the position is
+        clamped as for a list
+        """
+
+        if minitask.id in self.nodes:
+            raise ValueError(f'minitask "{minitask.name}" already placed')
+
+        if pos < 0:
+            pos = max(0, pos + len(self))
+
+        node = _OrderNode(item=minitask)
+        self.nodes[minitask.id] = node
+
+        left, right = _split(self.root, pos)
+        self._set_root(_merge(_merge(left, node), right))
+
+    def append(self, minitask):
+
+        self.insert(len(self), minitask)
+
+    def remove(self, minitask):
+
+        """
+        Returns
+        -------
+        int : the position the minitask had
+        """
+
+        pos = self.index(minitask)
+        del self.nodes[minitask.id]
+
+        left, right = _split(self.root, pos)
+        _, right = _split(right, 1)
+        self._set_root(_merge(left, right))
+
+        return pos
+
+    def replace(self, minitask, record):
+
+        """ put a record with the same id, e.g. the finished minitask, at the place of a minitask """
+
+        node = self.nodes[minitask.id]
+        node.item = record
+
+    def head(self, count: int):
+
+        """
+        Returns
+        -------
+        list : the first minitasks, in O(count + log n)
+        """
+
+        minitasks = []
+        for minitask in self:
+
+            if len(minitasks) >= count:
+                break
+
+            minitasks += [minitask]
+
+        return minitasks
+
+    def _set_root(self, node):
+
+        self.root = node
+        if node is not None:
+            node.parent = None
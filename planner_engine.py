@@ -0,0 +1,1185 @@
+import log_module
+import planner_core
+
+
+""" ENGINE
+
+logic of the planner without its windows: the ranking and the mutations of the
+jobs, the minitasks of a project and the intervals of a session. The widgets of
+planner_lib display and drive these objects, and planner_cli uses them on the
+same cache without a display
+"""
+
+# default session settings, in minutes
+SETTINGS = {"FOCUSED_TIME": 30, "REST_TIME": 5}
+
+# journal record of each change of a minitask, see ProjectEngine.delta
+MINITASK_RECORDS = {"put": "insert_minitask", "update": "put_minitask", "delete": "delete_minitask"}
+
+
+""" JOBS """
+
+
+def dormant_key(data: dict):
+
+    """
+    key of a saved job waiting to be ranked: the highest priority, then the
+    oldest, is ranked first as in JobsEngine.rank_key
+
+    Parameters
+    ----------
+    data : dict
+        data of a saved job
+
+    Returns
+    -------
+    tuple : the key
+    """
+
+    return -int(data["priority"]), data.get("creation") or 0
+
+
+class JobsEngine:
+
+    """
+    pending and finished jobs, their ranking and their journal in the cache
+    """
+
+    def __init__(self, cache, rank_deadline=False, on_change=None):
+
+        """
+        Parameters
+        ----------
+        cache : cache_module.CacheInterface
+            storage of the pending jobs
+        rank_deadline : bool, optional
+            if True the latest deadline ranks first among equal scores, by default False
+        on_change : callable, optional
+            called without arguments after each change of the jobs
+        """
+
+        self.cache = cache
+        self.rank_deadline = rank_deadline
+        self.on_change = on_change
+
+        # ranking of the jobs
+        self.queue = planner_core.JobQueue(key=self.rank_key)
+
+        # loaded jobs not ranked yet, from the lowest priority
+        self.dormant_jobs = []
+
+        # ids of the dormant jobs known from the cache index only, their data
+        # is read when they are ranked
+        self.unread = set()
+
+        self.completed_jobs = 0
+
+        # session settings, saved with the pending jobs
+        self.settings = dict(SETTINGS)
+
+        # logging
+        self.logger = log_module.get_logger("JobsEngine")
+
+    def __len__(self):
+
+        return len(self.queue) + len(self.dormant_jobs)
+
+    def changed(self):
+
+        if self.on_change is not None:
+            self.on_change()
+
+    """ ranking """
+
+    def rank_key(self, job):
+
+        """
+        key of a job in the ranking, the highest score first. Ties go to the
+        oldest job: the creation time is saved, the order holds across reloads
+
+        Parameters
+        ----------
+        job : planner_core.Task, Project or FinishedJob
+
+        Returns
+        -------
+        tuple : the key
+        """
+
+        # the latest deadline first, considered only if enabled [IS_DEADLINE]
+        if self.rank_deadline:
+            return (-job.value, -job.deadline, job.creation)
+
+        return (-job.value, 0, job.creation)
+
+    def score_job(self, job):
+
+        """
+        update of the score of a job, before it is ranked
+
+        CURRENTLY : no actual update, the job keeps its priority as it was initially set
+
+        Parameters
+        ----------
+        job : planner_core.Task, Project or FinishedJob
+
+        Returns
+        -------
+        None
+        """
+
+        # finished jobs keep their score
+        if job.type == "finished task" or job.type == "finished project":
+            return
+
+        # relative priority
+        new_priority = job.priority
+
+        # update priority
+        job.update_priority(priority=new_priority)
+
+        # score
+        #value = (RANK_WEIGHTS[0] * new_priority + RANK_WEIGHTS[1] * relative_deadline) / (RANK_WEIGHTS[0] + RANK_WEIGHTS[1])
+        job.set_score(value=round(new_priority))
+
+    def compute_scores(self):
+
+        """
+        update of the scores of each available job, and of the whole ranking
+
+        Returns
+        -------
+        None
+        """
+
+        for job in self.queue:
+            self.score_job(job=job)
+
+        self.queue.rebuild()
+
+    def ranked(self, limit=None):
+
+        """
+        Parameters
+        ----------
+        limit : int, optional
+            number of jobs, by default all the ranked ones
+
+        Returns
+        -------
+        list : the ranked jobs, the highest score first
+        """
+
+        return self.queue.ranked(limit=limit)
+
+    def page(self, rows: int):
+
+        """
+        the jobs of the first rows of the schedule, with their rank set
+
+        Parameters
+        ----------
+        rows : int
+            number of rows in view
+
+        Returns
+        -------
+        list : the jobs of the rows, the highest score first
+        """
+
+        # fill the rows from the dormant jobs
+        self.hydrate(rows=rows)
+
+        jobs = self.queue.ranked(limit=rows)
+        for i, job in enumerate(jobs):
+            job.set_rank(rank=i)
+
+        return jobs
+
+    def hydrate(self, rows=None):
+
+        """
+        rank the dormant jobs that reach the given rows
+
+        Parameters
+        ----------
+        rows : int, optional
+            number of rows to fill, by default all the dormant jobs are ranked
+
+        Returns
+        -------
+        int : number of jobs ranked
+        """
+
+        if rows is None:
+            rows = len(self)
+
+        # last job of the loaded rows, once they are all filled
+        ranked = self.queue.ranked(limit=rows)
+        lowest = ranked[-1] if ranked and len(ranked) >= rows else None
+
+        # the data of the dormant jobs filling the free rows, in one read
+        self._read(entries=self.dormant_jobs[-max(rows - len(ranked), 1):])
+
+        hydrated = 0
+        while self.dormant_jobs:
+
+            # a free row of the loaded pages, or a dormant job that outranks a ranked one
+            top = dormant_key(self.dormant_jobs[-1])
+            if lowest is not None and top >= (-lowest.value, lowest.creation):
+                break
+
+            self._rank(data=self.dormant_jobs.pop())
+            hydrated += 1
+
+            if lowest is None and len(self.queue) >= rows:
+                lowest = self.queue.ranked(limit=rows)[-1]
+
+        if hydrated:
+            self.logger.debug(f"hydrated {hydrated} jobs, {len(self.dormant_jobs)} dormant")
+
+        return hydrated
+
+    def _read(self, entries: list):
+
+        """
+        read the data of dormant jobs known from the cache index only
+
+        Parameters
+        ----------
+        entries : list
+            dormant jobs, completed in place with their data
+        """
+
+        unread = [entry for entry in entries if entry.get("id") in self.unread]
+        if not unread:
+            return
+
+        jobs = self.cache.get_jobs(job_ids=[entry["id"] for entry in unread])
+        for entry in unread:
+            entry.update(jobs[entry["id"]])
+            self.unread.discard(entry["id"])
+
+        self.logger.debug(f"read {len(unread)} jobs, {len(self.unread)} left in the index")
+
+    def _rank(self, data: dict):
+
+        self._read(entries=[data])
+
+        job = planner_core.job_from_data(data=data)
+        self.score_job(job=job)
+        self.queue.push(job)
+
+        return job
+
+    """ lookup """
+
+    def get(self, job_id: str):
+
+        """
+        Returns
+        -------
+        planner_core.Task, Project or FinishedJob : the ranked job, None if absent
+        """
+
+        return self.queue.get(job_id)
+
+    def find(self, ref: str):
+
+        """
+        job by id or by name, a dormant job found is ranked
+
+        Parameters
+        ----------
+        ref : str
+            id or name of the job
+
+        Returns
+        -------
+        planner_core.Task, Project or FinishedJob : the job, None if absent
+        """
+
+        job = self.queue.get(ref)
+        if job is not None:
+            return job
+
+        for job in self.queue:
+            if job.name == ref:
+                return job
+
+        for i, data in enumerate(self.dormant_jobs):
+            if data.get("id") == ref or data["name"] == ref:
+                return self._rank(data=self.dormant_jobs.pop(i))
+
+        return None
+
+    """ mutations """
+
+    def add_job(self, data: dict, journal=True):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            data of the new job, as set in the NewJob window
+        journal : bool, optional
+            if True the job is appended to the cache journal, by default True:
+            bulk additions are rather saved at once by save_pending
+
+        Returns
+        -------
+        planner_core.Task or Project : the new job
+        """
+
+        job = self._rank(data=data)
+
+        if journal:
+            self.cache.append_record(op="put", obj=job.data)
+
+        self.logger.info(f"+new {job.type} added")
+        self.changed()
+
+        return job
+
+    def take_job(self, job_id: str):
+
+        """
+        remove a job to edit it, the edited copy is added back as a new job
+
+        Returns
+        -------
+        planner_core.Task or Project : the removed job
+        """
+
+        job = self.queue.get(job_id)
+
+        self.queue.remove(job)
+        self.cache.append_record(op="delete", job_id=job.id)
+        self.changed()
+
+        return job
+
+    def delete_job(self, job_id: str):
+
+        """
+        Parameters
+        ----------
+        job_id : str
+            id of the job to delete
+
+        Returns
+        -------
+        None
+        """
+
+        job = self.queue.get(job_id)
+
+        # finished jobs are not in the cache
+        if job.type in ("task", "project"):
+            self.cache.append_record(op="delete", job_id=job.id)
+
+        # the minitasks of the sub-projects are stored apart
+        if job.type in ("project", "finished project"):
+            for minitask in job.data["current_minitasks"]:
+                if minitask["type"] == "subproject":
+                    self.cache.delete_node(node_id=minitask["id"])
+
+        self.queue.remove(job)
+        self.changed()
+
+    def complete_job(self, job_id: str):
+
+        """
+        definition of a "completed job" and substitution of the old job
+
+        Parameters
+        ----------
+        job_id : str
+            id of the job to complete
+
+        Returns
+        -------
+        planner_core.FinishedJob : the record of the completed job
+        """
+
+        self.completed_jobs += 1
+
+        # get completed job
+        job = self.queue.get(job_id)
+
+        self.logger.info(f"turning a <{job.type}> into a <finished {job.type}>")
+
+        if job.type != "task" and job.type != "project":
+            raise TypeError(f'type "{job.type}" not recognized')
+
+        # create new finished job, with the records about the task timers
+        finished_job = job.finish(priority=-1 * (self.completed_jobs + 1))
+
+        # substitute the old instance
+        self.queue.remove(job)
+        self.queue.push(finished_job)
+
+        # finished jobs are not kept as pending
+        self.cache.append_record(op="finish", obj=finished_job.data)
+
+        self.changed()
+
+        return finished_job
+
+    def reprioritize(self, job_id: str, priority: int):
+
+        """
+        Parameters
+        ----------
+        job_id : str
+            id of a pending job
+        priority : int
+            new priority of the job
+
+        Returns
+        -------
+        planner_core.Task or Project : the job, at its new rank
+        """
+
+        job = self.queue.get(job_id)
+
+        if job.type != "task" and job.type != "project":
+            raise TypeError(f"a <{job.type}> has no priority to change")
+
+        job.update_priority(priority=priority)
+        self.score_job(job=job)
+        self.queue.update(job)
+
+        self.cache.append_record(op="put", obj=job.data)
+        self.changed()
+
+        return job
+
+    def unfinish_project(self, job_id: str, updated_data: dict):
+
+        """
+        make a finished project an ongoing project again
+
+        Parameters
+        ----------
+        job_id : str
+            id of the project to unfinish
+        updated_data : dict
+            data to update
+
+        Returns
+        -------
+        planner_core.Project : the ongoing project
+        """
+
+        self.logger.info(f"unfinishing project, {job_id=}")
+
+        # get job
+        job = self.queue.get(job_id)
+
+        # new project, same id, with the minitasks of the record
+        project = planner_core.Project(
+            data={
+                "id": job.id,
+                "name": job.name,
+                "priority": job.factual_priority,
+                "deadline": job.deadline,
+                "creation": job.creation,
+                "type": "project",
+                "current_minitasks": job.current_minitasks,
+                "completed_minitasks": job.completed_minitasks,
+            },
+        )
+
+        # update project data
+        project.update_project_data(updated_data=updated_data)
+        project.set_rank(rank=job.rank)
+
+        # update
+        self.score_job(job=project)
+        self.queue.remove(job)
+        self.queue.push(project)
+
+        self.cache.append_record(op="put", obj=project.data)
+        self.changed()
+
+        return project
+
+    def update_focus_task(self, focus_package: dict):
+
+        """
+        update a task after a focus session
+
+        Parameters
+        ----------
+        focus_package : dict
+            results of the session
+
+        Returns
+        -------
+        None
+        """
+
+        job = self.queue.get(focus_package["id"])
+
+        # job deleted during the session
+        if job is None:
+            self.logger.warning(f"no job with id {focus_package['id']}, session dropped")
+            return
+
+        # dont process a finished task
+        if job.type == "finished task":
+            return
+
+        # wrong job
+        if job.type != "task":
+            raise TypeError(
+                f"trying to update a <{job.type}> with task data, wrong id"
+            )
+
+        # right job
+        job.update_focus(focus_package=focus_package)
+
+        # check if the task was completed
+        if focus_package["done"]:
+            self.complete_job(job_id=job.id)
+            return
+
+        self.cache.append_record(op="put", obj=job.data)
+        self.changed()
+
+    def update_project(self, updated_data: dict):
+
+        """
+        update a project from the project window
+
+        Parameters
+        ----------
+        updated_data : dict
+            changes of the project, as returned by ProjectEngine.delta
+
+        Returns
+        -------
+        None
+        """
+
+        job = self.queue.get(updated_data["id"])
+
+        # dont process a finished project
+        if job.type == "finished project" and updated_data["done"]:
+            return
+
+        # unfinish a project
+        elif job.type == "finished project" and not updated_data["done"]:
+            self.unfinish_project(job_id=job.id, updated_data=updated_data)
+            return
+
+        # wrong job
+        elif job.type != "project":
+            raise TypeError(
+                f'trying to update a <{job.type}> with project data, wrong id [{job.id}] | update: {updated_data["done"]}'
+            )
+
+        # right job
+        positions = job.update_project_data(updated_data=updated_data)
+
+        # check if the project was completed:
+        if updated_data["done"]:
+            self.complete_job(job_id=job.id)
+            return
+
+        # a record per changed minitask, not the whole project
+        for change, position in zip(updated_data["changes"], positions):
+            self.cache.append_record(
+                op=MINITASK_RECORDS[change["op"]],
+                job_id=job.id,
+                rank=position,
+                minitask=change.get("minitask"),
+                completed_minitasks=job.completed_minitasks,
+            )
+
+        self.changed()
+
+    """ storage """
+
+    def load_pending(self):
+
+        """
+        load the pending jobs and the settings from the cache, the jobs are
+        ranked later by hydrate. With an indexed cache only the index of the
+        jobs is loaded, their data is read as they are ranked
+
+        Returns
+        -------
+        bool : True if there were saved jobs
+        """
+
+        # retrieve, from the index of the jobs if the cache has one
+        is_available, saved_objects = self.cache.retrieve_index()
+
+        if not is_available:
+            self.logger.debug("no saved pending tasks")
+            return False
+
+        # settings
+        if "settings" in saved_objects:
+            self.settings = {key: saved_objects["settings"][key] for key in SETTINGS}
+
+        # index of the jobs, from the last one ranked: the sort is stable, the
+        # jobs saved in ranked order keep it on a tie
+        self.dormant_jobs = sorted(
+            [obj for key, obj in saved_objects.items() if key != "settings"],
+            key=dormant_key,
+        )[::-1]
+
+        if self.cache.indexed:
+            self.unread = {data["id"] for data in self.dormant_jobs}
+
+        self.logger.info(f"loaded {len(self.dormant_jobs)} pending jobs")
+
+        # jobs saved before the ids, the cache is keyed by id from now on
+        unkeyed = [data for data in self.dormant_jobs if not data.get("id")]
+        for data in unkeyed:
+            data["id"] = planner_core.new_id()
+
+        if unkeyed:
+            self.save_pending()
+            self.logger.info(f"{len(unkeyed)} jobs saved with an id")
+
+        self.changed()
+
+        return True
+
+    def save_pending(self):
+
+        """
+        save the pending jobs and the settings in the cache
+
+        Returns
+        -------
+        None
+        """
+
+        # in ranked order, the order of the ties on the next load
+        ongoing = []
+        for job in self.queue.ranked():
+
+            # ignore finished tasks
+            if job.type != "task" and job.type != "project":
+                continue
+
+            ongoing += [job.data]
+
+        # jobs not ranked yet
+        self._read(entries=self.dormant_jobs)
+        ongoing += self.dormant_jobs[::-1]
+
+        self.cache.save_pending_objects(objects=ongoing, settings=dict(self.settings))
+
+        self.logger.debug(f"saved {len(ongoing)} jobs, settings: {self.settings}")
+
+
+""" PROJECTS """
+
+
+class ProjectEngine:
+
+    """
+    minitasks of the project open in the project window, or of the sub-project
+    open in it
+    """
+
+    def __init__(self, cache=None):
+
+        """
+        Parameters
+        ----------
+        cache : cache_module.CacheInterface, optional
+            storage of the minitasks of the sub-projects, by default None: the
+            sub-projects can not be opened
+        """
+
+        self.cache = cache
+
+        self.name = ""
+        self.project_id = ""
+
+        # minitasks in order, and by id
+        self.current_minitasks = planner_core.MiniTaskOrder()
+        self.minitasks = {}
+
+        # completed minitasks in the order, the completion of the project
+        self.finished = 0
+
+        # changes of the minitasks since the load, sent back to the schedule
+        self.changes = []
+
+        # open sub-projects from the top, with the minitasks of their parent
+        self.path = []
+
+        self.completed_minitasks = 0
+        self.project_rank = 0
+        self.done = False
+
+        # logging
+        self.logger = log_module.get_logger("ProjectEngine")
+
+    def load(self, project_data: dict):
+
+        """
+        Parameters
+        ----------
+        project_data : dict
+            the project data, as a dict
+
+        Returns
+        -------
+        None
+        """
+
+        self.name = project_data["name"]
+        self.project_id = project_data["id"]
+        self.completed_minitasks = project_data["completed_minitasks"]
+        self.project_rank = project_data["rank"]
+        self.done = project_data["done"]
+        self.path = []
+
+        self._set_level(minitasks=project_data["current_minitasks"])
+
+    @property
+    def data(self):
+
+        """
+        Returns
+        -------
+        dict : the project data, with every minitask
+        """
+
+        return {
+            "id": self.project_id,
+            "current_minitasks": [minitask.data for minitask in self.current_minitasks],
+            "completed_minitasks": self.completed_minitasks,
+            "rank": self.project_rank,
+            "done": self.done,
+        }
+
+    @property
+    def progress(self):
+
+        """
+        Returns
+        -------
+        tuple : the number of completed minitasks and of minitasks
+        """
+
+        return self.finished, len(self.current_minitasks)
+
+    @property
+    def totals(self):
+
+        """
+        Returns
+        -------
+        tuple : the duration, the number of completed minitasks and of minitasks
+            of the open level, the sub-projects counting with their totals
+        """
+
+        return planner_core.aggregate(minitasks=self.current_minitasks)
+
+    @property
+    def node(self):
+
+        """ open sub-project, None at the top of the project """
+
+        return self.path[-1][0] if self.path else None
+
+    def delta(self):
+
+        """
+        the changes since the load or the previous delta, only the changed
+        minitasks; the open sub-projects are closed first
+
+        Returns
+        -------
+        dict : the update of the project, as expected by JobsEngine.update_project
+        """
+
+        self.close_all()
+
+        delta = {
+            "id": self.project_id,
+            "changes": self.changes,
+            "completed_minitasks": self.completed_minitasks,
+            "rank": self.project_rank,
+            "done": self.done,
+        }
+
+        self.changes = []
+
+        return delta
+
+    def add_minitask(self, data: dict):
+
+        """
+        place a minitask at its rank and push down the ones after it
+
+        Parameters
+        ----------
+        data : dict
+            data of the minitask, of the finished minitask or of the sub-project
+
+        Returns
+        -------
+        planner_core.MiniTask, FinishedMiniTask or SubProject : the record of the minitask
+        """
+
+        # new minitask, finished minitask or sub-project
+        minitask = planner_core.minitask_from_data(data=data)
+        self.minitasks[minitask.id] = minitask
+
+        # the saved minitasks come in order, without a rank
+        self.current_minitasks.insert(data.get("rank", len(self.current_minitasks)), minitask)
+        minitask.rank = self.current_minitasks.index(minitask)
+
+        self.finished += minitask.state == "completed"
+        self.changes += [{"op": "put", "rank": minitask.rank, "minitask": minitask.data}]
+        self.arrange()
+
+        return minitask
+
+    def delete_minitask(self, minitask_id: str):
+
+        """
+        Returns
+        -------
+        planner_core.MiniTask or FinishedMiniTask : the removed minitask
+        """
+
+        minitask = self.minitasks.pop(minitask_id)
+
+        minitask.rank = self.current_minitasks.remove(minitask)
+
+        self.finished -= minitask.state == "completed"
+        self.changes += [{"op": "delete", "id": minitask.id}]
+        self.arrange()
+
+        # the stored minitasks of the subtree
+        if minitask.type == "subproject" and self.cache is not None:
+            self.cache.delete_node(node_id=minitask.id)
+
+        return minitask
+
+    def edit_minitask(self, minitask_id: str):
+
+        """
+        take a minitask out of the project to edit it
+
+        Returns
+        -------
+        dict : data of the minitask, with the rank it had in the project
+        """
+
+        minitask = self.delete_minitask(minitask_id=minitask_id)
+
+        # the saved data has no rank, the edit window shows and keeps it
+        return {**minitask.data, "rank": minitask.rank}
+
+    def complete_minitask(self, minitask_id: str):
+
+        """
+        definition of a "completed minitask", in the place of the pending one
+
+        Returns
+        -------
+        planner_core.FinishedMiniTask : the record of the completed minitask
+        """
+
+        self.completed_minitasks += 1
+
+        minitask = self.minitasks[minitask_id]
+
+        # records about the task timers, same id
+        finished = minitask.finish()
+        self.minitasks[minitask_id] = finished
+
+        self.current_minitasks.replace(minitask, finished)
+
+        self.finished += 1
+        self.changes += [{"op": "update", "minitask": finished.data}]
+        self.arrange()
+
+        self.logger.info(f'minitask "{finished.name}" completed')
+
+        return finished
+
+    def update_focus_minitask(self, focus_package: dict):
+
+        """
+        update a minitask after a focus session
+
+        Parameters
+        ----------
+        focus_package : dict
+            results of the session
+
+        Returns
+        -------
+        None
+        """
+
+        minitask = self.minitasks.get(focus_package["id"])
+
+        # minitask deleted during the session
+        if minitask is None:
+            self.logger.warning(f"no minitask with id {focus_package['id']}, session dropped")
+            return
+
+        # wrong job
+        if minitask.type != "minitask":
+            raise TypeError(
+                f"trying to update a <{minitask.type}> with minitask data, wrong id"
+            )
+
+        # right job
+        minitask.update_focus(focus_package=focus_package)
+        self.changes += [{"op": "update", "minitask": minitask.data}]
+
+        # check if the task was completed
+        if focus_package["done"]:
+            self.complete_minitask(minitask_id=minitask.id)
+
+    def page(self, rows: int):
+
+        """
+        Parameters
+        ----------
+        rows : int
+            number of minitasks in view
+
+        Returns
+        -------
+        list : the first minitasks, with their rank
+        """
+
+        minitasks = self.current_minitasks.head(rows)
+        for i, minitask in enumerate(minitasks):
+            minitask.rank = i
+
+        return minitasks
+
+    """ sub-projects """
+
+    def open_subproject(self, node_id: str):
+
+        """
+        open a sub-project, its minitasks are read from the cache and the ones
+        of its parent are kept aside
+
+        Parameters
+        ----------
+        node_id : str
+            id of the sub-project, in the open level
+
+        Returns
+        -------
+        planner_core.SubProject : the open sub-project
+        """
+
+        node = self.minitasks[node_id]
+
+        if node.type != "subproject":
+            raise TypeError(f"trying to open a <{node.type}> as a sub-project")
+
+        self.path += [(node, self.current_minitasks, self.minitasks, self.finished, self.changes)]
+        self._set_level(minitasks=self.cache.get_node(node_id=node.id))
+
+        self.logger.info(f'opened sub-project "{node.name}", depth {len(self.path)}')
+
+        return node
+
+    def close_subproject(self):
+
+        """
+        back to the parent of the open sub-project: its minitasks are saved if
+        they changed, and its totals updated in the parent
+
+        Returns
+        -------
+        planner_core.SubProject : the closed sub-project, None at the top
+        """
+
+        if not self.path:
+            return None
+
+        node, *parent = self.path.pop()
+        changed = len(self.changes) > 0
+
+        if changed:
+
+            self.cache.put_node(node_id=node.id,
+                                minitasks=[minitask.data for minitask in self.current_minitasks])
+
+            completed = node.state == "completed"
+            node.aggregate(minitasks=self.current_minitasks)
+
+        self.current_minitasks, self.minitasks, self.finished, self.changes = parent
+
+        # the totals of the sub-project changed in its parent
+        if changed:
+            self.finished += (node.state == "completed") - completed
+            self.changes += [{"op": "update", "minitask": node.data}]
+
+        self.arrange()
+
+        return node
+
+    def close_all(self):
+
+        while self.path:
+            self.close_subproject()
+
+    def _set_level(self, minitasks: list):
+
+        self.current_minitasks = planner_core.MiniTaskOrder()
+        self.minitasks = {}
+        self.finished = 0
+
+        # update the minitasks list
+        for minijob_data in minitasks:
+            self.add_minitask(data=minijob_data)
+
+        self.changes = []
+        self.arrange()
+
+    def arrange(self):
+
+        """
+        update the completion of the project, from the count of the completed
+        minitasks; the ranks are positions in the order, computed when needed
+
+        Returns
+        -------
+        None
+        """
+
+        # the completion of a sub-project is set when it is closed
+        if self.path:
+            return
+
+        # check project completion
+        self.done = self.finished == len(self.current_minitasks) and len(self.current_minitasks) > 0
+
+        if self.done:
+            self.logger.info(f'all {self.finished} minitasks completed, project "{self.name}" is finished')
+
+
+""" SESSIONS """
+
+
+class SessionPlan:
+
+    """
+    focus and rest intervals of a session, and the totals of its timers
+    """
+
+    # timers of the intervals, alternated
+    KINDS = ("focus", "rest")
+
+    def __init__(self):
+
+        self.intervals = []
+        self.idx = 0
+
+        self.results = {}
+        self.reset()
+
+    def reset(self):
+
+        self.intervals = []
+        self.idx = 0
+
+        self.results = {
+            "tot_focus": 0,
+            "tot_rest": 0,
+            "tot_idle": 0,
+            "done": False,
+            "next_window": "activity_window",
+            "type": "session",
+            "id": None,
+            "rank": -1,
+        }
+
+    def load(self, data: dict):
+
+        """
+        Parameters
+        ----------
+        data : dict
+            intervals, id, rank, type and next_window of the session
+
+        Returns
+        -------
+        None
+        """
+
+        self.reset()
+
+        self.results["id"] = data.get("id")
+        self.results["rank"] = data["rank"]
+        self.results["next_window"] = data["next_window"]
+        self.results["type"] = data["type"]
+
+        self.intervals = list(data["intervals"])
+
+    @property
+    def finished(self):
+
+        return self.idx >= len(self.intervals)
+
+    @property
+    def current(self):
+
+        """ kind and length in minutes of the ongoing interval, None before the first """
+
+        if self.idx == 0:
+            return None
+
+        return self.KINDS[(self.idx - 1) % 2], self.intervals[self.idx - 1]
+
+    def next_interval(self):
+
+        """
+        Returns
+        -------
+        tuple : kind and length in minutes of the next interval, None once the
+            session is done
+        """
+
+        if self.finished:
+            self.results["done"] = True
+            return None
+
+        interval = (self.KINDS[self.idx % 2], self.intervals[self.idx])
+        self.idx += 1
+
+        return interval
+
+    def record(self, names: tuple, durations: tuple):
+
+        """
+        add the run times of a timer to the totals
+
+        Parameters
+        ----------
+        names : tuple
+            kinds of the run times, e.g. ("focus", "idle")
+        durations : tuple
+            run times, in seconds
+
+        Returns
+        -------
+        None
+        """
+
+        for name, duration in zip(names, durations):
+            self.results[f"tot_{name}"] += duration
@@ -1,22 +1,40 @@
+import time
+
+# reference of the startup time, before the heavy imports
+LAUNCH_TIME = time.perf_counter()
+
 import warnings
 
 from kivy.app import App
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.properties import NumericProperty, StringProperty, ListProperty
 from kivy.core.window import Window
 from kivy.clock import Clock
 
 from kivy.lang import Builder
 
-from numpy import array
-import time
 import datetime
+import subprocess
+import math
 import sys
 import os
-import logging
 
 # app utils 
+import log_module
 import cache_module
+import media_module
+import timer_module
+import clock_module
+import ipc_module
+import session_module
+import planner_core
+import planner_engine
+
+# the analytics and NumPy are not imported here, only the CLI loads them
+IMPORT_TIME = time.perf_counter() - LAUNCH_TIME
 
 # set current working directory
 os.chdir(cache_module.APP_PATH)
@@ -29,17 +47,58 @@ FOCUSED_TIME = 30
 REST_TIME = 5
 RANK_WEIGHTS = (1, 0)
 IS_DEADLINE = False
+VISIBLE_ROWS = 9  # rows of the schedule in view, a page of jobs
+PROJECT_ROWS = 9  # rows of the project in view, the next minitasks are below the window
 
 # cache module 
 cache_module_obj = cache_module.CacheInterface()
 
+# periodic callbacks of the windows
+tick_hub = clock_module.TickHub(scheduler=Clock.schedule_once)
+
+
+def on_ui_thread(callback, *args):
+
+    """ run a callback of the timer channel on the UI thread """
+
+    Clock.schedule_once(lambda dt: callback(*args))
+
+
+# events of the timers and of the focus sessions, written in the background
+session_log = session_module.SessionLog()
+
+# channel to the detached timer process, its session events are written here
+timer_server = ipc_module.TimerServer(dispatch=on_ui_thread, on_event=session_log.append)
+
+# timer process, started once and kept warm
+timer_worker = None
+
+
+def launch_timer_worker():
+
+    """
+    start the timer process hidden, unless it is already running: the timers
+    are then shown by its window without starting a new interpreter
+
+    Returns
+    -------
+    None
+    """
+
+    global timer_worker
+
+    if timer_worker is not None and timer_worker.poll() is None:
+        return
+
+    timer_worker = subprocess.Popen([sys.executable, "timer_window.py"],
+                                    env={**os.environ, "PLANNER_TIMER_WORKER": "1"})
+
+    general_logger.info(f"timer worker started, pid {timer_worker.pid}")
+
+
 # general logger
-general_logger = logging.getLogger(f"MainLogs")
-general_logger.setLevel(logging.DEBUG)
-stdout = logging.StreamHandler(stream=sys.stdout)
-fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-stdout.setFormatter(fmt)
-general_logger.addHandler(stdout)
+general_logger = log_module.get_logger("MainLogs")
+general_logger.info(f"modules imported in {1000 * IMPORT_TIME:.0f}ms")
 
 
 """ JOBS """
@@ -62,14 +121,7 @@ class NewJob(Screen):
         self.app = ""
 
         # logger
-        self.logger = logging.getLogger(f"NewJob")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("NewJob")
 
     def on_enter(self, *args):
 
@@ -294,7 +346,7 @@ class NewJob(Screen):
         self.type_task.color = (0.3, 0.8, 0.3, 1)
         self.type_project.color = (1, 1, 1, 1)
 
-        self.newjob_window_image.source = r"media/NewJob window/newjob_window.png"
+        self.newjob_window_image.source = media_module.source(r"media/NewJob window/newjob_window.png")
 
     def set_job_type(self, jobtype="task"):
 
@@ -354,49 +406,60 @@ class NewJob(Screen):
         """
 
         if flag == " ":
-            self.newjob_window_image.source = r"media/NewJob window/newjob_window.png"
+            self.newjob_window_image.source = media_module.source(r"media/NewJob window/newjob_window.png")
 
         elif flag == "check":
             self.newjob_window_image.source = (
-                r"media/NewJob window/newjob_window_check.png"
+                media_module.source(r"media/NewJob window/newjob_window_check.png")
             )
 
         elif flag == "clear":
             self.newjob_window_image.source = (
-                r"media/NewJob window/newjob_window_clear.png"
+                media_module.source(r"media/NewJob window/newjob_window_clear.png")
             )
 
         elif flag == "submit":
             self.newjob_window_image.source = (
-                r"media/NewJob window/newjob_window_submit.png"
+                media_module.source(r"media/NewJob window/newjob_window_submit.png")
             )
 
         elif flag == "return":
             self.newjob_window_image.source = (
-                r"media/NewJob window/newjob_window_return.png"
+                media_module.source(r"media/NewJob window/newjob_window_return.png")
             )
 
         else:
             warnings.warn(f"flag {flag} does not correspond to any newjob_window key")
 
 
-class JobsManager(FloatLayout):
+class JobsManager(RecycleView):
 
     """
-    Object that manage the available jobs and update their states
+    Object that manage the available jobs and update their states, the jobs are
+    displayed by a pool of recycled JobRow widgets
     """
 
+    # height of a row of the schedule
+    row_height = NumericProperty(50)
+
     def __init__(self, **kwargs):
 
         super(JobsManager, self).__init__(**kwargs)
 
+        # jobs and their ranking, and the ranked jobs in view
+        self.engine = planner_engine.JobsEngine(cache=cache_module_obj, rank_deadline=IS_DEADLINE,
+                                                on_change=self.mark_dirty)
         self.current_jobs = []
 
-        self.completed_jobs = 0
+        # number of rows in view, grows as the view is scrolled down
+        self.page_rows = 2 * VISIBLE_ROWS
+        self.bind(scroll_y=self.on_scroll)
 
         self.focus_package = {}
 
-        self.refresh_routine = Clock.schedule_interval(self.refresh, 5)
+        # change tracking, a refresh only happens after a mutation
+        self.dirty = False
+        self.refresh_trigger = Clock.create_trigger(self.tick)
 
         self.app = ""
 
@@ -406,17 +469,8 @@ class JobsManager(FloatLayout):
         # storage
         self.cache = cache_module_obj
 
-        self.refresh()
-
         # logging
-        self.logger = logging.getLogger("JobsManager")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("JobsManager")
 
     def add_job(self, data=None, title="New Task"):
 
@@ -425,7 +479,7 @@ class JobsManager(FloatLayout):
         if data is None:
 
             data = {
-                "name": f"job {len(self.current_jobs)+1}",
+                "name": f"job {len(self.engine)+1}",
                 "priority": "1",
                 "deadline": 7200,
                 "duration": 120,
@@ -455,240 +509,63 @@ class JobsManager(FloatLayout):
 
         self.logger.info(f"adding new job")
 
-        # task job
-        if new_job_data["type"] == "task":
+        self.engine.add_job(data=new_job_data)
 
-            new_task_instance = TaskObject(y_pos=0.0, data=new_job_data)
-            self.current_jobs += [new_task_instance]
-
-            self.logger.info(f"+new task added")
-
-        # project job
-        elif new_job_data["type"] == "project":
-
-            new_task_instance = ProjectObject(y_pos=0.0, data=new_job_data)
-            self.current_jobs += [new_task_instance]
-
-            self.logger.info(f"+new project added")
-
-        # update ranking
-        self.refresh()
-
-    def edit_job(self, rank: int):
+    def edit_job(self, job_id: str):
 
         """handle the edition of a task
 
         Parameters
         ----------
-        rank : int
-            rank of the task to edit
+        job_id : str
+            id of the task to edit
 
         Returns
         -------
         None
         """
 
-        self.logger.info(f"editing job, {rank=}")
-
-        # get task
-        job = self.current_jobs[rank]
+        self.logger.info(f"editing job, {job_id=}")
 
         # remove from current
-        del self.current_jobs[rank]
+        job = self.engine.take_job(job_id=job_id)
 
         # edit copy
         self.add_job(data=job.data, title=f"Editing <{job.name}>")
 
-    def compute_scores(self):
-
-        """
-        update of the scores of each available job 
-
-        CURRENTLY : no actual update, all job keep their priority as it was initially set
-
-        Returns
-        -------
-        None
-        """
-
-        # get priorities list
-        priorities = [int(job.priority) for job in self.current_jobs]
-
-        # define score #
-        # sort by deadline from small to large
-        if IS_DEADLINE:
-            self.current_jobs.sort(key=lambda u: u.deadline, reverse=True)
-
-        scored = []
-        for i, job in enumerate(self.current_jobs):
-            # print('computing ', job.type)
-            if job.type == "finished task" or job.type == "finished project":
-                scored += [job]
-                continue
-
-            # relative priority
-            if len(priorities) == 1:
-                new_priority = 10
-            else:
-                try:
-                    #new_priority = (
-                    #    10
-                    #    * (int(job.priority) - min(priorities))
-                    #    / (max(priorities) - min(priorities))
-                    #)
-                    new_priority = job.priority
-                except ZeroDivisionError:
-                    # print('\n--same priorities: ', priorities)
-                    #new_priority = int(sum(priorities) / len(priorities))
-                    raise ValueError('priority not computable, ZeroDivision')
-
-            # relative deadline | considered only if DEADLINE is enabled [IS_DEADLINE]
-            #relative_deadline = IS_DEADLINE * 10 * (i + 1) / len(self.current_jobs)
-
-            # update priority
-            job.update_priority(priority=new_priority)
-
-            # score
-            #value = (RANK_WEIGHTS[0] * new_priority + RANK_WEIGHTS[1] * relative_deadline) / (RANK_WEIGHTS[0] + RANK_WEIGHTS[1])
-            # print(f'task {task.name} value: {value} [{new_priority}, {relative_deadline}]')
-            job.set_score(value=round(new_priority))
-            scored += [job]
-
-        #
-        self.current_jobs = scored
-        self.current_jobs.sort(key=lambda u: u.value, reverse=True)
-
-    def delete_job(self, rank: int):
+    def delete_job(self, job_id: str):
 
         """handle the deletion of an old task
 
         Parameters
         ----------
-        rank : int
-            rank of the task to delete
+        job_id : str
+            id of the task to delete
 
         Returns
         -------
         None
         """
 
-        self.logger.info(f"deleting job, {rank=}")
-
-        del self.current_jobs[rank]
+        self.logger.info(f"deleting job, {job_id=}")
 
-        self.refresh()
+        self.engine.delete_job(job_id=job_id)
 
-    def completed_job(self, rank: int):
+    def completed_job(self, job_id: str):
 
         """definition of a "completed task" and substitution of the old task
 
         Parameters
         ----------
-        rank : int
-            rank of the task to complete
-
-        Returns
-        -------
-        None
-        """
-
-        self.completed_jobs += 1
-
-        # get completed job
-        job = self.current_jobs[rank]
-
-        self.logger.info(f"turning a <{job.type}> into a <finished {job.type}>")
-
-        # define record
-        full_record = {}
-        full_record["name"] = job.data["name"]
-        full_record["type"] = f"finished {job.type}"
-        full_record["rank"] = job.data["rank"]
-        full_record["priority"] = job.data["priority"]
-        full_record["deadline"] = job.data["deadline"]
-        full_record["creation"] = job.data["creation"]
-        full_record["next_window"] = job.data["next_window"]
-        full_record["done"] = True
-
-        # create new finished job
-        if job.type == "task":
-
-            # record from the focused session
-            full_record["duration"] = job.data["duration"]
-            full_record["tot_focus"] = job.data["tot_focus"]
-            full_record["tot_rest"] = job.data["tot_rest"]
-            full_record["tot_idle"] = job.data["tot_idle"]
-
-            finished_job = FinishedTask(
-                y_pos=job.y_pos, priority=-1 * (self.completed_jobs + 1)
-            )
-
-        elif job.type == "project":
-
-            full_record["current_minitasks"] = job.data["current_minitasks"]
-            full_record["completed_minitasks"] = job.data["completed_minitasks"]
-
-            finished_job = FinishedProject(
-                y_pos=job.y_pos, priority=-1 * (self.completed_jobs + 1)
-            )
-
-        else:
-            raise TypeError(f'type "{job.type}" not recognized')
-
-        # update the finished task instance
-        finished_job.set_record(record=full_record)  # records about the task timers
-
-        # delete old instance
-        del self.current_jobs[rank]
-        self.current_jobs += [finished_job]
-
-        self.refresh()
-
-    def unfinish_project(self, rank: int, updated_data: dict):
-
-        """make a finished project an ongoing project again
-
-        Parameters
-        ----------
-        rank : int
-            rank of the project to unfinish
-        updated_data : dict
-            data to update
+        job_id : str
+            id of the task to complete
 
         Returns
         -------
         None
         """
 
-        self.logger.info(f"unfinishing project, {rank=}")
-
-        # get job
-        job = self.current_jobs[rank]
-
-        # new project
-        project = ProjectObject(
-            y_pos=0,
-            data={
-                "name": job.data["name"],
-                "priority": job.data["priority"],
-                "duration": 0,
-                "deadline": job.data["deadline"],
-                "type": "project",
-                "current_minitasks": updated_data["current_minitasks"],
-                "completed_minitasks": updated_data["completed_minitasks"],
-                "validity": True,
-            },
-        )
-
-        # update project data
-        project.data["rank"] = job.data["rank"]
-        project.data["done"] = False
-
-        # update
-        del self.current_jobs[rank]
-        self.current_jobs += [project]
-
-        self.refresh()
+        self.engine.complete_job(job_id=job_id)
 
     def update_focus_task(self, focus_package: dict):
 
@@ -706,29 +583,7 @@ class JobsManager(FloatLayout):
 
         self.logger.debug(f"updating focus task, package: {focus_package=}")
 
-        job = self.current_jobs[focus_package["rank"]]
-
-        # dont process a finished task
-        if job.type == "finished task":
-            return
-
-        # wrong job
-        if job.type != "task":
-            raise TypeError(
-                f"trying to update a <{job.type}> with task data, wrong rank"
-            )
-
-        # right job
-        job.data["tot_focus"] = focus_package["tot_focus"]
-        job.data["tot_rest"] = focus_package["tot_rest"]
-        job.data["tot_idle"] = focus_package["tot_idle"]
-        job.data["done"] = focus_package["done"]
-
-        # check if the task was completed
-        if focus_package["done"]:
-            self.completed_job(rank=focus_package["rank"])
-
-        self.refresh()
+        self.engine.update_focus_task(focus_package=focus_package)
 
     def update_project(self, updated_data: dict):
 
@@ -746,400 +601,269 @@ class JobsManager(FloatLayout):
 
         self.logger.debug(f"updating project, updated_data: {updated_data=}")
 
-        job = self.current_jobs[updated_data["rank"]]
-
-        # dont process a finished project
-        if job.type == "finished project" and updated_data["done"]:
-            return
-
-        # unfinish a project
-        elif job.type == "finished project" and not updated_data["done"]:
-            self.unfinish_project(rank=updated_data["rank"], updated_data=updated_data)
-            return
-
-        # wrong job
-        elif job.type != "project":
-            raise TypeError(
-                f'trying to update a <{job.type}> with project data, wrong rank [{job.rank}] | update: {updated_data["done"]}'
-            )
-
-        # right job
-        job.data["current_minitasks"] = updated_data["current_minitasks"]
-        job.data["completed_minitasks"] = updated_data["completed_minitasks"]
-        job.data["rank"] = updated_data["rank"]
-        job.data["done"] = updated_data["done"]
-
-        # update
-        del self.current_jobs[updated_data["rank"]]
-        self.current_jobs += [job]
-
-        # check if the project was completed:
-        if updated_data["done"]:
-            self.completed_job(rank=-1)
-            return
-
-        self.refresh()
-
-    def refresh(self, *args):
+        self.engine.update_project(updated_data=updated_data)
 
-        # print('\n -- refreshing --')
-        self.clear_widgets()
-        # self.current_tasks.sort(key=lambda u: u.priority, reverse=True)
-        self.compute_scores()
+    def mark_dirty(self):
 
-        newly_ordered = []
-        for i, job in enumerate(self.current_jobs):
+        """flag a change of the jobs, the ranking is updated at the next frame
 
-            job.y_pos = 0.9 - i * 0.1
-            job.set_rank(rank=i)
-            job.update_position()
-            # print(f'job {job.name} [{job.type}]: score {job.value}, rank {job.rank}')
+        Returns
+        -------
+        None
+        """
 
-            newly_ordered += [job]
-            self.add_widget(job)
+        self.dirty = True
+        self.refresh_trigger()
 
-        self.current_jobs = newly_ordered
+    def tick(self, *args):
 
-    def load_pending(self):
+        """periodic update, a no-op when nothing changed"""
 
-        """load previous pending tasks"""
+        if self.dirty:
+            self.refresh()
 
-        global FOCUSED_TIME
-        global REST_TIME
+    def on_scroll(self, instance, scroll_y: float):
 
-        self.logger.debug("loading pending jobs")
+        """load the next page of jobs at the bottom of the view"""
 
-        # retrieve
-        is_available, saved_objects = self.cache.retrieve_objects()
+        if scroll_y <= 0 and len(self.engine) > self.page_rows:
+            self.page_rows += VISIBLE_ROWS
+            self.mark_dirty()
 
-        if not is_available:
-            self.logger.debug("no saved pending tasks")
-            return
+    def refresh(self, *args):
 
-        # update
-        for name, obj in saved_objects.items():
-            if name == "settings":
-                FOCUSED_TIME = obj["FOCUSED_TIME"]
-                REST_TIME = obj["REST_TIME"]
-                continue
+        """update the ranking and rebind only the rows that changed"""
 
-            self.save_job(new_job_data=obj)
+        self.dirty = False
 
-        self.logger.info(f"loaded {len(saved_objects)-1} pending jobs")
-        self.logger.debug(f"loaded settings: FOCUSED_TIME={FOCUSED_TIME} REST_TIME={REST_TIME}")
+        self.current_jobs = self.engine.page(rows=self.page_rows)
 
-    def save_pending(self):
+        moved = 0
+        new_rows = []
+        for i, job in enumerate(self.current_jobs):
 
-        """save the pending tasks"""
+            row = job.view_data()
 
-        ongoing = []
-        for job in self.current_jobs:
+            if i >= len(self.data):
+                new_rows += [row]
 
-            # ignore finished tasks
-            if job.type != "task" and job.type != "project":
+            # same row as before
+            elif self.data[i] == row:
                 continue
 
-            ongoing += [job.data]
-
-            self.logger.debug(f"saved job: {job.data}")
-
-        # save
-        settings = {"FOCUSED_TIME": FOCUSED_TIME, "REST_TIME": REST_TIME}
-
-        self.logger.debug(f"saving settings: {settings=}")
-        self.cache.save_pending_objects(objects=ongoing, settings=settings)
-
-
-""" TASKS """
-
-
-class TaskObject(FloatLayout):
-
-    """
-    new task object, with buttons
-    """
-
-    def __init__(self, y_pos: float, data: dict, **kwargs):
-        super(TaskObject, self).__init__(**kwargs)
-
-        # data
-        self.name = data["name"]
-        self.priority = data["priority"]
-        self.duration = data["duration"]
-        self.type = data["type"]
-        self.deadline = data["deadline"]
-        self.deadline_str = self.deadline
-
-        self.rank = 0
-        self.value = 0
+            else:
+                self.data[i] = row
 
-        self.intervals = self.provide_focus_data()["intervals"]
+            moved += 1
 
-        self.state = "pending"
+        # rows of the jobs gone
+        if len(self.data) > len(self.current_jobs):
+            del self.data[len(self.current_jobs):]
 
-        # set creation
-        self.data = {
-            "name": self.name,
-            "type": self.type,
-            "rank": self.rank,
-            "deadline": self.deadline,
-            "priority": self.priority,
-            "next_window": "schedule_window",
-            "creation": time.time(),
-            "done": False,
-            "duration": self.duration,
-            "tot_focus": 0,
-            "tot_rest": 0,
-            "tot_idle": 0,
-        }
+        if new_rows:
+            self.data.extend(new_rows)
 
-        # labels
-        self.label.text = self.name
-        self.score.text = str(self.value)
-        self.status.text = "pending"
-        if IS_DEADLINE:
-            self.deadline_clock.text = ""
+        self.logger.debug(f"refreshed, {moved} of {len(self.current_jobs)} rows changed, {len(self.engine.queue)} ranked")
 
-        # location
-        self.y_pos = y_pos
-        self.pos_hint = {"x": 0.0, "top": y_pos}
+    def run_action(self, action: str, job_id: str):
 
-        self.update_position()
+        """dispatch the button of a schedule row
 
-        # logger
-        self.logger = logging.getLogger(f"Task-{self.name}")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
+        Parameters
+        ----------
+        action : str
+            one of "play", "open", "results", "done", "edit" and "delete"
+        job_id : str
+            id of the job of the row
 
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
+        Returns
+        -------
+        None
+        """
 
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        job = self.engine.get(job_id)
 
-        self.logger.info(f"created task")
+        if action == "play":
+            self.app.root.current = "interval_handler"
+            self.app.root.transition.direction = "left"
+            self.app.root.current_screen.load_data(
+                data=job.provide_focus_data(focus=FOCUSED_TIME, rest=REST_TIME)
+            )
 
-    def set_score(self, value: float):
+        elif action == "open":
+            self.app.root.current = "project_window"
+            self.app.root.transition.direction = "left"
+            self.app.root.current_screen.projects_manager.load_project(project_data=job.data)
 
-        self.value = value
-        self.score.text = str(self.value)
+        elif action == "results":
+            self.app.root.current = "results_window"
+            self.app.root.transition.direction = "left"
+            self.app.root.current_screen.show(data=job.data)
 
-    def get_icons_position(self):
+        elif action == "done":
+            self.completed_job(job_id=job_id)
 
-        return {"x": 0.85, "top": self.pos_hint["top"]}
+        elif action == "edit":
+            self.edit_job(job_id=job_id)
 
-    def update_priority(self, priority: int):
+        elif action == "delete":
+            self.delete_job(job_id=job_id)
 
-        self.priority = priority
-        self.data["priority"] = priority
+        else:
+            warnings.warn(f"action {action} does not correspond to any job button")
 
-    def update_position(self):
+    def load_pending(self):
 
-        # update position
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
-        self.rank_pos.text = str(self.rank)
+        """load previous pending tasks"""
 
-        # time from creation
-        elapsed = time.time() - self.data["creation"]
-        timer = self.deadline - elapsed
+        global FOCUSED_TIME
+        global REST_TIME
 
-        # check #
-        # beyond deadline
-        if elapsed >= self.deadline and IS_DEADLINE:
-            self.deadline_clock.text = "0h 0m"
+        self.logger.debug("loading pending jobs")
 
-            self.label.color = (0.8, 0.2, 0.2, 1)
-            self.status.color = (0.8, 0.2, 0.2, 1)
-            self.score.color = (0.8, 0.2, 0.2, 1)
-            self.deadline_clock.color = (0.8, 0.2, 0.2, 1)
+        # retrieve, the jobs are ranked page by page at the refreshes
+        if not self.engine.load_pending():
             return
 
-        # going
-        if IS_DEADLINE:
-            self.deadline_clock.text = f"{timer // 3600 // 24:.0f}d {timer // 3600 % 25:.0f}h {timer // 60 % 60:.0f}m"
-
-    def provide_focus_data(self):
-
-        """
-        compute the intervals as focus-rest-focus-rest... from the total task duration
-        :return: list
-        """
-
-        # base focus length = FOCUSED_TIME, rest = REST_TIME
-        nb_focus = [FOCUSED_TIME] * (self.duration // FOCUSED_TIME) + [
-            self.duration % FOCUSED_TIME
-        ]
-        return {
-            "intervals": list(array([[x] + [REST_TIME] for x in nb_focus]).reshape(-1))[
-                :-1
-            ],
-            "rank": self.rank,
-            "type": self.type,
-            "next_window": "schedule_window",
-        }
-
-    def set_rank(self, rank: int):
-
-        """
-        set the rank of the task
-
-        Parameters
-        ----------
-        rank : int
-        """
-
-        self.rank = rank
+        # settings
+        FOCUSED_TIME = self.engine.settings["FOCUSED_TIME"]
+        REST_TIME = self.engine.settings["REST_TIME"]
 
-    def start_task(self):
-
-        self.logger.info(f"starting task")
-
-    def edit_task(self):
-
-        self.logger.info(f"editing task")
-
-    def change_image(self, flag=" "):
-
-        """
-        change the image of the task object
+        self.logger.debug(f"loaded settings: FOCUSED_TIME={FOCUSED_TIME} REST_TIME={REST_TIME}")
 
-        Parameters
-        ----------
-        flag : str
-            " " = default
-        """
+    def save_pending(self):
 
-        if flag == " ":
-            self.job_icons_image.source = r"media/Job obj/job_icons.png"
+        """save the pending tasks"""
 
-        elif flag == "play":
-            self.job_icons_image.source = r"media/Job obj/job_icons_play.png"
-            self.logger.info("play button pressed")
+        # settings
+        self.engine.settings = {"FOCUSED_TIME": FOCUSED_TIME, "REST_TIME": REST_TIME}
 
-        elif flag == "delete":
-            self.job_icons_image.source = r"media/Job obj/job_icons_delete.png"
-            self.logger.info("delete button pressed")
+        self.engine.save_pending()
+        self.logger.debug(f"cache write latency: {self.cache.writer.report()}")
 
-        elif flag == "done":
-            self.job_icons_image.source = r"media/Job obj/job_icons_done.png"
-            self.logger.info("done button pressed")
 
-        elif flag == "edit":
-            self.job_icons_image.source = r"media/Job obj/job_icons_edit.png"
-            self.logger.info("edit button pressed")
+""" TASKS """
 
 
-class FinishedTask(FloatLayout):
+class JobRow(RecycleDataViewBehavior, FloatLayout):
 
     """
-    new task object, with buttons
+    recycled row of the schedule, rebound to the job at its index, and addressing
+    the job by its id
     """
 
-    def __init__(self, y_pos: float, priority: int, **kwargs):
-        super(FinishedTask, self).__init__(**kwargs)
-
-        # data
-        self.name = ""
-        self.data = {}
-        self.factual_priority = 0
-        self.priority = priority
-        self.rank = 0
-        self.value = 0
-        self.deadline = 0  # fictional
-
-        self.type = "finished task"
+    job_id = StringProperty("")
+    rank = NumericProperty(0)
+    job_name = StringProperty("")
+    score = StringProperty("")
+    status = StringProperty("")
+    kind = StringProperty("task")
+    text_color = ListProperty([0.1, 0.2, 0.1, 1])
+
+    # action of each of the four buttons, by kind of job
+    actions = {
+        "task": ("play", "done", "edit", "delete"),
+        "project": ("open", "done", "edit", "delete"),
+        "finished task": (None, None, "results", "delete"),
+        "finished project": (None, None, "open", "delete"),
+    }
+
+    # icons image, by kind of job and pressed button
+    icons = {
+        "task": {
+            " ": r"media/Job obj/job_icons.png",
+            "play": r"media/Job obj/job_icons_play.png",
+            "done": r"media/Job obj/job_icons_done.png",
+            "edit": r"media/Job obj/job_icons_edit.png",
+            "delete": r"media/Job obj/job_icons_delete.png",
+        },
+        "project": {
+            " ": r"media/Job obj/job_icons_prj.png",
+            "open": r"media/Job obj/job_icons_prj_open.png",
+            "done": r"media/Job obj/job_icons_prj_done.png",
+            "edit": r"media/Job obj/job_icons_prj_edit.png",
+            "delete": r"media/Job obj/job_icons_prj_delete.png",
+        },
+        "finished task": {
+            " ": r"media/Finished obj/finished_task.png",
+            "results": r"media/Finished obj/finished_task_results.png",
+            "delete": r"media/Finished obj/finished_task_delete.png",
+        },
+        "finished project": {
+            " ": r"media/Finished obj/finished_prj.png",
+            "open": r"media/Finished obj/finished_prj_open.png",
+            "delete": r"media/Finished obj/finished_prj_delete.png",
+        },
+    }
+
+    colors = {
+        "task": [0.1, 0.2, 0.1, 1],
+        "project": [0.1, 0.3, 0.7, 1],
+        "finished task": [0.1, 0.5, 0.1, 0.9],
+        "finished project": [0.1, 0.5, 0.1, 0.9],
+    }
 
-        # labels
-        if IS_DEADLINE:
-            self.deadline_clock.text = ""
-        self.label.text = self.name
-        self.score.text = str(self.factual_priority)
-        self.status.text = "completed"
+    def __init__(self, **kwargs):
 
-        # location
-        self.y_pos = y_pos
-        self.pos_hint = {"x": 0.0, "top": y_pos}
+        super(JobRow, self).__init__(**kwargs)
 
-        general_logger.info(f"created finished task")
+        self.manager = None
 
-    def set_rank(self, rank: int):
+    def refresh_view_attrs(self, rv, index, data):
 
         """
-        set the rank of the task
+        bind the row to the job at the given index
 
         Parameters
         ----------
-        rank : int
+        rv : JobsManager
+            the recycle view of the schedule
+        index : int
+            index of the row
+        data : dict
+            the properties of the job
         """
 
-        self.rank = rank
+        self.manager = rv
+        super(JobRow, self).refresh_view_attrs(rv, index, data)
 
-    def update_position(self):
+        self.text_color = self.colors[self.kind]
+        self.change_image()
 
-        """
-        update the position of the task
-        """
-
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
-        self.rank_pos.text = str(self.rank)
-
-    def update_priority(self, priority: int):
+    def press(self, slot: int):
 
         """
-        update the priority of the task
-
         Parameters
         ----------
-        priority : int
-            priority of the task
-        """
-
-        self.priority = priority
-
-    def set_score(self, value: float):
-
+        slot : int
+            index of the pressed button
         """
-        set the score of the task
 
-        Parameters
-        ----------
-        value : float
-            score of the task
-        """
+        action = self.actions[self.kind][slot]
 
-        self.value = value
-        self.score.text = str(self.value)
+        if action is not None:
+            self.change_image(flag=action)
 
-    def set_record(self, record: dict):
+    def release(self, slot: int):
 
         """
-        set the record of the task
-
         Parameters
         ----------
-        record : dict
-            record of the task
+        slot : int
+            index of the released button
         """
 
-        self.data = record
+        action = self.actions[self.kind][slot]
 
-        # record
-        self.name = record["name"]
-        self.type = record["type"]
-        self.factual_priority = record["priority"]
-
-        # update description
-        if IS_DEADLINE:
-            self.deadline_clock.text = time.strftime(
-                "%H:%M:%S", time.localtime(record["creation"])
-            )
-        self.label.text = self.name
+        self.change_image()
 
-        general_logger.info(f"finished task '{self.name}' setting a record")
+        if action is not None:
+            self.manager.run_action(action=action, job_id=self.job_id)
 
     def change_image(self, flag=" "):
 
         """
-        change the image of the task object
+        change the icons image to mark a button press
 
         Parameters
         ----------
@@ -1147,18 +871,7 @@ class FinishedTask(FloatLayout):
             " " = default
         """
 
-        if flag == " ":
-            self.job_icons_image.source = r"media/Finished obj/finished_task.png"
-
-        elif flag == "results":
-            self.job_icons_image.source = (
-                r"media/Finished obj/finished_task_results.png"
-            )
-            general_logger.info(f"finished task '{self.name}' result button pressed")
-
-        elif flag == "delete":
-            self.job_icons_image.source = r"media/Finished obj/finished_task_delete.png"
-            general_logger.info(f"finished task '{self.name}' delete button pressed")
+        self.job_icons_image.source = media_module.source(self.icons[self.kind][flag])
 
 
 """ PROJECTS """
@@ -1181,31 +894,22 @@ class ProjectWindow(Screen):
 
 class ProjectManager(FloatLayout):
 
+    # number of open sub-projects, 0 at the top of the project
+    depth = NumericProperty(0)
+
     def __init__(self, **kwargs):
 
         super(ProjectManager, self).__init__(**kwargs)
 
-        self.name = ""
-
-        self.current_minitasks = []
-
-        self.completed_minitasks = 0
-        self.project_rank = 0
-        self.done = False
+        # minitasks of the open project, the sub-projects are read from the cache
+        self.project = planner_engine.ProjectEngine(cache=cache_module_obj)
 
         self.app = ""
 
         self.updated = False
 
         # logger
-        self.logger = logging.getLogger(f"ProjectManager")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("ProjectManager")
 
 
     def load_project(self, project_data: dict):
@@ -1222,42 +926,30 @@ class ProjectManager(FloatLayout):
         None
         """
 
-        self.name = project_data["name"]
-        self.completed_minitasks = project_data["completed_minitasks"]
-        self.project_rank = project_data["rank"]
-        self.done = project_data["done"]
-        self.current_minitasks = []
-
-        # update the minitasks list
-        for minijob_data in project_data["current_minitasks"]:
-            self.save_mini_task(new_mini_task_data=minijob_data)
+        self.project.load(project_data=project_data)
+        self.depth = 0
 
         self.refresh()
 
-        self.logger.info(f"loaded {self.name} rank {self.project_rank}")
+        self.logger.info(f"loaded {self.project.name} rank {self.project.project_rank}")
 
     def return_project_data(self):
 
-        """return the project data, possibly ready to be saved as json
+        """return the changes of the project since it was loaded, only the changed minitasks
 
         Returns
         -------
-        dict : the project data
+        dict : the update of the project data
         """
 
-        # every minitask as dict data
-        current_minitasks_dict = [minitask.data for minitask in self.current_minitasks]
-
-        data = {
-            "current_minitasks": current_minitasks_dict,
-            "completed_minitasks": self.completed_minitasks,
-            "rank": self.project_rank,
-            "done": self.done,
-        }
+        delta = self.project.delta()
+        self.depth = 0
 
-        self.logger.info(f"returning {self.name}, rank {self.project_rank}, done {self.done}")
+        _, finished, total = self.project.totals
+        self.logger.info(f"returning {self.project.name}, rank {self.project.project_rank}, "
+                         f"{finished}/{total} minitasks done, done {self.project.done}")
 
-        return data
+        return delta
 
     def add_minitask(self, data=None, title="New mini-Task"):
 
@@ -1280,10 +972,10 @@ class ProjectManager(FloatLayout):
         if data is None:
 
             data = {
-                "name": f"mini-task-{len(self.current_minitasks)+1}",
+                "name": f"mini-task-{len(self.project.current_minitasks)+1}",
                 "duration": 30,
                 "type": "minitask",
-                "rank": str(len(self.current_minitasks)),
+                "rank": str(len(self.project.current_minitasks)),
                 "validity": False,
             }
 
@@ -1291,147 +983,138 @@ class ProjectManager(FloatLayout):
         self.app.root.transition.direction = "left"
         self.app.root.current_screen.load_data(data=data, title=title)
 
-    def save_mini_task(self, new_mini_task_data: dict):
+    def add_subproject(self):
 
-        """
-        save the new minitask data
+        """name and place a new sub-project, in the minitask window"""
+
+        self.add_minitask(
+            data={
+                "name": f"sub-project-{len(self.project.current_minitasks)+1}",
+                "duration": 0,
+                "type": "subproject",
+                "rank": str(len(self.project.current_minitasks)),
+                "validity": False,
+            },
+            title="New sub-Project",
+        )
+
+    def open_subproject(self, node_id: str):
+
+        """display the minitasks of a sub-project, read from the cache
 
         Parameters
         ----------
-        new_mini_task_data : dict
-            the new minitask data
+        node_id : str
+            the id of the sub-project
 
         Returns
         -------
         None
         """
 
-        self.logger.info(f"adding minitask")
+        node = self.project.open_subproject(node_id=node_id)
+        self.depth = len(self.project.path)
 
-        rank = new_mini_task_data["rank"]
+        self.logger.info(f"opened sub-project '{node.name}'")
 
-        # new minitask
-        if new_mini_task_data["type"] == "minitask":
+        self.refresh()
 
-            mini_task_instance = MiniTask(y_pos=0.0, data=new_mini_task_data)
+    def close_subproject(self):
 
-        # new finished minitask
-        elif new_mini_task_data["type"] == "finished minitask":
+        """back to the parent of the open sub-project"""
 
-            mini_task_instance = FinishedMiniTask(
-                y_pos=0.0, rank=new_mini_task_data["rank"]
-            )
+        node = self.project.close_subproject()
+        self.depth = len(self.project.path)
 
-            # update the finished task instance
-            mini_task_instance.set_record(
-                record=new_mini_task_data
-            )  # records about the task timers
+        if node is not None:
+            self.logger.info(f"closed sub-project '{node.name}', {node.finished}/{node.total} minitasks done")
 
-        else:
-            raise TypeError(f'type <{new_mini_task_data["type"]}> invalid')
+        self.refresh()
 
-        # place at the selected rank and push down the task previous at the selected rank
-        new_list = (
-            self.current_minitasks[:rank]
-            + [mini_task_instance]
-            + self.current_minitasks[rank:]
-        )
+    def save_mini_task(self, new_mini_task_data: dict):
+
+        """
+        save the new minitask data
+
+        Parameters
+        ----------
+        new_mini_task_data : dict
+            the new minitask data
+
+        Returns
+        -------
+        None
+        """
+
+        self.logger.info(f"adding minitask")
 
-        # save mini task
-        self.current_minitasks = new_list
+        # placed at the selected rank, the next ones pushed down
+        self.project.add_minitask(data=new_mini_task_data)
 
         self.updated = True
-        self.refresh(sort=False)
+        self.refresh()
 
-    def edit_minitask(self, rank: int):
+    def edit_minitask(self, minitask_id: str):
 
-        """edit minitask with the provided rank
+        """edit minitask with the provided id
 
         Parameters
         ----------
-        rank : int
-            the rank of the minitask to edit
+        minitask_id : str
+            the id of the minitask to edit
 
         Returns
         -------
         None
         """
 
-        # get task
-        self.logger.info(f"editing minitask '{minitask.name}' - total minitasks {len(self.current_minitasks)}")
-        minitask = self.current_minitasks[rank]
+        # remove from current, keeping its rank
+        data = self.project.edit_minitask(minitask_id=minitask_id)
+        self.logger.info(f"editing minitask '{data['name']}' - total minitasks {len(self.project.current_minitasks)}")
 
-        # remove from current
-        del self.current_minitasks[rank]
+        self.refresh()
 
         # edit copy
-        self.add_minitask(data=minitask.get_data(), title=f"Editing <{minitask.name}>")
+        self.add_minitask(data=data, title=f"Editing <{data['name']}>")
 
-    def delete_minitask(self, rank: int):
+    def delete_minitask(self, minitask_id: str):
 
         """handle the deletion of an old task
 
         Parameters
         ----------
-        rank : int
-            the rank of the task to delete
+        minitask_id : str
+            the id of the task to delete
 
         Returns
         -------
         None
         """
 
-        self.logger.info(f"deleting minitask '{self.current_minitasks[rank].name}'")
+        minitask = self.project.delete_minitask(minitask_id=minitask_id)
 
-        del self.current_minitasks[rank]
+        self.logger.info(f"deleting minitask '{minitask.name}'")
 
         self.refresh()
 
-    def completed_minitask(self, rank: int):
+    def completed_minitask(self, minitask_id: str):
 
         """definition of a "completed minitask" and substitution of the old minitask
 
         Parameters
         ----------
-        rank : int
-            the rank of the minitask to complete
+        minitask_id : str
+            the id of the minitask to complete
 
         Returns
         -------
         None
         """
 
-        self.completed_minitasks += 1
-
-        # get completed job
-        job = self.current_minitasks[rank]
-
-        # define record
-        full_record = {}
-        full_record["name"] = job.data["name"]
-        full_record["type"] = f"finished {job.type}"
-        full_record["rank"] = job.data["rank"]
-        full_record["next_window"] = job.data["next_window"]
-        full_record["duration"] = job.data["duration"]
-        full_record["creation"] = job.data["creation"]
-        full_record["tot_focus"] = job.data["tot_focus"]
-        full_record["tot_rest"] = job.data["tot_rest"]
-        full_record["tot_idle"] = job.data["tot_idle"]
-        full_record["done"] = True
-
-        finished_job = FinishedMiniTask(y_pos=job.y_pos, rank=job.rank)
-
-        # update the finished task instance
-        finished_job.set_record(record=full_record)  # records about the task timers
-
-        # del
-        del self.current_minitasks[rank]
-        self.current_minitasks += [finished_job]
+        self.project.complete_minitask(minitask_id=minitask_id)
 
         self.refresh()
 
-        self.logger.info(f'minitask "{self.current_minitasks[rank].name}" completed')
-
     def update_focus_minitask(self, focus_package: dict):
 
         """update the minitask status after a focus session
@@ -1448,344 +1131,38 @@ class ProjectManager(FloatLayout):
 
         self.logger.debug(f"updating minitask, package: {focus_package}")
 
-        job = self.current_minitasks[focus_package["rank"]]
-
-        # wrong job
-        if job.type != "minitask":
-            raise TypeError(
-                f"trying to update a <{job.type}> with minitask data, wrong rank"
-            )
-
-        # right job
-        job.data["tot_focus"] = focus_package["tot_focus"]
-        job.data["tot_rest"] = focus_package["tot_rest"]
-        job.data["tot_idle"] = focus_package["tot_idle"]
-        job.data["done"] = focus_package["done"]
+        self.project.update_focus_minitask(focus_package=focus_package)
 
-        # check if the task was completed
+        # the completed minitask is displayed as finished
         if focus_package["done"]:
-            self.completed_minitask(rank=focus_package["rank"])
+            self.refresh()
 
-    def refresh(self, sort=True, *args):
+    def refresh(self, *args):
 
-        """update the position of the minitask within the project structure"""
+        """display the minitasks in view, at their position within the project structure"""
 
         self.clear_widgets()
 
-        if sort:
-            self.current_minitasks.sort(key=lambda u: u.rank, reverse=False)
-
-        finished_count = 0
-        newly_ordered = []
-        for i, minitask in enumerate(self.current_minitasks):
-
-            try:
-                minitask.y_pos = 0.9 - i * 0.1
-            except AttributeError:
-                raise AttributeError(
-                    f'minitask "{minitask.name}", y_pos={minitask.y_pos}'
-                )
-
-            minitask.update_position()
-            minitask.set_rank(rank=i)
-
-            newly_ordered += [minitask]
-            self.add_widget(minitask)
-
-            # check minitask status
-            if minitask.state == "completed":
-
-                finished_count += 1
-
-        # update
-        self.current_minitasks = newly_ordered
-
-        # check project completion
-        if (
-            finished_count == len(self.current_minitasks)
-            and len(self.current_minitasks) > 0
-        ):
-
-            print(
-                f"\nall {len(self.current_minitasks)} minitasks have been completed! ",
-                f' Project "{self.name}" is finished',
-            )
-
-            self.done = True
-
-        else:
-            self.done = False
-
-
-class ProjectObject(FloatLayout):
+        for i, minitask in enumerate(self.project.page(rows=PROJECT_ROWS)):
 
-    def __init__(self, y_pos: float, data: dict, **kwargs):
-        super(ProjectObject, self).__init__(**kwargs)
+            # check minitask status, and display it
+            if minitask.type == "subproject":
+                self.add_widget(SubProject(y_pos=0.9 - i * 0.1, record=minitask))
 
-        # data
-        self.name = data["name"]
-        self.priority = data["priority"]
-        self.type = "project"
-
-        self.deadline = data["deadline"]  # in seconds
-        self.deadline_date = ""
-
-        self.rank = 0
-        self.value = 0
-
-        self.state = "pending"
-
-        # project data
-        self.data = {
-            "name": self.name,
-            "type": self.type,
-            "rank": self.rank,
-            "priority": self.priority,
-            "deadline": self.deadline,
-            "next_window": "schedule_window",
-            "creation": time.time(),
-            "done": False,
-            "current_minitasks": data["current_minitasks"],
-            "completed_minitasks": data["completed_minitasks"],
-        }
-
-        # labels
-        self.label.text = self.name
-        self.score.text = str(self.value)
-        self.status.text = "pending"
-        if IS_DEADLINE:
-            self.deadline_clock.text = ""
-
-        # location
-        self.y_pos = y_pos
-        self.pos_hint = {"x": 0.0, "top": y_pos}
-
-        self.update_position()
-
-        # logger
-        self.logger = logging.getLogger(f"Project-{self.name}")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
-
-        self.logger.info(f"created project")
-
-    def set_score(self, value: float):
-
-        self.value = value
-        self.score.text = str(self.value)
-
-    def update_priority(self, priority: int):
-
-        self.priority = priority
-        self.data["priority"] = priority
-
-    def update_position(self):
-
-        # update position
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
-        self.rank_pos.text = str(self.rank)
-
-        # time from creation
-        elapsed = time.time() - self.data["creation"]
-        timer = self.deadline - elapsed
-
-        # check #
-        # end
-        if elapsed >= self.deadline and IS_DEADLINE:
-            self.deadline_clock.text = "0h 0m"
-
-            self.label.color = (0.8, 0.2, 0.2, 1)
-            self.status.color = (0.8, 0.2, 0.2, 1)
-            self.score.color = (0.8, 0.2, 0.2, 1)
-            self.deadline_clock.color = (0.8, 0.2, 0.2, 1)
-
-            return
-
-        # going
-        if IS_DEADLINE:
-            self.deadline_clock.text = f"{timer // 3600 // 24:.0f}d {timer // 3600 % 25:.0f}h {timer // 60 % 60:.0f}m"
-
-    def update_project_data(self, updated_data: dict):
-
-        """update the owned project data from the project window
+            elif minitask.state == "completed":
+                self.add_widget(FinishedMiniTask(y_pos=0.9 - i * 0.1, record=minitask))
 
-        Parameters
-        ----------
-        updated_data : dict
-
-        Returns
-        -------
-        None
-        """
-
-        self.logger.info(f"updating project data")
-
-        self.data["current_minitasks"] = updated_data["current_minitasks"]
-        self.data["completed_minitasks"] = updated_data["completed_minitasks"]
-        self.data["rank"] = updated_data["rank"]
-        self.data["done"] = updated_data["done"]
-
-    def set_rank(self, rank: int):
-
-        self.rank = rank
-        self.data["rank"] = rank
-
-    def change_image(self, flag=" "):
-
-        if flag == " ":
-            self.job_icons_image.source = r"media/Job obj/job_icons_prj.png"
-
-        elif flag == "open":
-            self.job_icons_image.source = r"media/Job obj/job_icons_prj_open.png"
-            self.logger.info(f"open button project")
-
-        elif flag == "delete":
-            self.job_icons_image.source = r"media/Job obj/job_icons_prj_delete.png"
-            self.logger.info(f"delete button project")
-
-        elif flag == "done":
-            self.job_icons_image.source = r"media/Job obj/job_icons_prj_done.png"
-            self.logger.info(f"done button project")
-
-        elif flag == "edit":
-            self.job_icons_image.source = r"media/Job obj/job_icons_prj_edit.png"
-            self.logger.info(f"edit button project")
-
-
-class FinishedProject(FloatLayout):
-
-    def __init__(self, y_pos: float, priority: int, **kwargs):
-        super(FinishedProject, self).__init__(**kwargs)
-
-        # data
-        self.name = ""
-        self.data = {}
-        self.factual_priority = 0
-        self.priority = priority
-        self.rank = "#"
-        self.value = 0
-        self.deadline = 0  # fictional
-
-        self.type = "finished project"
-
-        # labels
-        if IS_DEADLINE:
-            self.deadline_clock.text = ""
-        self.label.text = self.name
-        self.score.text = str(self.factual_priority)
-        self.status.text = "completed"
-
-        # location
-        self.y_pos = y_pos
-        self.pos_hint = {"x": 0.0, "top": y_pos}
-
-        general_logger.info(f"created finished project '{self.name}'")
-
-    def set_rank(self, rank: int):
-
-        """
-        set the rank of the project
-
-        Parameters
-        ----------
-        rank : int
-        """
-
-        self.rank = rank
-        self.data["rank"] = rank
-
-    def update_position(self):
-
-        """
-        update the position of the project
-        """
-
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
-        self.rank_pos.text = str(self.rank)
-
-    def update_priority(self, priority: int):
-
-        """
-        update the priority of the project
-
-        Parameters
-        ----------
-        priority : int
-        """
-
-        self.priority = priority
-
-    def set_score(self, value: float):
-
-        """
-        set the score of the project
-
-        Parameters
-        ----------
-        value : float
-        """
-
-        self.value = value
-        self.score.text = str(self.value)
-
-    def set_record(self, record: dict):
-
-        """
-        set the record of the project
-
-        Parameters
-        ----------
-        record : dict
-            record of the project
-        """
-
-        self.data = record
-
-        # record
-        self.name = record["name"]
-        self.type = record["type"]
-        self.factual_priority = record["priority"]
-
-        # update description
-        if IS_DEADLINE:
-            self.deadline_clock.text = time.strftime(
-                "%H:%M:%S", time.localtime(record["creation"])
-            )
-        self.label.text = self.name
-
-        general_logger.debug(f"finished project '{self.name}' setting a record")
-
-    def change_image(self, flag=" "):
-
-        """
-        change the image of the project
-
-        Parameters
-        ----------
-        flag : str
-            flag to change the image
-        """
-
-        if flag == " ":
-            self.job_icons_image.source = r"media/Finished obj/finished_prj.png"
-
-        elif flag == "results":
-            self.job_icons_image.source = r"media/Finished obj/finished_prj_open.png"
-            general_logger(f"finished project '{self.name}' open button finished project")
-
-        elif flag == "delete":
-            self.job_icons_image.source = r"media/Finished obj/finished_prj_delete.png"
-            general_logger(f"finished project '{self.name}' delete button finished project")
+            else:
+                self.add_widget(MiniTask(y_pos=0.9 - i * 0.1, record=minitask))
 
 
 class MiniTask(FloatLayout):
 
-    def __init__(self, y_pos: float, data: dict, **kwargs):
+    """
+    view of a pending minitask of the project, with buttons
+    """
+
+    def __init__(self, y_pos: float, record: planner_core.MiniTask, **kwargs):
 
         """
         create a mini task
@@ -1794,113 +1171,52 @@ class MiniTask(FloatLayout):
         ----------
         y_pos : float
             y position of the mini task
-        data : dict
-            data of the mini task
+        record : planner_core.MiniTask
+            record of the mini task
         """
         super(MiniTask, self).__init__(**kwargs)
 
         # data
-        self.name = data["name"]
-        self.duration = data["duration"]
-        self.type = data["type"]
-        self.rank = data["rank"]
-
-        self.intervals = self.provide_focus_data()["intervals"]
-
-        self.state = "pending"
-
-        self.data = {
-            "name": self.name,
-            "type": self.type,
-            "rank": self.rank,
-            "next_window": "project_window",
-            "creation": time.time(),
-            "done": False,
-            "duration": self.duration,
-            "tot_focus": 0,
-            "tot_rest": 0,
-            "tot_idle": 0,
-        }
+        self.record = record
 
         # labels
-        self.label.text = self.name
+        self.label.text = record.name
         self.status.text = "new"
+        self.rank_pos.text = f"{record.rank}"
 
         # location
         self.y_pos = y_pos
         self.pos_hint = {"x": 0.0, "top": y_pos}
-        
-        # logger
-        self.logger = logging.getLogger(f"MiniTask-{self.name}")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
 
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
+    @property
+    def name(self):
 
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        return self.record.name
 
-        self.logger.info(f"created mini-task")
+    @property
+    def minitask_id(self):
 
-    def update_position(self):
+        return self.record.id
 
-        """
-        update the position of the mini task
-        """
+    @property
+    def rank(self):
 
-        # update position
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
+        return self.record.rank
 
-    def provide_focus_data(self):
+    @property
+    def data(self):
 
-        """
-        compute the intervals as focus-rest-focus-rest... from the total task duration
+        return self.record.data
 
-        Returns
-        -------
-        dict : intervals, type, rank, next_window
-        """
-
-        # base focus length = 20, rest = 5
-        nb_focus = [20] * (self.duration // 20) + [self.duration % 20]
-        return {
-            "intervals": list(array([[x] + [5] for x in nb_focus]).reshape(-1))[:-1],
-            "type": self.type,
-            "rank": self.rank,
-            "next_window": "project_window",
-        }
-
-    def set_rank(self, rank: int):
-
-        """
-        set the rank of the mini task
-
-        Parameters
-        ----------
-        rank : int
-        """
-
-        self.rank = rank
-        self.data["rank"] = rank
-        self.rank_pos.text = f"{rank}"
-
-    def start_task(self):
-
-        self.logger.info(f"starting mini-task")
-
-    def edit_task(self):
-
-        self.logger.info(f"editing mini-task")
-
-    def get_data(self):
+    def provide_focus_data(self):
 
         """
         Returns
         -------
-        dict : data of the mini task
+        dict : intervals, type, rank, next_window
         """
 
-        return self.data
+        return self.record.provide_focus_data(focus=FOCUSED_TIME, rest=REST_TIME)
 
     def change_image(self, flag=" "):
 
@@ -1913,31 +1229,31 @@ class MiniTask(FloatLayout):
         """
 
         if flag == " ":
-            self.minitask_icons_image.source = r"media/Mini task obj/minitask_icons.png"
+            self.minitask_icons_image.source = media_module.source(r"media/Mini task obj/minitask_icons.png")
 
         elif flag == "play":
             self.minitask_icons_image.source = (
-                r"media/Mini task obj/minitask_icons_play.png"
+                media_module.source(r"media/Mini task obj/minitask_icons_play.png")
             )
-            self.logger.info("play button pressed")
+            general_logger.info(f"mini-task '{self.name}' play button pressed")
 
         elif flag == "delete":
             self.minitask_icons_image.source = (
-                r"media/Mini task obj/minitask_icons_delete.png"
+                media_module.source(r"media/Mini task obj/minitask_icons_delete.png")
             )
-            self.logger.info("delete button pressed")
+            general_logger.info(f"mini-task '{self.name}' delete button pressed")
 
         elif flag == "done":
             self.minitask_icons_image.source = (
-                r"media/Mini task obj/minitask_icons_done.png"
+                media_module.source(r"media/Mini task obj/minitask_icons_done.png")
             )
-            self.logger.info("done button pressed")
+            general_logger.info(f"mini-task '{self.name}' done button pressed")
 
         elif flag == "edit":
             self.minitask_icons_image.source = (
-                r"media/Mini task obj/minitask_icons_edit.png"
+                media_module.source(r"media/Mini task obj/minitask_icons_edit.png")
             )
-            self.logger.info("edit button pressed")
+            general_logger.info(f"mini-task '{self.name}' edit button pressed")
 
 
 class NewMiniTask(Screen):
@@ -1951,14 +1267,7 @@ class NewMiniTask(Screen):
         self.app = ""
 
         # logger
-        self.logger = logging.getLogger(f"NewMiniTask")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("NewMiniTask")
 
     def on_enter(self, *args):
 
@@ -2100,30 +1409,30 @@ class NewMiniTask(Screen):
 
         if flag == " ":
             self.newminitask_window_image.source = (
-                r"media/NewJob window/newjob_window.png"
+                media_module.source(r"media/NewJob window/newjob_window.png")
             )
 
         elif flag == "check":
             self.newminitask_window_image.source = (
-                r"media/NewJob window/newjob_window_check.png"
+                media_module.source(r"media/NewJob window/newjob_window_check.png")
             )
             self.logger.info("check button pressed")
 
         elif flag == "clear":
             self.newminitask_window_image.source = (
-                r"media/NewJob window/newjob_window_clear.png"
+                media_module.source(r"media/NewJob window/newjob_window_clear.png")
             )
             self.logger.info("clear button pressed")
 
         elif flag == "submit":
             self.newminitask_window_image.source = (
-                r"media/NewJob window/newjob_window_submit.png"
+                media_module.source(r"media/NewJob window/newjob_window_submit.png")
             )
             self.logger.info("submit button pressed")
 
         elif flag == "return":
             self.newminitask_window_image.source = (
-                r"media/NewJob window/newjob_window_return.png"
+                media_module.source(r"media/NewJob window/newjob_window_return.png")
             )
             self.logger.info("return button pressed")
 
@@ -2140,94 +1449,137 @@ class NewMiniTask(Screen):
         self.duration.text = ""
 
         # buttons
-        self.newminitask_window_image.source = r"media/NewJob window/newjob_window.png"
+        self.newminitask_window_image.source = media_module.source(r"media/NewJob window/newjob_window.png")
 
 
 class FinishedMiniTask(FloatLayout):
 
-    """new task object, with buttons"""
+    """view of a completed minitask of the project, with buttons"""
+
+    def __init__(self, y_pos: float, record: planner_core.FinishedMiniTask, **kwargs):
+
+        """
+        Parameters
+        ----------
+        y_pos : float
+            y position of the task
+        record : planner_core.FinishedMiniTask
+            record of the task
+        """
+
+        super(FinishedMiniTask, self).__init__(**kwargs)
+
+        # data
+        self.record = record
+
+        # labels
+        self.label.text = record.name
+        self.status.text = "completed"
+        self.rank_pos.text = f"{record.rank}"
+
+        # location
+        self.y_pos = y_pos
+        self.pos_hint = {"x": 0.0, "top": y_pos}
+
+    @property
+    def name(self):
+
+        return self.record.name
+
+    @property
+    def minitask_id(self):
+
+        return self.record.id
+
+    @property
+    def rank(self):
+
+        return self.record.rank
+
+    @property
+    def data(self):
+
+        return self.record.data
 
-    def __init__(self, y_pos: float, rank: int, **kwargs):
+    def change_image(self, flag=" "):
 
         """
+        change the image of the window
+
         Parameters
         ----------
-        y_pos : float
-            y position of the task
-        rank : int
-            rank of the task
+        flag : str
+            flag to change the image
         """
 
-        super(FinishedMiniTask, self).__init__(**kwargs)
-
-        # data
-        self.name = ""
-        self.record = {}
-        self.rank = rank
-        self.type = ""
+        if flag == " ":
+            self.job_icons_image.source = media_module.source(r"media/Finished obj/finished_minitask.png")
 
-        self.data = {}
+        elif flag == "results":
+            self.job_icons_image.source = (
+                media_module.source(r"media/Finished obj/finished_minitask_results.png")
+            )
+            general_logger.info(f"finished mini-task '{self.name}' result button pressed")
 
-        # labels
-        self.label.text = self.name
-        self.status.text = "completed"
+        elif flag == "delete":
+            self.job_icons_image.source = (
+                media_module.source(r"media/Finished obj/finished_minitask_delete.png")
+            )
+            general_logger.info(f"finished mini-task '{self.name}' delete button pressed")
 
-        self.state = "completed"
 
-        # location
-        self.y_pos = y_pos
-        self.pos_hint = {"x": 0.0, "top": y_pos}
+class SubProject(FloatLayout):
 
-        general_logger.info(f"Finished MiniTask created")
+    """view of a sub-project of the project, with its progress"""
 
-    def set_rank(self, rank: int):
+    def __init__(self, y_pos: float, record: planner_core.SubProject, **kwargs):
 
         """
-        set the rank of the task
-
         Parameters
         ----------
-        rank : int
-            rank of the task
+        y_pos : float
+            y position of the sub-project
+        record : planner_core.SubProject
+            record of the sub-project
         """
 
-        self.rank = rank
-        self.rank_pos.text = f"{rank}"
+        super(SubProject, self).__init__(**kwargs)
 
-    def update_position(self):
+        # data
+        self.record = record
 
-        """
-        update the position of the task
-        """
+        # labels
+        self.label.text = record.name
+        self.status.text = f"{record.finished}/{record.total}"
+        self.rank_pos.text = f"{record.rank}"
 
-        self.pos_hint = {"x": 0.0, "top": self.y_pos}
+        if record.state == "completed":
+            for label in (self.label, self.status, self.rank_pos):
+                label.color = (0.1, 0.4, 0.1, 1)
 
-    def set_record(self, record: dict):
+        # location
+        self.y_pos = y_pos
+        self.pos_hint = {"x": 0.0, "top": y_pos}
 
-        """
-        set the record of the task
+    @property
+    def name(self):
 
-        Parameters
-        ----------
-        record : dict
-            record of the task
-        """
+        return self.record.name
 
-        self.data = record
+    @property
+    def minitask_id(self):
 
-        # record
-        self.name = record["name"]
-        self.type = record["type"]
+        return self.record.id
 
-        # update description
-        self.label.text = self.name
+    @property
+    def rank(self):
 
-        general_logger.info(f'Finished MiniTask "{self.name}" setting a record')
+        return self.record.rank
 
     def change_image(self, flag=" "):
 
         """
-        change the image of the window
+        change the image of the sub-project
 
         Parameters
         ----------
@@ -2236,19 +1588,15 @@ class FinishedMiniTask(FloatLayout):
         """
 
         if flag == " ":
-            self.job_icons_image.source = r"media/Finished obj/finished_minitask.png"
+            self.job_icons_image.source = media_module.source(r"media/Finished obj/finished_prj.png")
 
-        elif flag == "results":
-            self.job_icons_image.source = (
-                r"media/Finished obj/finished_minitask_results.png"
-            )
-            general_logger.info(f"finished mini-task '{self.name}' result button pressed")
+        elif flag == "open":
+            self.job_icons_image.source = media_module.source(r"media/Finished obj/finished_prj_open.png")
+            general_logger.info(f"sub-project '{self.name}' open button pressed")
 
         elif flag == "delete":
-            self.job_icons_image.source = (
-                r"media/Finished obj/finished_minitask_delete.png"
-            )
-            general_logger.info(f"finished mini-task '{self.name}' delete button pressed")
+            self.job_icons_image.source = media_module.source(r"media/Finished obj/finished_prj_delete.png")
+            general_logger.info(f"sub-project '{self.name}' delete button pressed")
 
 
 """ SESSION """
@@ -2260,45 +1608,33 @@ class IntervalHandler(Screen):
 
         super(IntervalHandler, self).__init__(**kwargs)
 
-        # about intervals
-        self.intervals = []
-        self.idx = 0
-        self.max_idx = 0
+        # intervals of the session and totals of the timers
+        self.plan = planner_engine.SessionPlan()
         self.current_timer = ""
 
-        self.names = ("focus_timer", "rest_timer")
-
-        # about results and interface
-        self.results = {
-            "tot_focus": 0,
-            "tot_rest": 0,
-            "tot_idle": 0,
-            "done": False,
-            "next_window": "activity_window",
-            "type": "session",
-            "rank": -1,
-        }
         self.data = {}
         self.app = ""
 
+    @property
+    def results(self):
+
+        """ totals of the session, updated by the timers """
+
+        return self.plan.results
+
     def on_enter(self, *args):
 
         print("\n--------- Interval Handler Window ---------")
 
     def load_data(self, data: dict):
 
-        # data
-        self.results["rank"] = data["rank"]
-        self.results["next_window"] = data["next_window"]
-        self.results["type"] = data["type"]
-
-        # intervals
-        self.intervals = data["intervals"]
-        self.idx = 0
-        self.max_idx = len(self.intervals)
+        self.plan.load(data=data)
 
         self.app = App.get_running_app()
-        print(f"\n% intervals loaded: {self.intervals} %")
+        print(f"\n% intervals loaded: {self.plan.intervals} %")
+
+        session_log.begin(id=self.plan.results["id"], type=self.plan.results["type"],
+                          intervals=[float(u) for u in self.plan.intervals])
 
         Window.size = (250, 200)
 
@@ -2306,28 +1642,27 @@ class IntervalHandler(Screen):
 
     def step(self):
 
+        next_interval = self.plan.next_interval()
+
         # finish
-        if self.idx == self.max_idx:
+        if next_interval is None:
 
-            self.results["done"] = True
             self.close()
 
             return
 
-        next_interval = self.intervals[self.idx]
+        kind, interval = next_interval
 
         # next interval
-        self.current_timer = self.names[int(self.idx % 2)]
+        self.current_timer = f"{kind}_timer"
         self.app.root.current = self.current_timer
         self.app.root.transition.direction = "left"
-        if self.idx == 0:
+        if self.plan.idx == 1:
             self.app.root.current_screen.load_interval(
-                interval=next_interval, ongoing=False
+                interval=interval, ongoing=False
             )
         else:
-            self.app.root.current_screen.load_interval(interval=next_interval)
-
-        self.idx += 1
+            self.app.root.current_screen.load_interval(interval=interval)
 
     def get_results(self, results: tuple):
 
@@ -2337,13 +1672,19 @@ class IntervalHandler(Screen):
 
         names, durations = results
 
-        for name, duration in zip(names, durations):
-            self.results[f"tot_{name}"] += duration
+        self.plan.record(names=names, durations=durations)
+
+        # the interval as run, for the analytics
+        kind, interval = self.plan.current
+        session_log.record("interval", kind=kind, planned=60 * float(interval), job=self.results["id"],
+                           **{name: int(duration) for name, duration in zip(names, durations)})
 
     def close(self):
 
         print("\nsession finished, results: ", self.results)
 
+        session_log.end(**{key: self.results[key] for key in ("done", "tot_focus", "tot_rest", "tot_idle")})
+
         # return
         self.app.root.current = "results_window"
         self.app.root.transition.direction = "left"
@@ -2356,22 +1697,9 @@ class IntervalHandler(Screen):
 
     def reset(self):
 
-        # about intervals
-        self.intervals = []
-        self.idx = 0
-        self.max_idx = 0
+        self.plan.reset()
         self.current_timer = ""
 
-        self.names = ("focus_timer", "rest_timer")
-
-        # about results and interface
-        self.results = {
-            "tot_focus": 0,
-            "tot_rest": 0,
-            "tot_idle": 0,
-            "done": False,
-            "next_window": "activity_window",
-        }
         self.data = {}
 
 
@@ -2421,12 +1749,13 @@ class NewSessionWindow(Screen):
 
         # focus interval
         try:
-            _ = int(self.focus_interval.text)
+            if int(self.focus_interval.text) <= 0:
+                raise ValueError
             triple_check += 1
 
         except ValueError:
             print(
-                f'\n!Error: "{self.focus_interval.text}" for the focus interval is not an integer'
+                f'\n!Error: "{self.focus_interval.text}" for the focus interval is not a positive integer'
             )
             self.focus_interval.text = ""
 
@@ -2470,12 +1799,10 @@ class NewSessionWindow(Screen):
 
         # calculate intervals
         nb_intervals = int(self.repetition.text)
-        self.settings["intervals"] = array(
-            [
-                [int(self.focus_interval.text)] + [int(self.rest_interval.text)]
-                for _ in range(nb_intervals)
-            ]
-        ).reshape(-1)[:-1]
+        focus = int(self.focus_interval.text)
+        self.settings["intervals"] = planner_core.interval_plan(
+            duration=nb_intervals * focus, focus=focus, rest=int(self.rest_interval.text)
+        )
 
         print("\nsession settings saved:\n", self.settings)
 
@@ -2491,15 +1818,20 @@ class FocusTimer(Screen):
 
         self.interval = 0  # how long is this interval
         self.duration = 0  # how long it has run so far
-        self.state = "paused"  # state: finished, running, paused
-        self.start_time = 0.0  # time at which it started
-        self.checkpoint = 0.0  # paused time
 
-        self.current_time = [0, 0]
+        self.timer = timer_module.TimerEngine(scheduler=Clock.schedule_once,
+                                               recorder=session_log.recorder("focus"))
+        self.timer.subscribe(self.ticking)
 
-        self.job = 0
         self.app = ""
 
+    @property
+    def state(self):
+
+        """ state: finished, running, paused """
+
+        return self.timer.state
+
     def on_enter(self, *args):
 
         print("\n--------- Focus Timer Window ---------")
@@ -2515,31 +1847,18 @@ class FocusTimer(Screen):
 
         # load
         self.interval = interval * 60
-        self.checkpoint = interval * 60
-        self.current_time = [interval, 0]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
+        self.timer.load(duration=self.interval, running=ongoing)
+        self.display.text = self.timer.display()
 
         self.app = App.get_running_app()
 
         if ongoing:
-
             print("\nfocus ongoing")
-
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
-
         else:
             print("\nfocus waiting to start")
 
-            # new state
-            self.state = "paused"
-
         print(
-            "\n% focus interval loaded: ", self.current_time, f" [{self.interval}s] %"
+            "\n% focus interval loaded: ", self.display.text, f" [{self.interval}s] %"
         )
 
     def update(self):
@@ -2549,56 +1868,31 @@ class FocusTimer(Screen):
 
             print("\nfocus #play")
 
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
+            self.timer.start()
 
             # change button name to pause
-            self.focus_timer_image.source = r"media/Focus session/focus_go.png"
+            self.focus_timer_image.source = media_module.source(r"media/Focus session/focus_go.png")
 
         # running + pause button : pause
         elif self.state == "running":
 
             print("\nfocus #pause")
 
-            # stop clock
-            self.job.cancel()
-
-            # new state
-            self.state = "paused"
-
-            # checkpoint
-            self.checkpoint = self.current_time[0] * 60 + self.current_time[1]
+            self.timer.pause()
 
             # track interval run
             self.tracking()
 
-    def ticking(self, *args):
-
-        elapsed = int(self.checkpoint - (time.time() - self.start_time))
-        self.current_time[1] = int(elapsed % 60)
-        self.current_time[0] = int(elapsed // 60)
+    def ticking(self, timer):
 
-        if elapsed <= 0:
+        self.display.text = timer.display()
 
-            # cancel
-            self.job.cancel()
+        if timer.state == "finished":
 
             # record
             self.tracking()
 
-            #
-            self.display.text = "00:00"
-            self.state = "finished"
-            Clock.usleep(10000)
-
             self.close()
-            return
-
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
 
     def change_image(self, flag=" ", pressed=False):
 
@@ -2606,56 +1900,52 @@ class FocusTimer(Screen):
 
             # stop
             if flag == " " and self.state == "running":
-                self.focus_timer_image.source = r"media/Focus session/focus_go_stop.png"
+                self.focus_timer_image.source = media_module.source(r"media/Focus session/focus_go_stop.png")
 
             elif flag == "next" and self.state == "running":
-                self.focus_timer_image.source = r"media/Focus session/focus_go_next.png"
+                self.focus_timer_image.source = media_module.source(r"media/Focus session/focus_go_next.png")
 
             elif flag == "reset" and self.state == "running":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_go_reset.png"
+                    media_module.source(r"media/Focus session/focus_go_reset.png")
                 )
 
             elif flag == "return" and self.state == "running":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_go_return.png"
+                    media_module.source(r"media/Focus session/focus_go_return.png")
                 )
 
             # play
             elif flag == " " and self.state == "paused":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_nogo_play.png"
+                    media_module.source(r"media/Focus session/focus_nogo_play.png")
                 )
 
             elif flag == "next" and self.state == "paused":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_nogo_next.png"
+                    media_module.source(r"media/Focus session/focus_nogo_next.png")
                 )
 
             elif flag == "reset" and self.state == "paused":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_nogo_reset.png"
+                    media_module.source(r"media/Focus session/focus_nogo_reset.png")
                 )
 
             elif flag == "return" and self.state == "paused":
                 self.focus_timer_image.source = (
-                    r"media/Focus session/focus_nogo_return.png"
+                    media_module.source(r"media/Focus session/focus_nogo_return.png")
                 )
 
         else:
             if self.state == "running":
-                self.focus_timer_image.source = r"media/Focus session/focus_go.png"
+                self.focus_timer_image.source = media_module.source(r"media/Focus session/focus_go.png")
 
             elif self.state == "paused":
-                self.focus_timer_image.source = r"media/Focus session/focus_nogo.png"
+                self.focus_timer_image.source = media_module.source(r"media/Focus session/focus_nogo.png")
 
     def tracking(self):
 
-        self.duration = int(time.time() - self.start_time)
-
-        # control for absurd time difference, usually when the timer isn't event started
-        if self.duration > 24 * 60 * 60:
-            self.duration = 0
+        self.duration = int(self.timer.elapsed())
 
         print("tracked: ", self.duration, "s")
 
@@ -2663,21 +1953,12 @@ class FocusTimer(Screen):
 
         print("\nfocus #close")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
 
         # next
-        """self.app.root.current = "interval_handler"
-        self.app.root.transition.direction = 'right'
-        self.app.root.current_screen.get_results(results=self.get_results())
-        self.app.root.current_screen.step()"""
-
         self.app.root.current = "extra_focus_timer"
         self.app.root.transition.direction = "left"
         self.app.root.current_screen.load_results(results=self.get_results())
@@ -2690,36 +1971,22 @@ class FocusTimer(Screen):
 
         print("\nfocus #reset")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
+        if self.state == "finished":
             warnings.warn("timer already reset")
             return
 
-        Clock.usleep(1000)
-
         # record
         self.tracking()
 
         # reset values to original
-        self.checkpoint = self.interval
-        self.current_time = [int(self.interval // 60), int(self.interval % 60)]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
-        # restart
-        self.start_time = time.time()
-        self.job = Clock.schedule_interval(self.ticking, 0.5)
+        self.timer.reset()
+        self.display.text = self.timer.display()
 
     def quit(self):
 
         print("\nfocus #quit")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -2737,13 +2004,7 @@ class FocusTimer(Screen):
         # reset
         self.interval = 0  # how long is this interval
         self.duration = 0  # how long it has run so far
-        self.state = "finished"  # state: finished, running, paused
-        self.start_time = 0.0  # time at which it started
-        self.checkpoint = 0.0  # paused time
-
-        self.current_time = [0, 0]
-
-        self.job = ""
+        self.timer.stop()
 
         self.display.text = "00:00"
 
@@ -2760,11 +2021,11 @@ class RestTimer(Screen):
 
         self.interval = 0  # how long is this interval
         self.duration = 0  # how long it has run so far
-        self.start_time = 0.0  # time at which it started
 
-        self.current_time = [0, 0]
+        self.timer = timer_module.TimerEngine(scheduler=Clock.schedule_once,
+                                               recorder=session_log.recorder("rest"))
+        self.timer.subscribe(self.ticking)
 
-        self.job = 0
         self.app = ""
 
     def on_enter(self, *args):
@@ -2775,63 +2036,48 @@ class RestTimer(Screen):
 
         """
         load the interval
-        :param interval: seconds
+        :param interval: minutes
         :return: saved values
         """
 
         # update
         self.interval = interval * 60
-        self.current_time = [interval, 0]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
-        self.start_time = time.time()
-        self.job = Clock.schedule_interval(self.ticking, 0.5)
+        self.timer.load(duration=self.interval, running=True)
+        self.display.text = self.timer.display()
 
         self.app = App.get_running_app()
-        print("\n% rest interval loaded: ", self.current_time, f" [{self.interval}s] %")
-
-    def ticking(self, *args):
+        print("\n% rest interval loaded: ", self.display.text, f" [{self.interval}s] %")
 
-        elapsed = int(self.interval - (time.time() - self.start_time))
-        self.current_time[1] = int(elapsed % 60)
-        self.current_time[0] = int(elapsed // 60)
+    def ticking(self, timer):
 
-        if elapsed <= 0:
+        self.display.text = timer.display()
 
-            # cancel
-            self.job.cancel()
+        if timer.state == "finished":
 
             # record
             self.tracking()
 
-            #
-            self.display.text = "00:00"
-            Clock.usleep(10000)
-
             self.close()
-            return
-
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
 
     def change_image(self, flag=" ", pressed=False):
 
         if pressed:
 
             if flag == "next":
-                self.rest_timer_image.source = r"media/Focus session/rest_next.png"
+                self.rest_timer_image.source = media_module.source(r"media/Focus session/rest_next.png")
 
             elif flag == "reset":
-                self.rest_timer_image.source = r"media/Focus session/rest_reset.png"
+                self.rest_timer_image.source = media_module.source(r"media/Focus session/rest_reset.png")
 
             elif flag == "return":
-                self.rest_timer_image.source = r"media/Focus session/rest_return.png"
+                self.rest_timer_image.source = media_module.source(r"media/Focus session/rest_return.png")
 
         else:
-            self.rest_timer_image.source = r"media/Focus session/rest.png"
+            self.rest_timer_image.source = media_module.source(r"media/Focus session/rest.png")
 
     def tracking(self):
 
-        self.duration = int(time.time() - self.start_time)
+        self.duration = int(self.timer.elapsed())
         print(f"tracked: {self.duration}s")
 
     def reset(self):
@@ -2839,30 +2085,18 @@ class RestTimer(Screen):
 
         print("\nrest #reset")
 
-        # cancel
-        self.job.cancel()
-        Clock.usleep(1000)
-
         # record
         self.tracking()
 
         # reset values to original
-        self.current_time = [int(self.interval // 60), int(self.interval % 60)]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
-        # restart
-        self.start_time = time.time()
-        self.job = Clock.schedule_interval(self.ticking, 0.5)
+        self.timer.reset()
+        self.display.text = self.timer.display()
 
     def close(self):
 
         print("\nrest #close")
 
-        # cancels
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -2878,11 +2112,7 @@ class RestTimer(Screen):
 
         print("\nrest #quit")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -2900,11 +2130,7 @@ class RestTimer(Screen):
         # reset
         self.interval = 0  # how long is this interval
         self.duration = 0  # how long it has run so far
-        self.start_time = 0.0  # time at which it started
-
-        self.current_time = [0, 0]
-
-        self.job = 0
+        self.timer.stop()
 
         self.display.text = "00:00"
 
@@ -2913,11 +2139,11 @@ class IdleTimer(Screen):
     def __init__(self, **kwargs):
         super(IdleTimer, self).__init__(**kwargs)
 
-        self.interval = 0  # how long is this interval
-        self.start_time = 0.0  # time at which it started
-        self.current_time = [0, 0]
+        # stopwatch
+        self.timer = timer_module.TimerEngine(scheduler=Clock.schedule_once,
+                                               recorder=session_log.recorder("idle"))
+        self.timer.subscribe(self.ticking)
 
-        self.job = 0
         self.app = ""
 
         self.durations = [0, 0]
@@ -2931,9 +2157,8 @@ class IdleTimer(Screen):
         # record previous rest duration
         self.durations[0] = rest_duration
 
-        self.start_time = time.time()
-        self.job = Clock.schedule_interval(self.ticking, 0.5)
-        self.display.text = "00:00"
+        self.timer.load(duration=None, running=True)
+        self.display.text = self.timer.display()
 
         self.app = App.get_running_app()
 
@@ -2942,38 +2167,30 @@ class IdleTimer(Screen):
         if pressed:
 
             if flag == "next":
-                self.idle_timer_image.source = r"media/Focus session/idle_next.png"
+                self.idle_timer_image.source = media_module.source(r"media/Focus session/idle_next.png")
 
             elif flag == "done":
-                self.idle_timer_image.source = r"media/Focus session/idle_done.png"
+                self.idle_timer_image.source = media_module.source(r"media/Focus session/idle_done.png")
 
             elif flag == "return":
-                self.idle_timer_image.source = r"media/Focus session/idle_return.png"
+                self.idle_timer_image.source = media_module.source(r"media/Focus session/idle_return.png")
 
         else:
-            self.idle_timer_image.source = r"media/Focus session/idle.png"
-
-    def ticking(self, *args):
+            self.idle_timer_image.source = media_module.source(r"media/Focus session/idle.png")
 
-        elapsed = int(time.time() - self.start_time)
-        self.current_time[1] = elapsed % 60
-        self.current_time[0] = elapsed // 60
+    def ticking(self, timer):
 
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
+        self.display.text = timer.display()
 
     def tracking(self):
 
-        self.durations[1] += int(time.time() - self.start_time)
+        self.durations[1] += int(self.timer.elapsed())
 
     def close(self):
 
         print("\nidle #close")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -2988,11 +2205,7 @@ class IdleTimer(Screen):
 
     def quit(self, completed=False):
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -3010,12 +2223,8 @@ class IdleTimer(Screen):
     def total_reset(self):
 
         # reset
-        self.interval = 0  # how long is this interval
         self.durations = [0, 0]  # how long it has run so far
-        self.start_time = 0.0  # time at which it started
-        self.current_time = [0, 0]
-
-        self.job = 0
+        self.timer.load(duration=None)
 
         self.display.text = "00:00"
 
@@ -3185,12 +2394,22 @@ class GeneralSettings(Screen):
         if validity == 2:
 
             self.saved = True
+
+            # the interval plans of the previous lengths are not used anymore
+            if (FOCUSED_TIME, REST_TIME) != (self.focused_time, self.rest_time):
+                planner_core.interval_plan.cache_clear()
+
             FOCUSED_TIME = self.focused_time
             REST_TIME = self.rest_time
 
             self.save_button.color = (0.1, 0.9, 0.1, 1)
             general_logger.info(f"General settings saved: {FOCUSED_TIME} - {REST_TIME}")
 
+            cache_module_obj.append_record(
+                op="settings",
+                settings={"FOCUSED_TIME": FOCUSED_TIME, "REST_TIME": REST_TIME},
+            )
+
         else:
             self.save_button.color = (0.3, 0.1, 0.1, 1)
 
@@ -3282,16 +2501,16 @@ class SimpleTimerSetting(Screen):
 
         if pressed:
             self.timer_setting_image.source = (
-                r"media/Timer window/timer_settings_return.png"
+                media_module.source(r"media/Timer window/timer_settings_return.png")
             )
 
         else:
-            self.timer_setting_image.source = r"media/Timer window/timer_settings.png"
+            self.timer_setting_image.source = media_module.source(r"media/Timer window/timer_settings.png")
 
     def quit(self):
 
         Window.size = (700, 500)
-        self.timer_setting_image.source = r"media/Timer window/timer_settings.png"
+        self.timer_setting_image.source = media_module.source(r"media/Timer window/timer_settings.png")
 
 
 class SimpleTimer(Screen):
@@ -3301,15 +2520,20 @@ class SimpleTimer(Screen):
 
         self.tot_duration = 0
         self.duration = 0  # how long it has run so far
-        self.state = "running"  # state: finished, running, paused
-        self.start_time = 0.0  # time at which it started
-        self.checkpoint = 0.0  # paused time
 
-        self.current_time = [0, 0]
+        self.timer = timer_module.TimerEngine(scheduler=Clock.schedule_once,
+                                               recorder=session_log.recorder("simple"))
+        self.timer.subscribe(self.ticking)
 
-        self.job = 0
         self.app = ""
 
+    @property
+    def state(self):
+
+        """ state: finished, running, paused """
+
+        return self.timer.state
+
     def on_enter(self, *args):
 
         print("\n--------- Focus Timer Window ---------")
@@ -3340,38 +2564,19 @@ class SimpleTimer(Screen):
         duration = timer_cache['duration']
         ongoing = True  # <--------------------------- ugly
         self.tot_duration = duration * 60
-        self.checkpoint = duration * 60
-        self.current_time = [duration, 0]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
+        self.timer.load(duration=self.tot_duration, running=ongoing)
+        self.display.text = self.timer.display()
 
         self.app = App.get_running_app()
 
         if ongoing:
-
             print("\ntimer ongoing")
-
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/pause_iconG.png"
-
         else:
             print("\nfocus waiting to start")
 
-            # new state
-            self.state = "paused"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/play_iconG.png"
-
         print(
             "\n% timer interval loaded: ",
-            self.current_time,
+            self.display.text,
             f" [{duration*60}s] % ",
             self.state,
         )
@@ -3383,67 +2588,32 @@ class SimpleTimer(Screen):
 
             print("\nfocus #play")
 
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/pause_iconG.png"
+            self.timer.start()
 
         # running + pause button : pause
         elif self.state == "running":
 
             print("\nfocus #pause")
 
-            # stop clock
-            self.job.cancel()
-
-            # new state
-            self.state = "paused"
-
-            # checkpoint
-            self.checkpoint = self.current_time[0] * 60 + self.current_time[1]
-
-            # change button name to play
-            # self.play_pause_icon.source = "media/play_iconG.png"
+            self.timer.pause()
 
             # track interval run
             self.tracking()
 
-    def ticking(self, *args):
-
-        elapsed = int(self.checkpoint - (time.time() - self.start_time))
-        self.current_time[1] = int(elapsed % 60)
-        self.current_time[0] = int(elapsed // 60)
+    def ticking(self, timer):
 
-        if elapsed <= 0:
+        self.display.text = timer.display()
 
-            # cancel
-            self.job.cancel()
+        if timer.state == "finished":
 
             # record
             self.tracking()
 
-            #
-            self.display.text = "00:00"
-            self.state = "finished"
-            Clock.usleep(10000)
-
             self.close()
-            return
-
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
 
     def tracking(self):
 
-        self.duration = int(time.time() - self.start_time)
-
-        # control for absurd time difference, usually when the timer isn't event started
-        if self.duration > 24 * 60 * 60:
-            self.duration = 0
+        self.duration = int(self.timer.elapsed())
 
         print("tracked: ", self.duration, "s")
 
@@ -3451,17 +2621,12 @@ class SimpleTimer(Screen):
 
         print("\ntimer #close")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
 
         # next
-
         self.app.root.current = "extra_simple_timer"
         self.app.root.transition.direction = "left"
 
@@ -3473,33 +2638,19 @@ class SimpleTimer(Screen):
 
         print("\nfocus #reset ", self.state)
 
-        # cancel
-        self.job.cancel()
-
-        Clock.usleep(1000)
-
-        # reset values to original
-        self.checkpoint = self.tot_duration
-        self.current_time = [int(self.tot_duration // 60), int(self.tot_duration % 60)]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
         # record
         if self.state == "running":
             self.tracking()
 
-            # restart
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
+        # reset values to original
+        self.timer.reset()
+        self.display.text = self.timer.display()
 
     def quit(self):
 
         print("\ntimer #quit")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
 
         # record
         self.tracking()
@@ -3518,55 +2669,49 @@ class SimpleTimer(Screen):
 
         # running -> stopped
         if flag == "" and self.state == "running" and not pressed:
-            self.timer_image.source = r"media/Timer window/timer_nogo.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo.png")
 
         # pressed running -> stopped
         elif flag == "" and self.state == "running" and pressed:
-            self.timer_image.source = r"media/Timer window/timer_go_stop.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_stop.png")
 
         # stopped -> running
         elif flag == "" and self.state == "paused" and not pressed:
-            self.timer_image.source = r"media/Timer window/timer_go.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go.png")
 
         # pressed stopped -> running
         elif flag == "" and self.state == "paused" and pressed:
-            self.timer_image.source = r"media/Timer window/timer_nogo_play.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_play.png")
 
         # pressed running reset
         elif flag == "reset" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go_reset.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_reset.png")
 
         # pressed running return
         elif flag == "return" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go_return.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_return.png")
 
         # pressed stopped reset
         elif flag == "reset" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo_reset.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_reset.png")
 
         # pressed stopped return
         elif flag == "return" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo_return.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_return.png")
 
         # void
         elif flag == "void" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go.png")
 
         elif flag == "void" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo.png")
 
     def total_reset(self):
 
         # reset
         self.tot_duration = 0  # how long is this interval
         self.duration = 0  # how long it has run so far
-        self.state = "finished"  # state: finished, running, paused
-        self.start_time = 0.0  # time at which it started
-        self.checkpoint = 0.0  # paused time
-
-        self.current_time = [0, 0]
-
-        self.job = ""
+        self.timer.stop()
 
         self.display.text = "00:00"
 
@@ -3620,14 +2765,7 @@ class Routines(Screen):
         self.minutes = 0.
 
         # logger
-        self.logger = logging.getLogger("Routines")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("Routines")
 
     def on_enter(self, *args):
 
@@ -3658,13 +2796,12 @@ class Routines(Screen):
         # convert to minutes 
         minutes = delta.seconds // 60
 
-        # save in cache
-        cache_module_obj.save_timer_cache(timer_cache={'duration': minutes,
-                                                       'direct': True})
+        # hand to the timer, delivered as soon as it connects
+        timer_server.send("start", duration=minutes, direct=True, sent=time.time())
 
         # start timer 
         self.logger.info(f"end of work-day timer initiated - {minutes//60:02d}h {minutes%60:02d}m")
-        os.system(f"./timer_window_run.sh")
+        launch_timer_worker()
 
     def clean_cache(self):
 
@@ -3684,14 +2821,7 @@ class RoutineWindow(Screen):
         self.minutes = 0.
 
         # logger
-        self.logger = logging.getLogger("Routines")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("Routines")
 
     def on_enter(self, *args):
 
@@ -3721,12 +2851,12 @@ class RoutineWindow(Screen):
         # convert to minutes 
         minutes = delta.seconds // 60
 
-        # save in cache
-        cache_module_obj.save_timer_cache(timer_cache={'duration': minutes})
+        # hand to the timer, delivered as soon as it connects
+        timer_server.send("start", duration=minutes, direct=True, sent=time.time())
 
         # start timer 
         self.logger.info(f"end of work-day timer initiated - minutes: {minutes//60:02d}:{minutes%60:02d}")
-        os.system(f"./timer_window_run.sh")
+        launch_timer_worker()
 
     def clean_cache(self):
 
@@ -3741,18 +2871,10 @@ class ActivityWindow(Screen):
     def __init__(self, **kwargs):
         super(ActivityWindow, self).__init__(**kwargs)
 
-        self.clock = 0
         self.app = ""
 
         # logger
-        self.logger = logging.getLogger("ActivityWindow")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("ActivityWindow")
 
     def on_enter(self):
 
@@ -3760,15 +2882,18 @@ class ActivityWindow(Screen):
         Window.size = (700, 500)
 
         self.app = App.get_running_app()
-        self.clock = Clock.schedule_interval(self.ticking, 1)
+
+        self.ticking()
+        tick_hub.subscribe(self.ticking, rate=1)
+
+        # live state of the detached timer
+        self.show_timer(timer_server.progress)
+        timer_server.subscribe(self.show_timer)
 
     def on_leave(self):
 
-        # cancel
-        try:
-            self.clock.cancel()
-        except AttributeError:
-            pass
+        tick_hub.unsubscribe(self.ticking)
+        timer_server.unsubscribe(self.show_timer)
 
         self.logger.info("ActivityWindow left")
 
@@ -3782,27 +2907,27 @@ class ActivityWindow(Screen):
         """
 
         if name == "close":
-            self.main_image.source = "media/main_screen/main_screen_close.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_close.png")
             self.logger.info("close button pressed")
 
         elif name == "focus":
-            self.main_image.source = "media/main_screen/main_screen_focus.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_focus.png")
             self.logger.info("focus button pressed")
 
         elif name == "schedule":
-            self.main_image.source = "media/main_screen/main_screen_schedule.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_schedule.png")
             self.logger.info("schedule button pressed")
 
         elif name == "settings":
-            self.main_image.source = "media/main_screen/main_screen_settings.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_settings.png")
             self.logger.info("settings button pressed")
 
         elif name == "timer":
-            self.main_image.source = "media/main_screen/main_screen_timer.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_timer.png")
             self.logger.info("timer button pressed")
 
         elif name == "star":
-            self.main_image.source = "media/main_screen/main_screen_star.png"
+            self.main_image.source = media_module.source("media/main_screen/main_screen_star.png")
             self.logger.info("star button pressed")
 
         elif name == "clock":
@@ -3819,12 +2944,12 @@ class ActivityWindow(Screen):
 
         self.logger.info(f"button {name} released")
 
-        self.main_image.source = r"media/Activity window/activity_window.png"
+        self.main_image.source = media_module.source(r"media/Activity window/activity_window.png")
 
         if name == "timer":
             if cache_module.OS:  # unix
-                #os.system(f"./timer_window_run.sh")
-                os.system(f"tmux split-window -h 'python timer_window.py'")
+                timer_server.send("show", sent=time.time())
+                launch_timer_worker()
                 self.logger.info("timer window opened")
             else:
                 self.logger.error("windows not supported yet")
@@ -3849,6 +2974,29 @@ class ActivityWindow(Screen):
         now = time.localtime()
         self.clock_display.text = f"{now.tm_hour:02d}:{now.tm_min:02d}"
 
+    def show_timer(self, progress):
+
+        """
+        display the countdown of the detached timer
+
+        Parameters
+        ----------
+        progress : dict
+            last progress message of the timer, None without a timer
+
+        Returns
+        -------
+        None
+        """
+
+        if progress is None or progress["state"] == "finished":
+            self.timer_display.text = ""
+            return
+
+        seconds = int(math.ceil(progress["remaining"]))
+        paused = " (paused)" * (progress["state"] == "paused")
+        self.timer_display.text = f"timer {seconds // 60:02d}:{seconds % 60:02d}{paused}"
+
 
 class ScheduleWindow(Screen):
 
@@ -3863,19 +3011,11 @@ class ScheduleWindow(Screen):
         self.current_tasks = []
         self.current_popup = ""
         self.app = ""
-        self.clock = 0
 
         self.entered_count = 0
 
         # logger
-        self.logger = logging.getLogger("ScheduleWindow")
-        self.logger.setLevel(logging.DEBUG)
-        stdout = logging.StreamHandler(stream=sys.stdout)
-
-        fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-
-        stdout.setFormatter(fmt)
-        self.logger.addHandler(stdout)
+        self.logger = log_module.get_logger("ScheduleWindow")
 
     def on_enter(self):
 
@@ -3888,11 +3028,16 @@ class ScheduleWindow(Screen):
         if self.entered_count <= 1:
             self.app.root.current_screen.jobs_manager.app = self.app
             self.app.root.current_screen.jobs_manager.load_pending()
-        
-        self.clock = Clock.schedule_interval(self.ticking, 1)
+
+        self.ticking()
+        tick_hub.subscribe(self.ticking, rate=1)
+        tick_hub.subscribe(self.jobs_manager.tick, rate=5)
 
     def on_leave(self):
 
+        tick_hub.unsubscribe(self.ticking)
+        tick_hub.unsubscribe(self.jobs_manager.tick)
+
         self.logger.info("ScheduleWindow left")
 
     def save_task(self):
@@ -3903,22 +3048,22 @@ class ScheduleWindow(Screen):
 
         if flag == " ":
             self.schedule_window_image.source = (
-                r"media/Schedule window/schedule_window.png"
+                media_module.source(r"media/Schedule window/schedule_window.png")
             )
 
         elif flag == "add":
             self.schedule_window_image.source = (
-                r"media/Schedule window/schedule_window_add.png"
+                media_module.source(r"media/Schedule window/schedule_window_add.png")
             )
 
         elif flag == "save":
             self.schedule_window_image.source = (
-                r"media/Schedule window/schedule_window:save.png"
+                media_module.source(r"media/Schedule window/schedule_window:save.png")
             )
 
         elif flag == "return":
             self.schedule_window_image.source = (
-                r"media/Schedule window/schedule_window_return.png"
+                media_module.source(r"media/Schedule window/schedule_window_return.png")
             )
 
         else:
@@ -3939,19 +3084,100 @@ class ScheduleWindow(Screen):
 
 
 class WindowManager(ScreenManager):
+
+    """
+    manager of the windows of the app, only the activity window is built at launch
+    and the others the first time they are navigated to
+    """
+
+    # windows built on demand, by name
+    lazy_windows = {
+        "schedule_window": ScheduleWindow,
+        "newsession_window": NewSessionWindow,
+        "interval_handler": IntervalHandler,
+        "results_window": ResultsWindow,
+        "focus_timer": FocusTimer,
+        "rest_timer": RestTimer,
+        "idle_timer": IdleTimer,
+        "extra_focus_timer": ExtraFocusTimer,
+        "new_job_window": NewJob,
+        "project_window": ProjectWindow,
+        "new_mini_task_window": NewMiniTask,
+        "general_settings": GeneralSettings,
+        "simple_timer_setting": SimpleTimerSetting,
+        "simple_timer": SimpleTimer,
+        "extra_simple_timer": ExtraSimpleTimer,
+        "routine_window": RoutineWindow,
+    }
+
+    def get_screen(self, name: str):
+
+        """
+        Parameters
+        ----------
+        name : str
+            name of the window
+
+        Returns
+        -------
+        Screen : the window, built if it is the first time
+        """
+
+        if name in self.lazy_windows and not self.has_screen(name):
+
+            start = time.perf_counter()
+            self.add_widget(self.lazy_windows[name]())
+
+            general_logger.debug(f"{name} built in {1000 * (time.perf_counter() - start):.1f}ms")
+
+        return super(WindowManager, self).get_screen(name)
+
     def on_resize(self):
 
         pass
 
 
-kv1 = Builder.load_file("planner.kv")
+# rules of the windows, built by the WindowManager
+Builder.load_file("planner.kv")
 
 Window.size = (700, 500)
 
 
 class PlannerApp(App):
+
     def build(self):
-        return kv1
+
+        Window.bind(on_flip=self.first_frame)
+
+        # the detached timer connects to the planner
+        timer_server.listen()
+
+        return WindowManager()
+
+    def on_stop(self):
+
+        # the worker quits when the channel closes
+        timer_server.close()
+
+        session_log.close()
+
+    def first_frame(self, *args):
+
+        """ report the time to the first frame, since the launch """
+
+        Window.unbind(on_flip=self.first_frame)
+
+        general_logger.info(f"first frame after {1000 * (time.perf_counter() - LAUNCH_TIME):.0f}ms")
+
+        # button images, once the first frame is on screen
+        Clock.schedule_once(lambda dt: media_module.preload())
+
+        # events of a timer process that ran without the planner
+        Clock.schedule_once(lambda dt: session_log.adopt())
+
+        # warm timer process, ready before the first timer is requested
+        if cache_module.OS:  # unix
+            Clock.schedule_once(lambda dt: launch_timer_worker())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import threading
+
+import log_module
+import cache_module
+
+
+""" SESSION LOG
+
+append-only stream of the events of the timers and of the focus sessions, one
+compact JSON object per line in the cache folder:
+
+    {"event": "pause", "timer": "focus", "mono": 5123.402, "wall": 1760000000.118,
+     "run": "9f1c...", "session": "e41a...", "elapsed": 734.2, "duration": 1800}
+
+`mono` is the monotonic clock, comparable between the events of a same `run` (a
+process), and `wall` the time of day. The events are queued by the UI thread
+and written by a background thread, the timers never wait on the disk. A single
+process writes the log: the timer process sends its events to the planner over
+the timer channel, and only writes its own log when launched without it. The
+planner moves that log into its own at startup
+"""
+
+# general logger
+logger = log_module.get_logger("SessionLogs")
+
+LOG_PATH = f"{cache_module.CACHE_PATH}{cache_module.split}sessions.log"
+
+# log of a timer process launched without the planner
+TIMER_LOG_PATH = f"{cache_module.CACHE_PATH}{cache_module.split}sessions_timer.log"
+
+# events of a focus session, the timer events are timer_module.EVENTS
+SESSION_EVENTS = ("session_start", "session_finish")
+
+
+class SessionLog:
+
+    """
+    writer of the session events, on its own thread
+    """
+
+    def __init__(self, path=LOG_PATH):
+
+        """
+        Parameters
+        ----------
+        path : str, optional
+            path of the log, by default in the cache folder
+        """
+
+        self.path = path
+
+        # process of the events, the monotonic times are relative to it
+        self.run = uuid.uuid4().hex
+
+        # ongoing focus session, None outside of a session
+        self.session = None
+
+        self.events = queue.SimpleQueue()
+        self.writer = None
+        self._lock = threading.Lock()
+
+        # sink(event) returning True when it took the event, e.g. the timer
+        # channel; the events it does not take are written to the log
+        self.sink = None
+
+        self.written = 0
+
+        # write the last events at exit
+        atexit.register(self.close)
+
+    def record(self, event: str, **fields):
+
+        """
+        queue an event, timestamped now
+
+        Parameters
+        ----------
+        event : str
+            kind of event, a timer event or one of SESSION_EVENTS
+        **fields
+            content of the event
+
+        Returns
+        -------
+        None
+        """
+
+        self.append({
+            "event": event,
+            "mono": round(time.monotonic(), 3),
+            "wall": round(time.time(), 3),
+            "run": self.run,
+            "session": self.session,
+            **fields,
+        })
+
+    def append(self, event: dict):
+
+        """
+        queue an event already timestamped, e.g. by the timer process
+
+        Parameters
+        ----------
+        event : dict
+            the event, as built by `record`
+
+        Returns
+        -------
+        None
+        """
+
+        if self.sink is not None and self.sink(event):
+            return
+
+        self.events.put(event)
+
+        if self.writer is None:
+            self._start()
+
+    def recorder(self, timer: str):
+
+        """
+        Parameters
+        ----------
+        timer : str
+            name of the timer, e.g. "focus"
+
+        Returns
+        -------
+        callable : recorder of a timer_module.TimerEngine
+        """
+
+        def record(event, engine):
+            self.record(event, timer=timer, elapsed=round(engine.elapsed(), 3),
+                        duration=engine.duration)
+
+        return record
+
+    def begin(self, **fields):
+
+        """
+        start a focus session, the timer events are recorded under its id
+
+        Returns
+        -------
+        str : id of the session
+        """
+
+        self.session = uuid.uuid4().hex
+        self.record("session_start", **fields)
+
+        return self.session
+
+    def end(self, **fields):
+
+        """ finish the ongoing focus session """
+
+        if self.session is None:
+            return
+
+        self.record("session_finish", **fields)
+        self.session = None
+
+    def adopt(self, path=TIMER_LOG_PATH):
+
+        """
+        move the events of another log into this one, e.g. the log of a timer
+        process that ran without the planner
+
+        Parameters
+        ----------
+        path : str, optional
+            path of the other log, by default the log of the timer process
+
+        Returns
+        -------
+        int : number of events moved
+        """
+
+        if path == self.path:
+            return 0
+
+        events = read_events(path=path)
+        for event in events:
+            self.append(event)
+
+        # the other log is removed once its events are written in this one
+        self.close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        if events:
+            logger.info(f"{len(events)} events moved from {path}")
+
+        return len(events)
+
+    def close(self):
+
+        """
+        write the queued events and stop the writer thread
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+
+            if self.writer is None:
+                return
+
+            self.events.put(None)
+            self.writer.join()
+            self.writer = None
+
+    def _start(self):
+
+        with self._lock:
+
+            if self.writer is not None:
+                return
+
+            self.writer = threading.Thread(target=self._write, name="SessionLog", daemon=True)
+            self.writer.start()
+
+    def _write(self):
+
+        with open(self.path, "a") as f:
+
+            running = True
+            while running:
+
+                # wait for an event, then take the whole burst
+                batch = [self.events.get()]
+                while True:
+                    try:
+                        batch += [self.events.get_nowait()]
+                    except queue.Empty:
+                        break
+
+                if None in batch:
+                    running = False
+                    batch = [event for event in batch if event is not None]
+
+                f.write("".join(json.dumps(event, separators=(",", ":")) + "\n"
+                                for event in batch))
+                f.flush()
+
+                self.written += len(batch)
+
+        logger.debug(f"session log closed, {self.written} events written")
+
+
+def read_events(path=LOG_PATH):
+
+    """
+    Parameters
+    ----------
+    path : str, optional
+        path of the log, by default in the cache folder
+
+    Returns
+    -------
+    list : the events, in the order they were written
+    """
+
+    events = []
+
+    try:
+        with open(path, "r") as f:
+            for line in f:
+
+                try:
+                    events += [json.loads(line)]
+
+                # a line cut by a crash
+                except ValueError:
+                    logger.warning("truncated event skipped")
+
+    except FileNotFoundError:
+        logger.debug("no session log")
+
+    return events
@@ -7,20 +7,15 @@ from kivy.lang import Builder
 
 import time
 import sys
-import logging
 
+import log_module
 import cache_module
 
 # cache module 
 cache_module_obj = cache_module.CacheInterface()
 
 # general logger
-logger = logging.getLogger(f"SimpleTimerLogs")
-logger.setLevel(logging.DEBUG)
-stdout = logging.StreamHandler(stream=sys.stdout)
-fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-stdout.setFormatter(fmt)
-logger.addHandler(stdout)
+logger = log_module.get_logger("SimpleTimerLogs")
 
 
 class SimpleTimer(Screen):
@@ -0,0 +1,44 @@
+import pytest
+
+import log_module
+import cache_module
+
+
+# the records of the app are not part of the test output
+log_module.set_level("ERROR")
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+
+    """ cache folder of the test, in place of the one of the app """
+
+    monkeypatch.setattr(cache_module, "CACHE_PATH", str(tmp_path))
+
+    return tmp_path
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request):
+
+    return request.param
+
+
+@pytest.fixture
+def open_cache(cache_path, backend):
+
+    """ opener of the cache of the test, on both backends """
+
+    caches = []
+
+    def open_cache():
+        cache = cache_module.CacheInterface(backend=backend)
+        caches.append(cache)
+        return cache
+
+    yield open_cache
+
+    for cache in caches:
+        cache.writer.flush()
+        if cache.store is not None:
+            cache.store.close()
@@ -0,0 +1,96 @@
+import pytest
+
+import clock_module
+from tests.test_timer_module import FakeClock, FakeScheduler
+
+
+@pytest.fixture
+def clock():
+
+    return FakeClock(now=100.5)
+
+
+def test_callbacks_are_called_at_their_rate(clock):
+
+    hub = clock_module.TickHub(clock=clock)
+    calls = {"fast": [], "slow": []}
+    fast = calls["fast"].append
+    slow = calls["slow"].append
+
+    hub.subscribe(fast)
+    hub.subscribe(slow, rate=3)
+
+    for now in range(101, 108):
+        hub.tick(now=now)
+
+    assert calls["fast"] == list(range(101, 108))
+    assert calls["slow"] == [103, 106]
+
+
+def test_missed_ticks_are_skipped(clock):
+
+    hub = clock_module.TickHub(clock=clock)
+    calls = []
+    hub.subscribe(calls.append, rate=2)
+
+    # due on 102, 104, ...
+    for now in (109.2, 110, 111, 112):
+        hub.tick(now=now)
+
+    assert calls == [109.2, 110, 112]
+
+
+def test_unsubscribe_during_a_tick(clock):
+
+    hub = clock_module.TickHub(clock=clock)
+    calls = []
+
+    def first(now):
+        calls.append("first")
+        hub.unsubscribe(second)
+
+    def second(now):
+        calls.append("second")
+
+    hub.subscribe(first)
+    hub.subscribe(second)
+    hub.tick(now=101)
+
+    assert calls == ["first"]
+    assert second not in hub and len(hub) == 1
+
+
+def test_subscribing_again_only_changes_the_rate(clock):
+
+    hub = clock_module.TickHub(clock=clock)
+    callback = lambda now: None
+
+    for _ in range(5):
+        hub.subscribe(callback, rate=2)
+
+    assert hub.count == 1
+    assert hub.next_wakeup() == pytest.approx(1.5)
+
+
+def test_no_wakeup_without_subscriptions(clock):
+
+    scheduler = FakeScheduler()
+    hub = clock_module.TickHub(clock=clock, scheduler=scheduler)
+    callback = lambda now: None
+
+    assert hub.next_wakeup() is None
+
+    hub.subscribe(callback)
+    assert len(scheduler.armed) == 1
+    assert scheduler.armed[0].delay == pytest.approx(0.5)
+
+    hub.unsubscribe(callback)
+    assert scheduler.armed == []
+
+    # the wakeup of a tick arms the next one
+    hub.subscribe(callback)
+    event, = scheduler.armed
+    clock.now += event.delay
+    event.fire()
+    assert len(scheduler.armed) == 1
+    assert scheduler.armed[0].delay == pytest.approx(1.)
@@ -0,0 +1,100 @@
+import random
+
+import planner_core
+import planner_engine
+
+
+def make_task(name, priority, creation=0.):
+
+    job = planner_core.Task(data={"name": name, "type": "task", "priority": priority,
+                                  "deadline": 3600, "duration": 30, "creation": creation})
+    job.set_score(value=priority)
+
+    return job
+
+
+def key(job):
+
+    return -job.value
+
+
+def test_ranked_from_the_highest_score():
+
+    rng = random.Random(0)
+    queue = planner_core.JobQueue(key=key)
+    jobs = [make_task(name=f"job {i}", priority=rng.randint(1, 100)) for i in range(200)]
+    for job in jobs:
+        queue.push(job)
+
+    assert [job.value for job in queue.ranked()] == sorted((job.value for job in jobs), reverse=True)
+    assert queue.ranked(limit=5) == queue.ranked()[:5]
+    assert len(queue) == 200
+
+
+def test_ties_keep_the_order_of_insertion():
+
+    queue = planner_core.JobQueue(key=key)
+    jobs = [make_task(name=f"job {i}", priority=i % 3) for i in range(30)]
+    for job in jobs:
+        queue.push(job)
+
+    expected = sorted(jobs, key=lambda job: -job.value)  # stable sort
+    assert queue.ranked() == expected
+
+
+def test_remove_and_update_keep_the_heap_ordered():
+
+    rng = random.Random(1)
+    queue = planner_core.JobQueue(key=key)
+    jobs = [make_task(name=f"job {i}", priority=rng.randint(1, 20)) for i in range(100)]
+    for job in jobs:
+        queue.push(job)
+
+    for job in rng.sample(jobs, 30):
+        queue.remove(job)
+        jobs.remove(job)
+        assert job not in queue
+        assert queue.get(job.id) is None
+
+    for job in rng.sample(jobs, 30):
+        job.set_score(value=rng.randint(1, 20))
+        queue.update(job)
+
+    assert [job.value for job in queue.ranked()] == sorted((job.value for job in jobs), reverse=True)
+    assert all(queue.get(job.id) is job for job in jobs)
+
+
+def test_rebuild_after_a_change_of_key():
+
+    queue = planner_core.JobQueue(key=key)
+    jobs = [make_task(name=f"job {i}", priority=i) for i in range(10)]
+    for job in jobs:
+        queue.push(job)
+
+    queue.key = lambda job: job.value
+    queue.rebuild()
+
+    assert queue.ranked() == jobs
+
+
+def test_ties_hold_across_reloads(open_cache):
+
+    cache = open_cache()
+    engine = planner_engine.JobsEngine(cache=cache)
+    for i in range(50):
+        engine.add_job(data={"name": f"job {i}", "type": "task", "priority": i % 2,
+                             "deadline": 3600, "duration": 30, "creation": 1.})
+    names = [job.name for job in engine.ranked()]
+
+    for rows in (5, None):
+        engine.save_pending()
+        cache.writer.flush()
+
+        engine = planner_engine.JobsEngine(cache=cache)
+        engine.load_pending()
+        engine.hydrate(rows=rows)
+
+        ranked = [job.name for job in engine.ranked(limit=rows)]
+        assert ranked == names[:len(ranked)]
+
+        engine.hydrate()
@@ -0,0 +1,283 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+import cache_module
+import planner_engine
+
+
+def job_id(i):
+
+    return f"{i:032x}"
+
+
+def make_job(i, priority=1, name=None):
+
+    return {"id": job_id(i), "name": f"job {i}" if name is None else name, "type": "task",
+            "priority": priority, "deadline": 3600, "duration": 30, "creation": float(i)}
+
+
+def pending(cache):
+
+    _, saved = cache.retrieve_objects()
+
+    return {key: obj for key, obj in saved.items() if key != "settings"}
+
+
+def names(saved):
+
+    return sorted(obj["name"] for obj in saved.values())
+
+
+def test_records_are_replayed(open_cache):
+
+    cache = open_cache()
+    for i in range(5):
+        cache.append_record(op="put", obj=make_job(i))
+    cache.append_record(op="put", obj=make_job(2, priority=7))
+    cache.append_record(op="delete", job_id=job_id(0))
+    cache.append_record(op="finish", obj={**make_job(4), "type": "finished task"})
+    cache.append_record(op="settings", settings={"FOCUSED_TIME": 25, "REST_TIME": 5})
+    cache.writer.flush()
+
+    saved = pending(open_cache())
+
+    assert names(saved) == ["job 1", "job 2", "job 3"]
+    assert saved[job_id(2)]["priority"] == 7
+    assert open_cache().retrieve_objects()[1]["settings"]["FOCUSED_TIME"] == 25
+
+
+def test_snapshot_keeps_the_records_appended_after_it(open_cache):
+
+    cache = open_cache()
+    cache.append_record(op="put", obj=make_job(0))
+    cache.save_pending_objects(objects=[make_job(0), make_job(1)], settings={})
+    cache.append_record(op="put", obj=make_job(2))
+    cache.append_record(op="delete", job_id=job_id(0))
+    cache.writer.flush()
+
+    assert names(pending(open_cache())) == ["job 1", "job 2"]
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_truncated_record_is_skipped(cache_path, open_cache):
+
+    cache = open_cache()
+    cache.append_record(op="put", obj=make_job(0))
+    cache.writer.flush()
+
+    with open(cache_path / cache.journal_filename, "a") as f:
+        f.write('{"op": "put", "obj": {"na')
+
+    assert names(pending(open_cache())) == ["job 0"]
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_compaction_folds_the_journal(cache_path, open_cache):
+
+    cache = open_cache()
+    cache.compaction_threshold = 10**6
+
+    for i in range(40):
+        cache.append_record(op="put", obj=make_job(i))
+    for i in range(0, 40, 2):
+        cache.append_record(op="delete", job_id=job_id(i))
+
+    before = pending(cache)
+    cache.compact()
+
+    assert not (cache_path / cache.journal_filename).exists()
+    assert not (cache_path / f"{cache.journal_filename}.old").exists()
+    assert pending(open_cache()) == before
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_compaction_in_background(open_cache):
+
+    cache = open_cache()
+    cache.compaction_threshold = 16
+
+    for i in range(100):
+        cache.append_record(op="put", obj=make_job(i))
+        if cache._compaction is not None:
+            cache._compaction.join()
+    cache.writer.flush()
+
+    assert len(pending(open_cache())) == 100
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_snapshot_writes_are_grouped_and_atomic(cache_path, open_cache):
+
+    cache = open_cache()
+    cache.writer.flush_delay = 60
+
+    for i in range(10):
+        cache.append_record(op="put", obj=make_job(i))
+        cache.save_pending_objects(objects=[make_job(j) for j in range(i + 1)], settings={})
+
+    # nothing is on disk before the flush
+    assert not (cache_path / cache.pending_filename).exists()
+
+    cache.writer.flush()
+
+    assert cache.writer.stats["flushes"] == 1
+    assert sorted(cache_path.iterdir()) == [cache_path / cache.pending_filename]
+    assert len(pending(open_cache())) == 10
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_journal_is_trimmed_once_the_snapshot_is_on_disk(cache_path, open_cache):
+
+    cache = open_cache()
+    cache.writer.flush_delay = 60
+
+    cache.append_record(op="put", obj=make_job(0))
+    cache.save_pending_objects(objects=[make_job(0)], settings={})
+    cache.append_record(op="put", obj=make_job(1))
+
+    # a crash before the flush replays the whole journal
+    assert names(pending(open_cache())) == ["job 0", "job 1"]
+
+    cache.writer.flush()
+
+    with open(cache_path / cache.journal_filename) as f:
+        assert [json.loads(line)["obj"]["name"] for line in f] == ["job 1"]
+    assert not (cache_path / f"{cache.journal_filename}.tmp").exists()
+    assert names(pending(open_cache())) == ["job 0", "job 1"]
+
+
+def test_backends_agree_on_random_operations(cache_path):
+
+    rng = random.Random(0)
+    caches = {backend: cache_module.CacheInterface(backend=backend) for backend in ("json", "sqlite")}
+    caches["json"].compaction_threshold = 64
+
+    ids = []
+    for step in range(1000):
+
+        if rng.random() < 0.6 or not ids:
+            i = rng.randrange(200)
+            record = {"op": "put", "obj": make_job(i, priority=rng.randint(1, 9), name=f"job {i % 20}")}
+            ids += [record["obj"]["id"]]
+
+        else:
+            record = {"op": "delete", "job_id": ids.pop(rng.randrange(len(ids)))}
+
+        for cache in caches.values():
+            cache.append_record(**record)
+
+        if step % 300 == 0:
+            objects = list(pending(caches["json"]).values())
+            for cache in caches.values():
+                cache.save_pending_objects(objects=objects, settings={})
+
+    caches["json"].writer.flush()
+    if caches["json"]._compaction is not None:
+        caches["json"]._compaction.join()
+
+    assert pending(cache_module.CacheInterface(backend="json")) == pending(caches["sqlite"])
+    caches["sqlite"].store.close()
+
+
+def test_minitask_records_replay_the_project(open_cache):
+
+    rng = random.Random(2)
+    cache = open_cache()
+    engine = planner_engine.JobsEngine(cache=cache)
+    job = engine.add_job(data={"name": "project", "type": "project", "priority": 1,
+                               "deadline": 3600, "current_minitasks": [],
+                               "completed_minitasks": 0})
+
+    for _ in range(20):
+
+        project = planner_engine.ProjectEngine(cache=cache)
+        project.load(project_data=job.data)
+
+        for i in range(5):
+            minitasks = list(project.current_minitasks)
+            action = rng.random()
+            if action < 0.6 or not minitasks:
+                project.add_minitask(data={"name": f"minitask {i}", "type": "minitask",
+                                           "rank": rng.randint(0, len(minitasks)), "duration": 5})
+            elif action < 0.8:
+                project.delete_minitask(minitask_id=rng.choice(minitasks).id)
+            elif minitasks[0].type == "minitask" and project.finished + 1 < len(minitasks):
+                project.complete_minitask(minitask_id=minitasks[0].id)
+
+        engine.update_project(updated_data=project.delta())
+
+    cache.writer.flush()
+    saved = pending(open_cache())[job.id]
+
+    assert saved["current_minitasks"] == json.loads(json.dumps([m.data for m in job.current_minitasks]))
+    assert saved["completed_minitasks"] == job.completed_minitasks
+
+
+def test_jobs_of_the_same_name_are_kept_apart(open_cache):
+
+    cache = open_cache()
+    for i in range(3):
+        cache.append_record(op="put", obj=make_job(i, priority=i, name="job"))
+    cache.append_record(op="delete", job_id=job_id(1))
+    cache.writer.flush()
+
+    saved = pending(open_cache())
+    assert sorted(saved) == [job_id(0), job_id(2)]
+
+    cache.save_pending_objects(objects=list(saved.values()), settings={})
+    cache.append_record(op="finish", obj={**make_job(2, name="job"), "type": "finished task"})
+    cache.writer.flush()
+
+    assert list(pending(open_cache())) == [job_id(0)]
+
+
+@pytest.mark.parametrize("backend", ["json"])
+def test_cache_saved_before_the_ids_is_read(cache_path, open_cache):
+
+    legacy = [{key: value for key, value in make_job(i).items() if key != "id"} for i in range(3)]
+    with open(cache_path / "pending_jobs.json", "w") as f:
+        json.dump({"settings": {"FOCUSED_TIME": 25, "REST_TIME": 5},
+                   **{obj["name"]: obj for obj in legacy}}, f)
+    with open(cache_path / "pending_jobs.journal", "w") as f:
+        f.write(json.dumps({"op": "delete", "name": "job 1"}) + "\n")
+
+    engine = planner_engine.JobsEngine(cache=open_cache())
+    engine.load_pending()
+    engine.cache.writer.flush()
+
+    # saved again by id
+    saved = pending(open_cache())
+    assert names(saved) == ["job 0", "job 2"]
+    assert sorted(saved) == sorted(data["id"] for data in engine.dormant_jobs)
+
+
+def test_sqlite_database_keyed_by_name_is_migrated(cache_path):
+
+    conn = sqlite3.connect(cache_path / "pending_jobs.sqlite")
+    conn.executescript("""
+        CREATE TABLE jobs (name TEXT PRIMARY KEY, type TEXT NOT NULL, priority INTEGER NOT NULL,
+                           rank INTEGER NOT NULL, done INTEGER NOT NULL, creation REAL,
+                           data TEXT NOT NULL);
+        CREATE TABLE minitasks (project TEXT NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL,
+                                type TEXT NOT NULL, done INTEGER NOT NULL, data TEXT NOT NULL,
+                                PRIMARY KEY (project, position));
+    """)
+    project = {"name": "project", "type": "project", "priority": 1, "deadline": 3600,
+               "creation": 0., "completed_minitasks": 0}
+    minitask = {"name": "minitask", "type": "minitask", "duration": 5}
+    conn.execute("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                 ("project", "project", 1, 0, 0, 0., json.dumps(project)))
+    conn.execute("INSERT INTO minitasks VALUES (?, ?, ?, ?, ?, ?)",
+                 ("project", 0, "minitask", "minitask", 0, json.dumps(minitask)))
+    conn.commit()
+    conn.close()
+
+    cache = cache_module.CacheInterface(backend="sqlite")
+    saved, = pending(cache).values()
+    cache.store.close()
+
+    assert saved["id"] and saved["name"] == "project"
+    assert saved["current_minitasks"] == [minitask]
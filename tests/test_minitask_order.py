@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+import planner_core
+import planner_engine
+
+
+def make_minitask(i):
+
+    return planner_core.MiniTask(data={"name": f"minitask {i}", "type": "minitask",
+                                       "duration": 10})
+
+
+def test_insert_clamps_like_a_list():
+
+    order = planner_core.MiniTaskOrder()
+    reference = []
+
+    for i, pos in enumerate((0, 0, 5, -1, 1, 100, -100)):
+        minitask = make_minitask(i)
+        order.insert(pos, minitask)
+        reference.insert(pos, minitask)
+
+    assert list(order) == reference
+
+
+def test_random_operations_match_a_list():
+
+    rng = random.Random(0)
+    order = planner_core.MiniTaskOrder()
+    reference = []
+
+    for i in range(2000):
+
+        if rng.random() < 0.6 or not reference:
+            pos = rng.randint(0, len(reference))
+            minitask = make_minitask(i)
+            order.insert(pos, minitask)
+            reference.insert(pos, minitask)
+
+        else:
+            minitask = rng.choice(reference)
+            assert order.remove(minitask) == reference.index(minitask)
+            reference.remove(minitask)
+            assert minitask not in order
+
+        if i % 50 == 0:
+            assert list(order) == reference
+            assert len(order) == len(reference)
+
+    for pos, minitask in enumerate(reference):
+        assert order.index(minitask) == pos
+        assert order[pos] is minitask
+        assert order.get(minitask.id) is minitask
+
+    assert order.head(10) == reference[:10]
+
+
+def test_replace_keeps_the_position():
+
+    order = planner_core.MiniTaskOrder(make_minitask(i) for i in range(5))
+    minitask = order[2]
+
+    finished = minitask.finish()
+    order.replace(minitask, finished)
+
+    assert order[2] is finished
+    assert order.index(finished) == 2
+    assert order.get(minitask.id) is finished
+
+
+def test_a_minitask_is_placed_once():
+
+    minitask = make_minitask(0)
+    order = planner_core.MiniTaskOrder([minitask])
+
+    with pytest.raises(ValueError):
+        order.insert(0, minitask)
+
+
+def test_an_edited_minitask_keeps_its_rank():
+
+    project = planner_core.Project(data={"name": "project", "type": "project", "priority": 1,
+                                         "deadline": 3600, "completed_minitasks": 0,
+                                         "current_minitasks": [make_minitask(i).data
+                                                               for i in range(5)]})
+    engine = planner_engine.ProjectEngine()
+    engine.load(project_data=project.data)
+    minitask = engine.current_minitasks[2]
+
+    data = engine.edit_minitask(minitask_id=minitask.id)
+    assert data["rank"] == 2
+    assert minitask not in engine.current_minitasks
+
+    # saved from the edit window
+    edited = engine.add_minitask(data={**data, "duration": 25})
+
+    assert engine.current_minitasks[2] is edited
+    assert (edited.id, edited.duration) == (minitask.id, 25)
+    assert [m.name for m in engine.current_minitasks] == [f"minitask {i}" for i in range(5)]
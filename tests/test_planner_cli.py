@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+import planner_cli
+
+
+def import_jobs(tmp_path, backend, names):
+
+    filename = tmp_path / "jobs.json"
+    filename.write_text(json.dumps([{"name": name, "type": "task", "priority": i + 1}
+                                    for i, name in enumerate(names)]))
+
+    planner_cli.main(["--backend", backend, "import", str(filename)])
+
+
+def test_export_writes_the_pending_jobs(cache_path, backend, capsys):
+
+    import_jobs(cache_path, backend, names=["a", "b"])
+    planner_cli.main(["--backend", backend, "export", "backup.json"])
+
+    with open(cache_path / "backup.json") as f:
+        saved = json.load(f)
+
+    assert sorted(obj["name"] for key, obj in saved.items() if key != "settings") == ["a", "b"]
+
+
+def test_finished_jobs_are_listed_on_sqlite(cache_path, capsys):
+
+    import_jobs(cache_path, "sqlite", names=["a", "b"])
+    planner_cli.main(["--backend", "sqlite", "complete", "b"])
+    capsys.readouterr()
+
+    planner_cli.main(["--backend", "sqlite", "finished"])
+    finished, = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert finished["name"] == "b" and finished["finished_at"]
+
+    with pytest.raises(SystemExit):
+        planner_cli.main(["--backend", "json", "finished"])
@@ -0,0 +1,79 @@
+import pytest
+
+import planner_core
+
+
+def make_minitask(i, **data):
+
+    return {"name": f"minitask {i}", "type": "minitask", "rank": i, "duration": 45,
+            "creation": 1., **data}
+
+
+TASK = {"name": "task", "type": "task", "priority": 3, "deadline": 7200, "duration": 50,
+        "creation": 1., "tot_focus": 20, "tot_rest": 5, "tot_idle": 1}
+
+PROJECT = {"name": "project", "type": "project", "priority": 2, "deadline": 7200,
+           "creation": 1., "completed_minitasks": 0,
+           "current_minitasks": [make_minitask(i) for i in range(3)]}
+
+
+@pytest.mark.parametrize("data", [TASK, PROJECT])
+def test_data_round_trip(data):
+
+    job = planner_core.job_from_data(data=data)
+
+    assert planner_core.job_from_data(data=job.data).data == job.data
+    assert job.name == data["name"] and job.priority == data["priority"]
+
+
+def test_ids_are_stable():
+
+    job = planner_core.job_from_data(data=PROJECT)
+    minitask = job.current_minitasks[0]
+
+    assert planner_core.job_from_data(data=job.data).id == job.id
+    assert job.finish(priority=-1).id == job.id
+    assert minitask.finish().id == minitask.id
+
+    # records saved before the ids get a new one each
+    assert planner_core.job_from_data(data=TASK).id != planner_core.job_from_data(data=TASK).id
+
+
+def test_records_have_no_instance_dict():
+
+    job = planner_core.job_from_data(data=TASK)
+
+    with pytest.raises(AttributeError):
+        job.widget = None
+
+
+def test_finished_task_keeps_its_totals():
+
+    job = planner_core.job_from_data(data=TASK)
+    finished = job.finish(priority=-1)
+
+    assert finished.type == "finished task"
+    assert finished.data["done"] is True
+    assert finished.data["priority"] == TASK["priority"]
+    assert (finished.tot_focus, finished.tot_rest, finished.tot_idle) == (20, 5, 1)
+
+
+def test_finished_minitask_round_trip():
+
+    minitask = planner_core.minitask_from_data(data=make_minitask(0))
+    minitask.update_focus(focus_package={"tot_focus": 40, "tot_rest": 5, "tot_idle": 0,
+                                         "done": True})
+    finished = minitask.finish()
+
+    assert finished.type == "finished minitask"
+    assert planner_core.minitask_from_data(data=finished.data).data == finished.data
+    assert finished.tot_focus == 40
+
+
+def test_unknown_types_are_rejected():
+
+    with pytest.raises(TypeError):
+        planner_core.job_from_data(data={**TASK, "type": "chore"})
+
+    with pytest.raises(TypeError):
+        planner_core.minitask_from_data(data=make_minitask(0, type="chore"))
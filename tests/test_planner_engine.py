@@ -0,0 +1,78 @@
+import random
+
+import planner_engine
+
+
+def make_jobs(size: int):
+
+    rng = random.Random(0)
+
+    return [{"id": f"{i:032x}", "name": f"job {i}", "type": "task", "priority": rng.randint(1, 20),
+             "deadline": 3600, "duration": 30, "creation": float(i)} for i in range(size)]
+
+
+def saved_engine(cache, jobs: list):
+
+    cache.save_pending_objects(objects=jobs, settings=dict(planner_engine.SETTINGS))
+    cache.writer.flush()
+
+    engine = planner_engine.JobsEngine(cache=cache)
+    engine.load_pending()
+
+    return engine
+
+
+def test_the_first_page_is_ranked_from_the_saved_jobs(open_cache):
+
+    jobs = make_jobs(size=300)
+    engine = saved_engine(cache=open_cache(), jobs=jobs)
+
+    page = engine.page(rows=10)
+
+    expected = sorted(jobs, key=planner_engine.dormant_key)[:10]
+    assert [job.id for job in page] == [data["id"] for data in expected]
+    assert all(job.duration == 30 for job in page)
+    assert len(engine) == 300
+
+
+def test_an_indexed_cache_is_read_page_by_page(open_cache, backend):
+
+    engine = saved_engine(cache=open_cache(), jobs=make_jobs(size=300))
+
+    if backend == "sqlite":
+        assert len(engine.unread) == 300
+
+    engine.page(rows=10)
+    assert len(engine.unread) <= (300 - 10 if backend == "sqlite" else 0)
+
+    # a job of the index found by name
+    assert engine.find("job 299").duration == 30
+
+    engine.hydrate()
+    assert not engine.unread
+    assert len(engine.queue) == 300
+
+
+def test_save_after_a_partial_load_keeps_every_job(open_cache):
+
+    jobs = make_jobs(size=100)
+    cache = open_cache()
+    engine = saved_engine(cache=cache, jobs=jobs)
+    engine.page(rows=5)
+
+    engine.save_pending()
+    cache.writer.flush()
+
+    _, saved = open_cache().retrieve_objects()
+    del saved["settings"]
+
+    assert sorted(saved) == sorted(data["id"] for data in jobs)
+    assert all(saved[data["id"]].items() >= data.items() for data in jobs)
+
+
+def test_an_empty_cache_is_hydrated(open_cache):
+
+    engine = planner_engine.JobsEngine(cache=open_cache())
+    engine.load_pending()
+
+    assert engine.hydrate() == 0 and engine.ranked() == []
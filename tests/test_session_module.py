@@ -0,0 +1,78 @@
+import json
+
+import session_module
+
+
+def read(path):
+
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_events_are_written_in_order(tmp_path):
+
+    log = session_module.SessionLog(path=str(tmp_path / "sessions.log"))
+
+    session = log.begin(id="job")
+    for i in range(100):
+        log.record("interval", kind="focus", planned=60. * i)
+    log.end(done=False)
+    log.close()
+
+    events = read(log.path)
+
+    assert [event["event"] for event in events] == ["session_start"] + ["interval"] * 100 + ["session_finish"]
+    assert [event["planned"] for event in events[1:-1]] == [60. * i for i in range(100)]
+    assert all(event["session"] == session for event in events)
+    assert session_module.read_events(path=log.path) == events
+
+
+def test_the_writer_restarts_without_piling_up_exit_handlers(tmp_path, monkeypatch):
+
+    handlers = []
+    monkeypatch.setattr(session_module.atexit, "register", handlers.append)
+
+    log = session_module.SessionLog(path=str(tmp_path / "sessions.log"))
+    for i in range(5):
+        log.record("start", timer="focus")
+        log.close()
+
+    assert handlers == [log.close]
+    assert len(read(log.path)) == 5
+
+
+def test_sink_takes_the_events(tmp_path):
+
+    sent = []
+
+    def sink(event):
+        sent.append(event)
+        return True
+
+    log = session_module.SessionLog(path=str(tmp_path / "sessions.log"))
+    log.sink = sink
+
+    log.record("pause", timer="focus")
+    log.close()
+
+    assert [event["event"] for event in sent] == ["pause"]
+    assert not (tmp_path / "sessions.log").exists()
+
+
+def test_the_timer_log_is_moved_into_the_log(tmp_path):
+
+    timer_log = session_module.SessionLog(path=str(tmp_path / "sessions_timer.log"))
+    timer_log.record("start", timer="simple")
+    timer_log.record("finish", timer="simple")
+    timer_log.close()
+
+    with open(timer_log.path, "a") as f:
+        f.write('{"event": "pau')
+
+    log = session_module.SessionLog(path=str(tmp_path / "sessions.log"))
+    log.record("start", timer="focus")
+
+    assert log.adopt(path=timer_log.path) == 2
+    assert not (tmp_path / "sessions_timer.log").exists()
+    assert [event["event"] for event in read(log.path)] == ["start", "start", "finish"]
+    assert log.adopt(path=timer_log.path) == 0
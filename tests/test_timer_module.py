@@ -0,0 +1,153 @@
+import pytest
+
+import timer_module
+
+
+class FakeClock:
+
+    def __init__(self, now=100.):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeEvent:
+
+    def __init__(self, callback, delay):
+        self.callback = callback
+        self.delay = delay
+        self.done = False
+
+    def cancel(self):
+        self.done = True
+
+    def fire(self):
+        self.done = True
+        self.callback(self.delay)
+
+
+class FakeScheduler:
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, callback, delay):
+        self.events += [FakeEvent(callback, delay)]
+        return self.events[-1]
+
+    @property
+    def armed(self):
+        return [event for event in self.events if not event.done]
+
+
+@pytest.fixture
+def clock():
+
+    return FakeClock()
+
+
+def test_run_time_only_counts_while_running(clock):
+
+    timer = timer_module.TimerEngine(duration=60, clock=clock)
+    assert timer.state == "paused" and timer.elapsed() == 0
+
+    timer.start()
+    clock.now += 10
+    timer.pause()
+    clock.now += 100
+    assert timer.elapsed() == 10
+
+    timer.start()
+    clock.now += 5
+    assert timer.elapsed() == 15
+    assert timer.remaining() == 45
+
+
+def test_countdown_finishes_at_its_duration(clock):
+
+    timer = timer_module.TimerEngine(duration=3, clock=clock)
+    ticks = []
+    timer.subscribe(ticks.append)
+
+    timer.start()
+    clock.now += 2
+    assert not timer.tick()
+
+    clock.now += 5
+    assert timer.tick()
+    assert timer.state == "finished"
+    assert timer.elapsed() == 3
+    assert len(ticks) == 2
+
+
+def test_display_rounds_a_countdown_up(clock):
+
+    timer = timer_module.TimerEngine(duration=90, clock=clock)
+    timer.start()
+    clock.now += 0.2
+
+    assert timer.seconds() == 90
+    assert timer.display() == "01:30"
+    assert timer.next_wakeup() == pytest.approx(0.8)
+
+
+def test_stopwatch(clock):
+
+    timer = timer_module.TimerEngine(clock=clock)
+    timer.start()
+    clock.now += 61.5
+
+    assert timer.display() == "01:01"
+    assert timer.next_wakeup() == pytest.approx(0.5)
+
+
+def test_reset_keeps_a_running_timer_running(clock):
+
+    timer = timer_module.TimerEngine(duration=60, clock=clock)
+    timer.start()
+    clock.now += 20
+    timer.reset()
+
+    assert timer.state == "running"
+    assert timer.elapsed() == 0
+
+
+def test_transitions_are_recorded(clock):
+
+    events = []
+    timer = timer_module.TimerEngine(duration=10, clock=clock,
+                                     recorder=lambda event, engine: events.append(event))
+
+    timer.start()
+    clock.now += 1
+    timer.pause()
+    timer.start()
+    timer.reset()
+    clock.now += 20
+    timer.tick()
+    timer.load(duration=5, running=True)
+    timer.load(duration=5)
+
+    assert events == ["start", "pause", "resume", "reset", "finish", "start", "stop"]
+    assert set(events) <= set(timer_module.EVENTS)
+
+
+def test_scheduler_wakes_on_the_displayed_seconds(clock):
+
+    scheduler = FakeScheduler()
+    timer = timer_module.TimerEngine(duration=3, clock=clock, scheduler=scheduler)
+
+    timer.start()
+    assert len(scheduler.armed) == 1 and scheduler.armed[0].delay == pytest.approx(1.)
+
+    for _ in range(3):
+        event, = scheduler.armed
+        clock.now += event.delay
+        event.fire()
+
+    assert timer.state == "finished"
+
+    timer.load(duration=3, running=True)
+    timer.pause()
+    assert scheduler.armed == []
@@ -0,0 +1,291 @@
+import math
+import time
+
+
+""" TIMER ENGINE
+
+timing of the focus, rest, idle and simple timers: the state transitions are
+pure and read a monotonic clock, and the engine wakes up only when the displayed
+second changes. The scheduler is given by the screen (Kivy Clock.schedule_once),
+without it the engine is driven by hand, e.g. in tests. Each transition can be
+reported to a recorder, e.g. the session log
+"""
+
+# transitions reported to the recorder
+EVENTS = ("start", "pause", "resume", "reset", "stop", "finish")
+
+
+class TimerEngine:
+
+    """
+    countdown of a given duration, or stopwatch when the duration is None
+    """
+
+    __slots__ = ("duration", "state", "elapsed_before", "started_at", "clock",
+                 "scheduler", "event", "subscribers", "recorder")
+
+    def __init__(self, duration=None, scheduler=None, clock=time.monotonic, recorder=None):
+
+        """
+        Parameters
+        ----------
+        duration : float, optional
+            length of the countdown in seconds, by default None: a stopwatch
+        scheduler : callable, optional
+            scheduler(callback, delay) returning an event with a cancel() method,
+            by default None: the engine only ticks when tick() is called
+        clock : callable, optional
+            monotonic clock in seconds, by default time.monotonic
+        recorder : callable, optional
+            recorder(event, engine) called at each transition, one of EVENTS
+        """
+
+        self.duration = duration
+        self.state = "paused"  # state: finished, running, paused
+
+        # run time of the previous runs, and start of the current run
+        self.elapsed_before = 0.0
+        self.started_at = 0.0
+
+        self.clock = clock
+        self.scheduler = scheduler
+        self.event = None
+
+        self.subscribers = []
+        self.recorder = recorder
+
+    """ state transitions """
+
+    def load(self, duration=None, running=False):
+
+        """
+        Parameters
+        ----------
+        duration : float, optional
+            length of the countdown in seconds, by default None: a stopwatch
+        running : bool, optional
+            if True the timer starts, by default False
+        """
+
+        # a running timer replaced by a new one is stopped
+        if self.state == "running":
+            self.stop()
+
+        self._cancel()
+
+        self.duration = duration
+        self.state = "paused"
+        self.elapsed_before = 0.0
+
+        if running:
+            self.start()
+
+    def start(self):
+
+        """ start or resume a paused timer """
+
+        if self.state != "paused":
+            return
+
+        self.started_at = self.clock()
+        self.state = "running"
+        self._arm()
+
+        self._record("resume" if self.elapsed_before > 0 else "start")
+
+    def pause(self):
+
+        """ pause a running timer, keeping its run time """
+
+        if self.state != "running":
+            return
+
+        self._halt()
+        self._record("pause")
+
+    def toggle(self):
+
+        """ the play/pause button """
+
+        if self.state == "running":
+            self.pause()
+        else:
+            self.start()
+
+    def reset(self):
+
+        """ back to the whole duration, a running timer keeps running """
+
+        self._record("reset")
+
+        self.elapsed_before = 0.0
+
+        if self.state == "running":
+            self.started_at = self.clock()
+            self._cancel()
+            self._arm()
+
+        elif self.state == "finished":
+            self.state = "paused"
+
+    def stop(self):
+
+        """ stop the timer, keeping its run time """
+
+        if self.state == "finished":
+            return
+
+        if self.state == "running":
+            self._halt()
+
+        self.state = "finished"
+        self._record("stop")
+
+    """ readings """
+
+    def elapsed(self, now=None):
+
+        """
+        Parameters
+        ----------
+        now : float, optional
+            time of the reading, by default the clock
+
+        Returns
+        -------
+        float : run time in seconds, at most the duration
+        """
+
+        elapsed = self.elapsed_before
+        if self.state == "running":
+            elapsed += (self.clock() if now is None else now) - self.started_at
+
+        if self.duration is not None:
+            return min(elapsed, self.duration)
+
+        return elapsed
+
+    def remaining(self, now=None):
+
+        """
+        Returns
+        -------
+        float : seconds left to the countdown
+        """
+
+        return self.duration - self.elapsed(now=now)
+
+    def seconds(self, now=None):
+
+        """
+        Returns
+        -------
+        int : the displayed seconds, rounded up for a countdown
+        """
+
+        if self.duration is None:
+            return int(math.floor(self.elapsed(now=now)))
+
+        return int(math.ceil(self.remaining(now=now)))
+
+    def display(self, now=None):
+
+        """
+        Returns
+        -------
+        str : the displayed time, as "MM:SS"
+        """
+
+        seconds = self.seconds(now=now)
+
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+    def next_wakeup(self, now=None):
+
+        """
+        Returns
+        -------
+        float : seconds to the next change of the displayed second
+        """
+
+        if self.duration is None:
+            return 1.0 - self.elapsed(now=now) % 1.0
+
+        remaining = self.remaining(now=now)
+        if remaining <= 0:
+            return 0.0
+
+        return remaining - math.ceil(remaining) + 1.0
+
+    """ ticking """
+
+    def subscribe(self, callback):
+
+        """
+        Parameters
+        ----------
+        callback : callable
+            called with the engine at every displayed second, and when it finishes
+        """
+
+        if callback not in self.subscribers:
+            self.subscribers += [callback]
+
+    def unsubscribe(self, callback):
+
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def tick(self, now=None):
+
+        """
+        update the state at the given time, and notify the subscribers
+
+        Returns
+        -------
+        bool : True if the countdown just finished
+        """
+
+        if self.state != "running":
+            return False
+
+        finished = self.duration is not None and self.remaining(now=now) <= 0
+        if finished:
+            self.elapsed_before = self.duration
+            self.state = "finished"
+            self._record("finish")
+
+        for callback in list(self.subscribers):
+            callback(self)
+
+        return finished
+
+    def _halt(self):
+
+        self.elapsed_before += self.clock() - self.started_at
+        self.state = "paused"
+        self._cancel()
+
+    def _record(self, event: str):
+
+        if self.recorder is not None:
+            self.recorder(event, self)
+
+    def _wake(self, *args):
+
+        self.event = None
+        self.tick()
+        self._arm()
+
+    def _arm(self):
+
+        if self.scheduler is None or self.state != "running" or self.event is not None:
+            return
+
+        self.event = self.scheduler(self._wake, self.next_wakeup())
+
+    def _cancel(self):
+
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
@@ -1,8 +1,15 @@
 
+import os
+
 # make window size fixed
 from kivy import Config
 Config.set('graphics', 'resizable', False)
 
+# kept running by the planner, hidden until a timer is requested
+WORKER = os.environ.get("PLANNER_TIMER_WORKER") == "1"
+if WORKER:
+    Config.set('graphics', 'window_state', 'hidden')
+
 from kivy.core.window import Window
 Window.size = (250, 200)
 
@@ -14,20 +21,26 @@ from kivy.lang import Builder
 
 import time
 import sys
-import logging
 
-import cache_module
-
-# cache module 
-cache_module_obj = cache_module.CacheInterface()
+import log_module
+import media_module
+import timer_module
+import ipc_module
+import session_module
 
 # general logger
-logger = logging.getLogger(f"TimerLogs")
-logger.setLevel(logging.DEBUG)
-stdout = logging.StreamHandler(stream=sys.stdout)
-fmt = logging.Formatter("%(name)s: %(asctime)s | %(levelname)s | %(message)s")
-stdout.setFormatter(fmt)
-logger.addHandler(stdout)
+logger = log_module.get_logger("TimerLogs")
+
+# events of the timer, sent to the planner which writes them to its log; a
+# timer launched on its own writes them to a log of its own
+session_log = session_module.SessionLog(path=session_module.TIMER_LOG_PATH)
+
+
+def on_ui_thread(callback, *args):
+
+    """ run a callback of the planner channel on the UI thread """
+
+    Clock.schedule_once(lambda dt: callback(*args))
 
 
 class SimpleTimerSetting(Screen):
@@ -42,28 +55,24 @@ class SimpleTimerSetting(Screen):
 
         self._loaded_duration = 0.0
 
-    def _load_cache(self):
+    def _load_planned(self):
 
         """
-        load the cache
+        load the duration sent by the planner
         """
 
-        # retrieve time cache 
-        present, timer_cache = cache_module_obj.get_timer_cache()
+        duration = App.get_running_app().duration
 
-        if present:
+        if duration:
 
-            logger.debug("timer cache found")
-            
-            # go to Simple Timer Window
-            logger.debug(f"dir start button: {self.ids}")
+            logger.debug("duration sent by the planner")
 
             # define timer data
-            self._loaded_duration = timer_cache['duration']
+            self._loaded_duration = duration
 
-            return 
+            return
 
-        logger.debug("no timer cache found")
+        logger.debug("no duration sent by the planner")
 
     def _load_duration(self):
 
@@ -88,8 +97,8 @@ class SimpleTimerSetting(Screen):
 
         logger.info("Simple Timer Setting Window entered")
 
-        # load cache
-        self._load_cache()
+        # load the duration sent by the planner
+        self._load_planned()
 
         # print window size
         logger.debug(f"window size: {Window.size}")
@@ -145,10 +154,8 @@ class SimpleTimerSetting(Screen):
 
         self.saved = True
 
-        # save cache
-        cache_module_obj.save_timer_cache(timer_cache={"duration": self.duration})
-
-        time.sleep(0.5)
+        # hand the duration to the timer
+        App.get_running_app().duration = self.duration
 
     def get_duration(self):
 
@@ -167,17 +174,17 @@ class SimpleTimerSetting(Screen):
 
         if pressed:
             self.timer_setting_image.source = (
-                r"media/Timer window/timer_settings_return.png"
+                media_module.source(r"media/Timer window/timer_settings_return.png")
             )
             logger.debug("exit button pressed")
 
         else:
-            self.timer_setting_image.source = r"media/Timer window/timer_settings.png"
+            self.timer_setting_image.source = media_module.source(r"media/Timer window/timer_settings.png")
 
     def quit(self):
 
         Window.size = (700, 500)
-        self.timer_setting_image.source = r"media/Timer window/timer_settings.png"
+        self.timer_setting_image.source = media_module.source(r"media/Timer window/timer_settings.png")
 
 
 class SimpleTimer(Screen):
@@ -187,15 +194,20 @@ class SimpleTimer(Screen):
 
         self.tot_duration = 0
         self.duration = 0  # how long it has run so far
-        self.state = "running"  # state: finished, running, paused
-        self.start_time = 0.0  # time at which it started
-        self.checkpoint = 0.0  # paused time
 
-        self.current_time = [0, 0]
+        self.timer = timer_module.TimerEngine(scheduler=Clock.schedule_once,
+                                               recorder=session_log.recorder("detached"))
+        self.timer.subscribe(self.ticking)
 
-        self.job = 0
         self.app = ""
 
+    @property
+    def state(self):
+
+        """ state: finished, running, paused """
+
+        return self.timer.state
+
     def on_enter(self, *args):
 
         logger.info("Simple Timer Window entered")
@@ -206,13 +218,13 @@ class SimpleTimer(Screen):
         else:
             logger.debug("'on_enter': display attribute found")
         
-        self._load_cache()
+        self._load_duration()
 
     def on_leave(self, *args):
 
         logger.info("Simple Timer Window left")
 
-    def _load_cache(self):
+    def _load_duration(self):
 
         """
         load the interval
@@ -222,15 +234,20 @@ class SimpleTimer(Screen):
         None
         """
 
-        # retrieve time cache 
-        present, timer_cache = cache_module_obj.get_timer_cache()
+        self.app = App.get_running_app()
+
+        if not self.app.duration:
 
-        if not present:
-            logger.error("timer cache not found")
+            # the worker stays up for the next request of the planner
+            if WORKER:
+                logger.warning("no timer duration, the timer is hidden")
+                self.app.root.current = "simple_timer_setting"
+                Window.hide()
+                return
+
+            logger.error("no timer duration")
             sys.exit("<timer aborted>")
 
-        # delete cache
-        #cache_module_obj.delete_timer_cache()
         # check if "dislay" is an attribute
         if not hasattr(self, "display"):
             logger.debug("'load duration': display attribute not found")
@@ -238,41 +255,21 @@ class SimpleTimer(Screen):
             logger.debug("'load duration': display attribute found")
 
         # define timer data
-        duration = timer_cache['duration']
+        duration = self.app.duration
         ongoing = True  # <--------------------------- ugly
         self.tot_duration = duration * 60
-        self.checkpoint = duration * 60
-        self.current_time = [duration, 0]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
-        self.app = App.get_running_app()
+        self.timer.load(duration=self.tot_duration, running=ongoing)
+        self.display.text = self.timer.display()
+        self.report()
 
         if ongoing:
-
             logger.debug("timer ongoing")
-
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/pause_iconG.png"
-
         else:
             logger.debug("timer paused")
 
-            # new state
-            self.state = "paused"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/play_iconG.png"
-
         logger.debug(
             "timer interval loaded: %s [%ss] %s",
-            self.current_time,
+            self.display.text,
             duration * 60,
             self.state,
         )
@@ -286,85 +283,56 @@ class SimpleTimer(Screen):
 
             logger.debug("timer started")
 
-            # start clock
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
-
-            # new state
-            self.state = "running"
-
-            # change button name to pause
-            # self.play_pause_icon.source = "media/pause_iconG.png"
+            self.timer.start()
+            self.report()
 
         # running + pause button : pause
         elif self.state == "running":
 
             logger.debug("timer paused")
 
-            # stop clock
-            self.job.cancel()
-
-            # new state
-            self.state = "paused"
-
-            # checkpoint
-            self.checkpoint = self.current_time[0] * 60 + self.current_time[1]
-
-            # change button name to play
-            # self.play_pause_icon.source = "media/play_iconG.png"
+            self.timer.pause()
+            self.report()
 
             # track interval run
             self.tracking()
 
-    def ticking(self, *args):
+    def ticking(self, timer):
 
         """ Update timer """
 
-        elapsed = int(self.checkpoint - (time.time() - self.start_time))
-        self.current_time[1] = int(elapsed % 60)
-        self.current_time[0] = int(elapsed // 60)
-
-        if elapsed <= 0:
+        self.display.text = timer.display()
+        self.report()
 
-            # cancel
-            self.job.cancel()
+        if timer.state == "finished":
 
             # record
             self.tracking()
 
-            #
-            self.display.text = "00:00"
-            self.state = "finished"
-            Clock.usleep(10000)
-
             self.close()
-            return
-
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
 
     def tracking(self):
 
         """ Track time """
 
-        self.duration = int(time.time() - self.start_time)
-
-        # control for absurd time difference, usually when the timer isn't event started
-        if self.duration > 24 * 60 * 60:
-            self.duration = 0
+        self.duration = int(self.timer.elapsed())
 
         logger.info(f"tracked: {self.duration} s")
 
+    def report(self):
+
+        """ Send the timer state to the planner """
+
+        App.get_running_app().report(self.timer)
+
     def close(self):
 
         """ Close timer """
 
         logger.info("quitting timer")
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
+        self.report()
 
         # record
         self.tracking()
@@ -373,38 +341,25 @@ class SimpleTimer(Screen):
         self.app.root.current = "extra_simple_timer"
         self.app.root.transition.direction = "left"
 
-
     def reset(self):
 
         """reset to the original values"""
 
         logger.info("resetting timer")
 
-        # cancel
-        self.job.cancel()
-
-        Clock.usleep(1000)
-
-        # reset values to original
-        self.checkpoint = self.tot_duration
-        self.current_time = [int(self.tot_duration // 60), int(self.tot_duration % 60)]
-        self.display.text = f"{self.current_time[0]:02d}:{self.current_time[1]:02d}"
-
         # record
         if self.state == "running":
             self.tracking()
 
-            # restart
-            self.start_time = time.time()
-            self.job = Clock.schedule_interval(self.ticking, 0.5)
+        # reset values to original
+        self.timer.reset()
+        self.display.text = self.timer.display()
+        self.report()
 
     def quit(self):
 
-        # cancel
-        try:
-            self.job.cancel()
-        except AttributeError:
-            pass
+        self.timer.stop()
+        self.report()
 
     def change_image(self, flag="", pressed=False):
 
@@ -423,47 +378,47 @@ class SimpleTimer(Screen):
 
         # running -> stopped
         if flag == "" and self.state == "running" and not pressed:
-            self.timer_image.source = r"media/Timer window/timer_nogo.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo.png")
             logger.info("timer ticking")
 
         # pressed running -> stopped
         elif flag == "" and self.state == "running" and pressed:
-            self.timer_image.source = r"media/Timer window/timer_go_stop.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_stop.png")
             logger.info("pause button pressed")
 
         # stopped -> running
         elif flag == "" and self.state == "paused" and not pressed:
-            self.timer_image.source = r"media/Timer window/timer_go.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go.png")
             logger.info("timer stopped")
 
         # pressed stopped -> running
         elif flag == "" and self.state == "paused" and pressed:
-            self.timer_image.source = r"media/Timer window/timer_nogo_play.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_play.png")
             logger.info("play button pressed")
 
         # pressed running reset
         elif flag == "reset" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go_reset.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_reset.png")
             
 
         # pressed running return
         elif flag == "return" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go_return.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go_return.png")
 
         # pressed stopped reset
         elif flag == "reset" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo_reset.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_reset.png")
 
         # pressed stopped return
         elif flag == "return" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo_return.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo_return.png")
 
         # void
         elif flag == "void" and self.state == "running":
-            self.timer_image.source = r"media/Timer window/timer_go.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_go.png")
 
         elif flag == "void" and self.state == "paused":
-            self.timer_image.source = r"media/Timer window/timer_nogo.png"
+            self.timer_image.source = media_module.source(r"media/Timer window/timer_nogo.png")
 
 
 class ExtraSimpleTimer(Screen):
@@ -499,8 +454,143 @@ kv_file = Builder.load_file("timer_window.kv")
 
 class TimerApp(App):
     def build(self):
+        media_module.preload()
+
+        # minutes of the countdown, sent by the planner or set in the settings
+        self.duration = 0
+
+        # commands of the planner, None when launched on its own
+        self.channel = ipc_module.connect(on_message=self.on_message,
+                                          on_close=self.on_planner_close,
+                                          dispatch=on_ui_thread)
+
+        if self.channel is not None:
+            session_log.sink = lambda event: self.channel.send("event", **event)
+
+        # closing the window only hides the worker
+        if WORKER:
+            Window.bind(on_request_close=self.on_request_close)
+
         return kv_file
 
+    def on_message(self, message: dict):
+
+        """
+        command of the planner
+
+        Parameters
+        ----------
+        message : dict
+            start {duration, direct}, pause or stop
+        """
+
+        logger.info(f"planner command: {message['op']}")
+
+        timer = self.root.get_screen("simple_timer")
+
+        if message["op"] == "show":
+
+            if timer.state != "running":
+                self.root.current = "simple_timer_setting"
+
+            self.show(sent=message.get("sent"))
+
+        elif message["op"] == "start":
+
+            self.duration = message["duration"]
+
+            # straight to the countdown, or to the settings to confirm it
+            if message.get("direct", False):
+                if self.root.current == "simple_timer":
+                    timer._load_duration()
+                else:
+                    self.root.current = "simple_timer"
+
+            else:
+                setting = self.root.get_screen("simple_timer_setting")
+                setting._load_planned()
+                setting._load_duration()
+                self.root.current = "simple_timer_setting"
+
+            self.show(sent=message.get("sent"))
+
+        elif message["op"] == "pause" and timer.state == "running":
+            timer.update()
+
+        elif message["op"] == "stop" and timer.state != "finished":
+            timer.close()
+
+    def report(self, timer):
+
+        """
+        send the progress of the countdown to the planner
+
+        Parameters
+        ----------
+        timer : timer_module.TimerEngine
+            engine of the simple timer
+        """
+
+        if self.channel is None:
+            return
+
+        self.channel.send("progress", state=timer.state,
+                          elapsed=round(timer.elapsed(), 1),
+                          remaining=round(timer.remaining(), 1),
+                          duration=timer.duration)
+
+    def show(self, sent=None):
+
+        """
+        bring the window of the worker on screen
+
+        Parameters
+        ----------
+        sent : float, optional
+            time of the request of the planner, to log the latency
+        """
+
+        Window.show()
+        Window.raise_window()
+
+        if sent is not None:
+            logger.info(f"timer shown {1000 * (time.time() - sent):.0f}ms after the request")
+
+    def close(self):
+
+        """ end of the timer, the worker waits hidden for the next one """
+
+        if not WORKER:
+            self.stop()
+            return
+
+        timer = self.root.get_screen("simple_timer")
+        if timer.state != "finished":
+            timer.quit()
+
+        self.duration = 0
+        self.root.current = "simple_timer_setting"
+
+        Window.hide()
+
+    def on_request_close(self, *args, **kwargs):
+
+        self.close()
+
+        return True
+
+    def on_planner_close(self):
+
+        # the worker lives as long as the planner
+        if WORKER:
+            logger.info("planner gone, closing the timer worker")
+            self.stop()
+
+    def on_stop(self):
+
+        if self.channel is not None:
+            self.channel.close()
+
 
 if __name__ == "__main__":
     TimerApp().run()